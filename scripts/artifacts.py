@@ -0,0 +1,251 @@
+"""
+Предсжатые артефакты с адресацией по содержимому для раздачи статикой.
+
+ArtifactWriter — текстовый файл для write_items: каждый записанный кусок
+одновременно уходит в обычный выход, в хеш SHA-256 и в потоковые компрессоры
+gzip и zstd, так что файл читается и сжимается за один проход без буферизации
+целиком. В каталоге артефактов варианты лежат под именами с хешем содержимого:
+
+    articles.<hash>.json        identity
+    articles.<hash>.json.gz     Content-Encoding: gzip
+    articles.<hash>.json.zst    Content-Encoding: zstd
+    manifest.json               варианты каждого артефакта: путь, размер, sha256, ETag
+
+Файлы предыдущих версий не удаляются сразу: клиенты, которые ещё качают старую
+версию, и CDN со старым ETag не должны получить 404. В записи манифеста под
+"previous" перечислены keep последних версий (по умолчанию одна), файлы более
+старых удаляются при публикации; keep=0 — удалять сразу.
+
+ETag варианта — "<hash>" для identity и "<hash>-gzip" / "<hash>-zstd" для сжатых
+(разные представления обязаны иметь разные ETag), где hash — первые 32
+шестнадцатеричных знака SHA-256 несжатого содержимого. Сервер отдаёт готовые
+байты с нужным Content-Encoding и ETag, а клиент с If-None-Match не скачивает
+неизменившийся файл. gzip пишется с mtime=0 и без имени файла, поэтому один и
+тот же вход всегда даёт одни и те же байты. Для zstd нужен пакет zstandard.
+
+Запуск для готовых файлов: python artifacts.py articles.json pages/*.json --out dist/
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+CODECS = ("gzip", "zstd")
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+MANIFEST_FILE = "manifest.json"
+HASH_CHARS = 32
+# Уровни по умолчанию: zstd выше 12 сжимает лишь на проценты лучше, но в разы медленнее
+DEFAULT_LEVELS = {"gzip": 9, "zstd": 12}
+DEFAULT_KEEP = 1
+_COPY_BUFFER = 1024 * 1024
+
+
+class _HashingFile:
+    """Обёртка файла, которая считает SHA-256 и размер записанных байт."""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self.f.write(data)
+
+    def flush(self) -> None:
+        self.f.flush()
+
+
+class ArtifactWriter:
+    """
+    Пишет текст в path и параллельно — сжатые варианты в out_dir.
+
+        with ArtifactWriter("articles.json", "dist", {"gzip": 9, "zstd": 19}) as f:
+            write_items(items, f)
+        entry = f.entry   # запись манифеста, она же добавлена в dist/manifest.json
+
+    codecs — имена кодеков или словарь кодек -> уровень (None — DEFAULT_LEVELS);
+    keep — сколько предыдущих версий оставить в каталоге (update_manifest).
+    """
+
+    def __init__(self, path: str, out_dir: str, codecs=CODECS, name: str = None,
+                 content_type: str = "application/json", keep: int = DEFAULT_KEEP):
+        if not isinstance(codecs, dict):
+            codecs = dict.fromkeys(codecs)
+        unknown = set(codecs) - set(CODECS)
+        if unknown:
+            raise ValueError(f"Неизвестные кодеки: {sorted(unknown)}, ожидаются {CODECS}")
+        levels = {codec: DEFAULT_LEVELS[codec] if level is None else level for codec, level in codecs.items()}
+        os.makedirs(out_dir, exist_ok=True)
+        self.path = path
+        self.out_dir = out_dir
+        self.name = name or os.path.basename(path)
+        self.content_type = content_type
+        self.keep = keep
+        self.entry = None
+        self._raw = open(path, "wb") if path else None
+        self._variants = {"identity": self._temp_file()}
+        self._streams = {}
+        if "gzip" in codecs:
+            self._variants["gzip"] = self._temp_file()
+            self._streams["gzip"] = gzip.GzipFile(filename="", mode="wb", compresslevel=levels["gzip"],
+                                                  fileobj=self._variants["gzip"], mtime=0)
+        if "zstd" in codecs:
+            import zstandard
+
+            self._variants["zstd"] = self._temp_file()
+            self._streams["zstd"] = zstandard.ZstdCompressor(level=levels["zstd"]).stream_writer(
+                self._variants["zstd"], closefd=False
+            )
+
+    def _temp_file(self) -> _HashingFile:
+        fd, tmp_path = tempfile.mkstemp(dir=self.out_dir, prefix=".artifact-")
+        # mkstemp создаёт файл с правами 0600, а раздавать его будет чужой процесс
+        os.chmod(tmp_path, 0o644)
+        f = _HashingFile(os.fdopen(fd, "wb"))
+        f.tmp_path = tmp_path
+        return f
+
+    def write(self, text) -> int:
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        if self._raw is not None:
+            self._raw.write(data)
+        self._variants["identity"].write(data)
+        for stream in self._streams.values():
+            stream.write(data)
+        return len(text)
+
+    def close(self) -> dict:
+        """Дожимает компрессоры, переименовывает варианты по хешу и обновляет манифест."""
+        if self.entry is not None:
+            return self.entry
+        for stream in self._streams.values():
+            stream.close()
+        if self._raw is not None:
+            self._raw.close()
+        identity = self._variants["identity"]
+        digest = identity.sha256.hexdigest()
+        stem, ext = os.path.splitext(self.name)
+        base = f"{stem}.{digest[:HASH_CHARS]}{ext}"
+        variants = {}
+        for encoding, f in self._variants.items():
+            f.f.close()
+            file_name = base + CODEC_SUFFIXES.get(encoding, "")
+            os.replace(f.tmp_path, os.path.join(self.out_dir, file_name))
+            etag = digest[:HASH_CHARS] if encoding == "identity" else f"{digest[:HASH_CHARS]}-{encoding}"
+            variants[encoding] = {
+                "path": file_name,
+                "bytes": f.bytes,
+                "sha256": f.sha256.hexdigest(),
+                "etag": f'"{etag}"',
+            }
+        self.entry = {
+            "sha256": digest,
+            "bytes": identity.bytes,
+            "contentType": self.content_type,
+            "updatedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "variants": variants,
+        }
+        update_manifest(self.out_dir, self.name, self.entry, self.keep)
+        return self.entry
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+            return
+        # Недописанные варианты не должны попасть в каталог артефактов
+        for stream in self._streams.values():
+            stream.close()
+        for f in self._variants.values():
+            f.f.close()
+            os.remove(f.tmp_path)
+        if self._raw is not None:
+            self._raw.close()
+
+
+def update_manifest(out_dir: str, name: str, entry: dict, keep: int = DEFAULT_KEEP) -> dict:
+    """
+    Записывает entry под ключом name в out_dir/manifest.json. keep последних
+    прежних версий артефакта сохраняются в entry["previous"] вместе с файлами,
+    файлы более старых версий удаляются (если не совпадают с оставленными).
+    """
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    manifest = {"artifacts": {}}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    previous = manifest["artifacts"].get(name)
+    generations = []
+    if previous is not None:
+        generations = [previous] + previous.pop("previous", [])
+    # Повторная публикация того же содержимого не считается новой версией
+    generations = [g for g in generations if g["sha256"] != entry["sha256"]]
+    kept, stale = generations[:keep], generations[keep:]
+    entry.pop("previous", None)
+    if kept:
+        entry["previous"] = kept
+    manifest["artifacts"][name] = entry
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    live = {variant["path"] for g in [entry] + kept for variant in g["variants"].values()}
+    for generation in stale:
+        for variant in generation["variants"].values():
+            stale_path = os.path.join(out_dir, variant["path"])
+            if variant["path"] not in live and os.path.exists(stale_path):
+                os.remove(stale_path)
+    return manifest
+
+
+def publish_file(path: str, out_dir: str, codecs=CODECS, name: str = None, keep: int = DEFAULT_KEEP) -> dict:
+    """Публикует уже готовый файл: потоково читает его и пишет варианты в out_dir."""
+    with open(path, "rb") as src, ArtifactWriter(None, out_dir, codecs, name or os.path.basename(path),
+                                                 keep=keep) as f:
+        while True:
+            data = src.read(_COPY_BUFFER)
+            if not data:
+                break
+            f.write(data)
+    return f.entry
+
+
+def format_entry(name: str, entry: dict) -> str:
+    parts = []
+    for encoding, variant in entry["variants"].items():
+        ratio = variant["bytes"] / entry["bytes"] if entry["bytes"] else 1.0
+        parts.append(f"{encoding} {variant['bytes'] / 1024 / 1024:.2f} МиБ ({ratio:.0%})")
+    return f"{name} ETag {entry['variants']['identity']['etag']}: " + ", ".join(parts)
+
+
+def parse_codecs(value: str) -> dict:
+    """"gzip,zstd:19" -> {"gzip": None, "zstd": 19}: кодеки и (необязательно) их уровни."""
+    codecs = {}
+    for part in filter(None, value.split(",")):
+        codec, _, level = part.partition(":")
+        codecs[codec] = int(level) if level else None
+    return codecs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Предсжатые артефакты с ETag для раздачи статикой")
+    parser.add_argument("files", nargs="+", help="файлы для публикации (articles.json, страницы /updates)")
+    parser.add_argument("--out", required=True, help="каталог артефактов с manifest.json")
+    parser.add_argument("--compress", default=",".join(CODECS),
+                        help="кодеки через запятую, с необязательным уровнем: gzip:9,zstd:19")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP,
+                        help="сколько предыдущих версий каждого артефакта оставить (0 — удалять сразу)")
+    args = parser.parse_args()
+    if args.keep < 0:
+        parser.error("--keep не может быть отрицательным")
+
+    for file_path in args.files:
+        print(format_entry(os.path.basename(file_path),
+                           publish_file(file_path, args.out, parse_codecs(args.compress), keep=args.keep)))
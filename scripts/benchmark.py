@@ -0,0 +1,250 @@
+"""
+Бенчмарки горячих путей generate_test_data.py с регрессионным baseline.
+
+Корпуса фиксированы: статьи строятся synthetic_corpus из постоянного seed,
+так что при каждом запуске кодируется один и тот же текст. Каждый сценарий
+(чанкинг, кодирование, генерация фида, сериализация) × корпус запускается
+в отдельном процессе: пиковый RSS меряется для одного сценария, а загрузка
+модели и прогрев в замер не входят. Печатаются статей/с, чанков/с,
+байт/с и пиковый RSS (медиана по --repeat повторам внутри процесса).
+
+--save-baseline записывает результаты в baseline-файл; без него запуск
+сравнивается с baseline и завершается с кодом 1, если какая-либо скорость
+упала или пиковый RSS вырос больше чем на --threshold. Baseline зависит
+от машины: сохраняйте и сравнивайте его на одном и том же агенте.
+
+Запуск: python benchmark.py [--cases chunk-chars,serialize-f16] [--corpora short]
+                            [--save-baseline] [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_PATH = os.path.join(SCRIPT_DIR, "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.2
+CORPUS_SEED = 1234
+
+# Имя корпуса -> (число статей, средняя длина content в символах)
+CORPORA = {
+    "short": (2000, 600),
+    "medium": (500, 2500),
+    "long": (100, 12000),
+}
+
+# Сценарии, которым нужна модель (токенизатор или кодировщик)
+MODEL_CASES = ("chunk-tokens", "embed", "generate")
+CASES = ("chunk-chars", "chunk-tokens", "embed", "generate", "serialize-list", "serialize-f16")
+
+# Метрики-скорости: регрессия — падение; пиковый RSS: регрессия — рост
+RATE_METRICS = ("articles_per_sec", "chunks_per_sec", "bytes_per_sec")
+
+
+def build_corpus(name: str) -> list:
+    """Фиксированный корпус статей (в формате sample_articles) для сценария name."""
+    from synthetic_corpus import iter_synthetic_items
+
+    n, mean_chars = CORPORA[name]
+    articles = []
+    for item in iter_synthetic_items(n, CORPUS_SEED, update_ratio=0.0, delete_ratio=0.0,
+                                     mean_chars=mean_chars):
+        attrs = item["attributes"]
+        articles.append({
+            "id": item["id"],
+            "title": attrs["title"],
+            "short_description": attrs["shortDescription"],
+            "content": attrs["content"],
+            "main_image_url": item["mainImageUrl"],
+            "tags": item["tags"],
+            "updated_at": item["updatedAt"],
+        })
+    return articles
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт KiB, macOS — байты
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _make_runner(case: str, articles: list):
+    """
+    Готовит сценарий case и возвращает функцию без аргументов, которая выполняет
+    его один раз и возвращает (чанков, байт записано).
+    """
+    import generate_test_data as g
+
+    texts = [art["content"] for art in articles]
+
+    if case in ("chunk-chars", "chunk-tokens"):
+        chunking = case.split("-")[1]
+
+        def run():
+            return sum(len(g.chunk_text(text, chunking=chunking)) for text in texts), 0
+        return run
+
+    if case == "embed":
+        def run():
+            stats = {}
+            g.embed_corpus(texts, chunking="tokens", stats=stats)
+            return stats["chunks"], 0
+        return run
+
+    if case == "generate":
+        def run():
+            stats = {}
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+                g.write_items(g.iter_article_items(articles, chunking="tokens", stats=stats), f)
+                return stats["chunks"], f.tell()
+        return run
+
+    if case in ("serialize-list", "serialize-f16"):
+        import numpy as np
+
+        encoding = "list" if case == "serialize-list" else "f16-base64"
+        rng = np.random.default_rng(CORPUS_SEED)
+        vectors = rng.standard_normal((len(articles), 384)).astype(np.float32)
+
+        def run():
+            items = (g.build_article_item(art, emb, encoding) for art, emb in zip(articles, vectors))
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+                g.write_items(items, f)
+                return 0, f.tell()
+        return run
+
+    raise ValueError(f"Неизвестный сценарий: {case!r}, ожидается один из {CASES}")
+
+
+def run_case(case: str, corpus: str, repeat: int) -> dict:
+    """Выполняет сценарий в текущем процессе и возвращает его метрики."""
+    articles = build_corpus(corpus)
+    run = _make_runner(case, articles)
+    if case in MODEL_CASES:
+        # Прогрев: загрузка модели и первые батчи не входят в замер
+        _make_runner(case, articles[:8])()
+
+    timings = []
+    chunks = written = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks, written = run()
+        timings.append(time.perf_counter() - started)
+    seconds = statistics.median(timings)
+    result = {
+        "case": case,
+        "corpus": corpus,
+        "articles": len(articles),
+        "seconds": seconds,
+        "articles_per_sec": len(articles) / seconds,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if chunks:
+        result["chunks_per_sec"] = chunks / seconds
+    if written:
+        result["bytes_per_sec"] = written / seconds
+    return result
+
+
+def measure(case: str, corpus: str, repeat: int) -> dict:
+    """Запускает сценарий в отдельном процессе, чтобы пиковый RSS относился только к нему."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-case", case, "--corpora", corpus,
+         "--repeat", str(repeat)],
+        cwd=SCRIPT_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """
+    Сравнивает результаты с baseline и возвращает список регрессий:
+    скорость ниже baseline * (1 - threshold) или RSS выше baseline * (1 + threshold).
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(f"{result['case']}/{result['corpus']}")
+        if base is None:
+            continue
+        for metric in RATE_METRICS:
+            if metric in result and metric in base and result[metric] < base[metric] * (1 - threshold):
+                regressions.append(
+                    f"{result['case']}/{result['corpus']}: {metric} {result[metric]:.1f} "
+                    f"< {base[metric]:.1f} (baseline) на {1 - result[metric] / base[metric]:.0%}"
+                )
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold):
+            regressions.append(
+                f"{result['case']}/{result['corpus']}: peak_rss_mb {result['peak_rss_mb']:.0f} "
+                f"> {base['peak_rss_mb']:.0f} (baseline)"
+            )
+    return regressions
+
+
+def format_result(result: dict) -> str:
+    parts = [f"{result['articles_per_sec']:10.1f} статей/с"]
+    if "chunks_per_sec" in result:
+        parts.append(f"{result['chunks_per_sec']:10.1f} чанков/с")
+    if "bytes_per_sec" in result:
+        parts.append(f"{result['bytes_per_sec'] / 1024 / 1024:8.1f} МиБ/с")
+    parts.append(f"RSS {result['peak_rss_mb']:.0f} МиБ")
+    return f"{result['case'] + '/' + result['corpus']:<24} " + ", ".join(parts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки generate_test_data.py с baseline")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"сценарии через запятую: {', '.join(CASES)}")
+    parser.add_argument("--corpora", default=",".join(CORPORA),
+                        help=f"корпуса через запятую: {', '.join(CORPORA)}")
+    parser.add_argument("--no-model", action="store_true",
+                        help="пропустить сценарии, которым нужна модель")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов сценария в процессе")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="путь к baseline-файлу")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="записать результаты в baseline вместо сравнения")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое ухудшение относительно baseline (0.2 — 20%%)")
+    parser.add_argument("--json", action="store_true", help="вывести результаты в JSON")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.corpora, args.repeat)))
+        sys.exit(0)
+
+    cases = [c for c in args.cases.split(",") if not (args.no_model and c in MODEL_CASES)]
+    results = []
+    for case in cases:
+        for corpus in args.corpora.split(","):
+            result = measure(case, corpus, args.repeat)
+            results.append(result)
+            if not args.json:
+                print(format_result(result))
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({f"{r['case']}/{r['corpus']}": r for r in results})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline сохранён: {args.baseline}")
+        sys.exit(0)
+    if not os.path.exists(args.baseline):
+        print(f"Baseline не найден ({args.baseline}), сравнение пропущено")
+        sys.exit(0)
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"FAIL {line}")
+    if not regressions:
+        print(f"OK: регрессий больше {args.threshold:.0%} относительно baseline нет")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,164 @@
+"""
+Колоночное хранилище корпуса: метаданные и текст в Parquet, эмбеддинги — одна матрица .npy.
+
+Каталог out_dir после ColumnarWriter.finish():
+    items.parquet   — по строке на элемент фида: id, type, action, updatedAt
+                      (timestamp[ms, UTC]), mainImageUrl, tags, title,
+                      shortDescription, content и embeddingRow — номер строки
+                      в матрице (null у delete-элементов);
+    embeddings.npy  — непрерывная float32-матрица (N, dim) эмбеддингов upsert'ов
+                      в порядке выдачи, как они лежат в фиде (без нормализации);
+    manifest.json   — число элементов и векторов, dim, dtype и имена файлов.
+
+Матрица открывается без копирования через np.load(..., mmap_mode="r"),
+а из Parquet читаются только нужные колонки (open_columnar).
+Parquet пишется группами строк по row_group_size элементов, а векторы
+сначала идут во временный raw-файл, так что память не зависит от размера корпуса.
+Требуется pyarrow.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+ITEMS_FILE = "items.parquet"
+EMBEDDINGS_FILE = "embeddings.npy"
+MANIFEST_FILE = "manifest.json"
+DEFAULT_ROW_GROUP_SIZE = 10_000
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.string()),
+        ("type", pa.string()),
+        ("action", pa.string()),
+        ("updatedAt", pa.timestamp("ms", tz="UTC")),
+        ("mainImageUrl", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        ("title", pa.string()),
+        ("shortDescription", pa.string()),
+        ("content", pa.string()),
+        ("embeddingRow", pa.int64()),
+    ])
+
+
+class ColumnarWriter:
+    """Принимает элементы фида по одному и раскладывает их по колонкам и матрице."""
+
+    def __init__(self, out_dir: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        import pyarrow.parquet as pq
+
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.row_group_size = row_group_size
+        self.schema = _schema()
+        self._parquet = pq.ParquetWriter(os.path.join(out_dir, ITEMS_FILE), self.schema)
+        self._vectors = tempfile.TemporaryFile(dir=out_dir)
+        self._columns = {name: [] for name in self.schema.names}
+        self.count = 0
+        self.rows = 0
+        self.dim = None
+
+    def add(self, item: dict) -> None:
+        from generate_test_data import decode_embedding
+        from room_export import iso_to_epoch_ms
+
+        attrs = item.get("attributes") or {}
+        row = None
+        if item["action"] == "upsert" and "embeddings" in attrs:
+            vector = decode_embedding(attrs["embeddings"])
+            if self.dim is None:
+                self.dim = len(vector)
+            elif len(vector) != self.dim:
+                raise ValueError(f"Размерность эмбеддинга {item['id']}: {len(vector)}, ожидается {self.dim}")
+            self._vectors.write(np.asarray(vector, dtype="<f4").tobytes())
+            row = self.rows
+            self.rows += 1
+        values = {
+            "id": item["id"],
+            "type": item["type"],
+            "action": item["action"],
+            "updatedAt": iso_to_epoch_ms(item["updatedAt"]),
+            "mainImageUrl": item.get("mainImageUrl"),
+            "tags": item.get("tags") or [],
+            "title": attrs.get("title"),
+            "shortDescription": attrs.get("shortDescription"),
+            "content": attrs.get("content"),
+            "embeddingRow": row,
+        }
+        for name, value in values.items():
+            self._columns[name].append(value)
+        self.count += 1
+        if len(self._columns["id"]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+
+        if not self._columns["id"]:
+            return
+        self._parquet.write_table(pa.Table.from_pydict(self._columns, schema=self.schema))
+        self._columns = {name: [] for name in self.schema.names}
+
+    def finish(self) -> dict:
+        """Дописывает Parquet, собирает embeddings.npy и manifest.json; возвращает манифест."""
+        self._flush()
+        self._parquet.close()
+
+        dim = self.dim or 0
+        with open(os.path.join(self.out_dir, EMBEDDINGS_FILE), "wb") as f:
+            np.lib.format.write_array_header_1_0(f, {
+                "descr": "<f4", "fortran_order": False, "shape": (self.rows, dim),
+            })
+            self._vectors.seek(0)
+            shutil.copyfileobj(self._vectors, f, 1024 * 1024)
+        self._vectors.close()
+
+        manifest = {
+            "items": self.count,
+            "vectors": self.rows,
+            "dim": dim,
+            "dtype": "float32",
+            "itemsFile": ITEMS_FILE,
+            "embeddingsFile": EMBEDDINGS_FILE,
+        }
+        with open(os.path.join(self.out_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        return manifest
+
+
+def tee_columnar(items, writer: ColumnarWriter):
+    """Пропускает элементы дальше, попутно отдавая их в ColumnarWriter."""
+    for item in items:
+        writer.add(item)
+        yield item
+
+
+def open_columnar(out_dir: str, columns: list = None) -> tuple:
+    """
+    (таблица pyarrow с колонками columns, матрица эмбеддингов в режиме mmap).
+    Строка i матрицы — эмбеддинг элемента с embeddingRow == i.
+    """
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(os.path.join(out_dir, ITEMS_FILE), columns=columns)
+    matrix = np.load(os.path.join(out_dir, EMBEDDINGS_FILE), mmap_mode="r")
+    return table, matrix
+
+
+def id_to_row(out_dir: str) -> dict:
+    """
+    Отображение id -> строка матрицы по состоянию на конец потока:
+    для повторных upsert'ов — последняя версия, удалённые id отсутствуют.
+    """
+    table, _ = open_columnar(out_dir, ["id", "embeddingRow"])
+    mapping = {}
+    for item_id, row in zip(table.column("id").to_pylist(), table.column("embeddingRow").to_pylist()):
+        mapping.pop(item_id, None)
+        if row is not None:
+            mapping[item_id] = row
+    return mapping
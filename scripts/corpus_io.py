@@ -0,0 +1,157 @@
+"""
+Потоковое чтение входного корпуса статей.
+
+Поддерживаются JSONL (по статье на строку), каталог Markdown-файлов
+с front-matter и CSV. Все читатели — генераторы: в памяти одновременно
+находится только текущая статья, поэтому корпус может содержать сотни тысяч
+документов. Имена полей принимаются как в snake_case (short_description),
+так и в camelCase фида (shortDescription); результат — словари в формате,
+который ожидает generate_test_data.build_article_item.
+"""
+import csv
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+INPUT_FORMATS = ("jsonl", "markdown", "csv")
+
+DEFAULT_IMAGE_URL = "https://picsum.photos/200"
+
+_FIELD_ALIASES = {
+    "shortDescription": "short_description",
+    "mainImageUrl": "main_image_url",
+    "updatedAt": "updated_at",
+    "body": "content",
+}
+_FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*(?:\n|\Z)", re.DOTALL)
+_TITLE_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+
+def _parse_tags(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    value = str(value).strip().strip("[]")
+    return [tag.strip().strip("'\"") for tag in re.split(r"[,;|]", value) if tag.strip()]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def normalize_article(raw: dict, source: str = "") -> dict:
+    """
+    Приводит запись к полям generate_test_data: title, short_description, content,
+    main_image_url, tags, updated_at и (если задан) id. Обязательны title и content.
+    """
+    art = {_FIELD_ALIASES.get(key, key): value for key, value in raw.items()}
+    for field in ("title", "content"):
+        if not art.get(field):
+            raise ValueError(f"{source}: у статьи нет обязательного поля {field!r}")
+    if not art.get("short_description"):
+        first_paragraph = next(
+            (p.strip() for p in art["content"].split("\n\n") if p.strip() and not p.startswith("#")),
+            "",
+        )
+        art["short_description"] = first_paragraph[:200]
+    art.setdefault("main_image_url", DEFAULT_IMAGE_URL)
+    art["main_image_url"] = art["main_image_url"] or DEFAULT_IMAGE_URL
+    art["tags"] = _parse_tags(art.get("tags"))
+    art["updated_at"] = art.get("updated_at") or _utc_now()
+    if not art.get("id"):
+        art.pop("id", None)
+    return art
+
+
+def iter_jsonl(path: str):
+    """Статьи из JSONL-файла, по одной на строку (пустые строки пропускаются)."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                yield normalize_article(json.loads(line), f"{path}:{line_no}")
+
+
+def parse_front_matter(text: str) -> tuple:
+    """
+    Разбирает front-matter в простом YAML-подмножестве: `key: value`,
+    `key: [a, b]` и списки из строк `- item`. Возвращает (метаданные, тело).
+    """
+    match = _FRONT_MATTER_RE.match(text)
+    if not match:
+        return {}, text
+    meta = {}
+    current_list = None
+    for line in match.group(1).splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if line.lstrip().startswith("- ") and current_list is not None:
+            meta[current_list].append(line.lstrip()[2:].strip().strip("'\""))
+            continue
+        key, _, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if not value:
+            meta[key] = []
+            current_list = key
+        else:
+            meta[key] = value.strip("'\"") if not value.startswith("[") else _parse_tags(value)
+            current_list = None
+    return meta, text[match.end():]
+
+
+def iter_markdown_dir(path: str):
+    """
+    Статьи из *.md файлов каталога (рекурсивно, в отсортированном порядке).
+    Заголовок берётся из front-matter, первого заголовка `# ...` или имени файла,
+    updatedAt — из front-matter или времени изменения файла.
+    """
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.lower().endswith((".md", ".markdown")):
+                continue
+            file_path = os.path.join(root, name)
+            with open(file_path, encoding="utf-8") as f:
+                meta, body = parse_front_matter(f.read())
+            meta.setdefault("content", body.strip())
+            if not meta.get("title"):
+                heading = _TITLE_RE.search(body)
+                meta["title"] = heading.group(1).strip() if heading else os.path.splitext(name)[0]
+            if not meta.get("updated_at") and not meta.get("updatedAt"):
+                mtime = datetime.fromtimestamp(os.path.getmtime(file_path), timezone.utc)
+                meta["updated_at"] = mtime.strftime("%Y-%m-%dT%H:%M:%SZ")
+            yield normalize_article(meta, file_path)
+
+
+def iter_csv(path: str):
+    """Статьи из CSV с заголовком; tags — строка через запятую, `;` или `|`."""
+    # Поле content может быть длиннее стандартного лимита модуля csv (128 КБ)
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    with open(path, encoding="utf-8", newline="") as f:
+        for row_no, row in enumerate(csv.DictReader(f), 2):
+            yield normalize_article(row, f"{path}:{row_no}")
+
+
+def detect_format(path: str) -> str:
+    if os.path.isdir(path):
+        return "markdown"
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext == ".csv":
+        return "csv"
+    raise ValueError(f"Не удалось определить формат {path!r}, укажите --input-format")
+
+
+def iter_articles(path: str, fmt: str = None):
+    """Ленивый поток статей из path в формате fmt (по умолчанию — по расширению)."""
+    fmt = fmt or detect_format(path)
+    if fmt == "jsonl":
+        return iter_jsonl(path)
+    if fmt == "markdown":
+        return iter_markdown_dir(path)
+    if fmt == "csv":
+        return iter_csv(path)
+    raise ValueError(f"Неизвестный формат входа: {fmt!r}, ожидается один из {INPUT_FORMATS}")
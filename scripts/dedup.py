@@ -0,0 +1,385 @@
+"""
+Поиск почти-дубликатов в корпусе за субквадратичное время.
+
+Два независимых сигнала, оба через LSH (locality-sensitive hashing):
+- текст: MinHash по словесным шинглам title + content, сигнатура режется на
+  bands полос по rows значений; пары, совпавшие хотя бы в одной полосе, —
+  кандидаты, подтверждаются оценкой Жаккара >= jaccard. Ловит копии и
+  перепечатки с правками;
+- эмбеддинги: случайные гиперплоскости (SimHash), tables таблиц по bits бит
+  знака; кандидаты подтверждаются косинусом >= cosine. Ловит пересказы одной
+  темы, у которых общих шинглов почти нет (как пары статей в sample_articles).
+
+В корзинах LSH крупнее max_bucket пары образуют только первые max_bucket
+элементов: плотные области иначе дают квадратичное число кандидатов. Кластер — канонический элемент (встретившийся
+в потоке первым) и статьи, подтверждённые парой именно с ним: цепочки похожих
+статей не склеиваются транзитивно. Сравниваются только последние
+неудалённые версии статей.
+
+Запуск: python dedup.py articles.json [--cosine 0.8] [--jaccard 0.5] [--exhaustive]
+"""
+import argparse
+import json
+import re
+import time
+import zlib
+
+import numpy as np
+
+from related import _unit
+
+DEFAULT_COSINE = 0.8
+DEFAULT_JACCARD = 0.5
+DEFAULT_SHINGLE = 5
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 42
+DEFAULT_TABLES = 128
+DEFAULT_BITS = 16
+# В корзине LSH крупнее пары образуют только её первые DEFAULT_MAX_BUCKET элементов
+DEFAULT_MAX_BUCKET = 64
+DEDUP_MODES = ("tag", "drop")
+
+_WORD_RE = re.compile(r"\w+")
+_SHINGLE_BASE = 1_000_003
+
+
+def shingle_hashes(text: str, k: int = DEFAULT_SHINGLE, vocabulary: dict = None) -> np.ndarray:
+    """
+    64-битные хеши словесных k-шинглов текста (без учёта регистра), без повторов.
+    Слова хешируются CRC32 (vocabulary — кэш слово -> хеш между вызовами),
+    шингл — полиномиальная свёртка хешей своих слов, посчитанная в NumPy.
+    """
+    vocabulary = {} if vocabulary is None else vocabulary
+    words = _WORD_RE.findall(text.lower())
+    codes = np.fromiter(
+        (vocabulary.get(w) or vocabulary.setdefault(w, zlib.crc32(w.encode("utf-8")) + 1) for w in words),
+        dtype=np.uint64, count=len(words),
+    )
+    if len(codes) < k:
+        codes = np.concatenate([codes, np.zeros(k - len(codes), dtype=np.uint64)])
+    shingles = np.zeros(len(codes) - k + 1, dtype=np.uint64)
+    for t in range(k):
+        shingles = shingles * np.uint64(_SHINGLE_BASE) + codes[t:len(codes) - k + 1 + t]
+    return np.unique(shingles)
+
+
+class MinHasher:
+    """
+    num_perm хеш-функций multiply-shift: старшие 32 бита (a·x + b) mod 2⁶⁴
+    с нечётным a — без медленного деления; одинаковый seed — одинаковые сигнатуры.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle: int = DEFAULT_SHINGLE, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.shingle = shingle
+        self.a = (rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None]
+        self._vocabulary = {}
+
+    def signatures(self, texts: list, block_size: int = 64) -> np.ndarray:
+        """MinHash-сигнатуры (len(texts), num_perm) uint32; тексты хешируются блоками по block_size."""
+        result = np.empty((len(texts), len(self.a)), dtype=np.uint32)
+        for start in range(0, len(texts), block_size):
+            hashes = [shingle_hashes(text, self.shingle, self._vocabulary)
+                      for text in texts[start:start + block_size]]
+            offsets = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+            permuted = (self.a * np.concatenate(hashes) + self.b) >> np.uint64(32)
+            result[start:start + len(hashes)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return result
+
+
+def _bucket_pairs(keys: np.ndarray, max_bucket: int = None) -> tuple:
+    """
+    Пары строк (i < j) с одинаковым ключом, закодированные как i·n + j, и число
+    урезанных корзин. В корзине больше max_bucket строк пары образуют только
+    первые max_bucket строк (в порядке потока — будущие канонические) со всеми
+    остальными: O(size · max_bucket) кандидатов вместо O(size²).
+    """
+    n = len(keys)
+    order = np.argsort(keys, kind="stable")
+    bounds = np.flatnonzero(np.diff(keys[order])) + 1
+    starts = np.concatenate(([0], bounds))
+    sizes = np.diff(np.concatenate((starts, [n])))
+    ends = np.repeat(np.concatenate((bounds, [n])), sizes)
+    # Позиция p отсортированного массива образует пары со всеми позициями p+1..ends[p]-1
+    partners = ends - np.arange(n) - 1
+    capped = 0
+    if max_bucket is not None:
+        capped = int((sizes > max_bucket).sum())
+        partners[np.arange(n) - np.repeat(starts, sizes) >= max_bucket] = 0
+    total = int(partners.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64), capped
+    first = np.repeat(np.arange(n), partners)
+    second = first + 1 + np.arange(total) - np.repeat(np.cumsum(partners) - partners, partners)
+    i, j = order[first], order[second]
+    return np.minimum(i, j) * n + np.maximum(i, j), capped
+
+
+def _band_keys(values: np.ndarray) -> np.ndarray:
+    """Номер уникальной строки values для каждой строки: равные строки — равные ключи."""
+    return np.unique(values, axis=0, return_inverse=True)[1].reshape(-1)
+
+
+def _merge_buckets(results: list) -> tuple:
+    pairs = [pairs for pairs, _ in results]
+    capped = sum(capped for _, capped in results)
+    return (np.unique(np.concatenate(pairs)) if pairs else np.empty(0, dtype=np.int64)), capped
+
+
+def minhash_candidates(signatures: np.ndarray, bands: int = DEFAULT_BANDS,
+                       max_bucket: int = DEFAULT_MAX_BUCKET) -> tuple:
+    """
+    Пары-кандидаты MinHash LSH: совпадение сигнатур хотя бы в одной из bands полос.
+    Возвращает (pairs, capped) — capped корзин урезано до max_bucket (см. _bucket_pairs).
+    """
+    rows = signatures.shape[1] // bands
+    return _merge_buckets([_bucket_pairs(_band_keys(signatures[:, b * rows:(b + 1) * rows]), max_bucket)
+                           for b in range(bands)])
+
+
+def simhash_candidates(unit: np.ndarray, tables: int = DEFAULT_TABLES, bits: int = DEFAULT_BITS,
+                       seed: int = 0, max_bucket: int = DEFAULT_MAX_BUCKET) -> tuple:
+    """
+    Пары-кандидаты LSH случайных гиперплоскостей: совпадение всех bits знаков хотя
+    бы в одной таблице. Возвращает (pairs, capped), как minhash_candidates.
+    """
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((unit.shape[1], tables * bits)).astype(np.float32)
+    weights = (1 << np.arange(bits, dtype=np.int64))
+    results = []
+    for start in range(0, tables * bits, bits):
+        signs = (unit @ planes[:, start:start + bits]) > 0
+        results.append(_bucket_pairs(signs.astype(np.int64) @ weights, max_bucket))
+    return _merge_buckets(results)
+
+
+def _verify(pairs: np.ndarray, n: int, score, threshold: float, block: int = 65536) -> np.ndarray:
+    kept = []
+    for start in range(0, len(pairs), block):
+        chunk = pairs[start:start + block]
+        kept.append(chunk[score(chunk // n, chunk % n) >= threshold])
+    return np.concatenate(kept) if kept else np.empty(0, dtype=np.int64)
+
+
+def _jaccard(signatures: np.ndarray):
+    return lambda i, j: (signatures[i] == signatures[j]).mean(axis=1)
+
+
+def _cosine(unit: np.ndarray):
+    def score(i, j):
+        # Пары отсортированы по i: вектор каждой строки i берётся один раз на всю её группу
+        rows, starts = np.unique(i, return_index=True)
+        ends = np.append(starts[1:], len(i))
+        result = np.empty(len(i), dtype=np.float32)
+        for row, start, end in zip(rows, starts, ends):
+            result[start:end] = unit[j[start:end]] @ unit[row]
+        return result
+
+    return score
+
+
+def exhaustive_pairs(signatures: np.ndarray, unit: np.ndarray, jaccard: float = DEFAULT_JACCARD,
+                     cosine: float = DEFAULT_COSINE, block_rows: int = 16) -> np.ndarray:
+    """Все подтверждённые пары полным перебором O(N²) — эталон для сравнения с LSH."""
+    n = len(unit)
+    found = []
+    for r0 in range(0, n, block_rows):
+        r1 = min(r0 + block_rows, n)
+        similar = (unit[r0:r1] @ unit.T) >= cosine
+        if signatures is not None:
+            similar |= (signatures[r0:r1, None, :] == signatures[None, :, :]).mean(axis=2) >= jaccard
+        i, j = np.nonzero(similar)
+        i += r0
+        upper = i < j
+        found.append(i[upper] * n + j[upper])
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def clusters_from_pairs(pairs: np.ndarray, n: int) -> np.ndarray:
+    """
+    Для каждой строки — номер строки её канонического элемента. Строки обходятся
+    по возрастанию: строка j примыкает к наименьшей канонической строке i < j,
+    с которой у неё есть подтверждённая пара, иначе канонична сама. В отличие
+    от транзитивного замыкания цепочка A~B~C не склеивает несхожие A и C:
+    каждый член кластера похож на канонический элемент напрямую.
+    """
+    canonical = list(range(n))
+    i, j = pairs // n, pairs % n
+    order = np.lexsort((i, j))
+    # Все пары строки j разобраны раньше, чем j встретится как i: её статус уже окончательный
+    for a, b in zip(i[order].tolist(), j[order].tolist()):
+        if canonical[b] == b and canonical[a] == a:
+            canonical[b] = a
+    return np.array(canonical, dtype=np.int64)
+
+
+def find_duplicates(texts: list, matrix: np.ndarray, cosine: float = DEFAULT_COSINE,
+                    jaccard: float = DEFAULT_JACCARD, num_perm: int = DEFAULT_NUM_PERM,
+                    bands: int = DEFAULT_BANDS, tables: int = DEFAULT_TABLES,
+                    bits: int = DEFAULT_BITS, shingle: int = DEFAULT_SHINGLE,
+                    seed: int = 0, exhaustive: bool = False,
+                    max_bucket: int = DEFAULT_MAX_BUCKET) -> tuple:
+    """
+    Кластеры почти-дубликатов среди строк matrix (texts — тексты тех же строк;
+    None — только эмбеддинги). Возвращает (canonical, report): canonical[i] —
+    строка канонического элемента кластера строки i (i, если дубликатов нет).
+    С exhaustive=True отчёт дополняется временем и полнотой полного перебора.
+    """
+    n = len(matrix)
+    report = {"items": n, "possiblePairs": n * (n - 1) // 2, "maxBucket": max_bucket}
+    started = time.perf_counter()
+    unit = _unit(matrix)
+    signatures = None
+    pairs = []
+    if texts is not None and n:
+        hasher = MinHasher(num_perm, shingle, seed)
+        signatures = hasher.signatures(texts)
+        report["signatureSeconds"] = time.perf_counter() - started
+        text_pairs, report["textCappedBuckets"] = minhash_candidates(signatures, bands, max_bucket)
+        report["textCandidates"] = len(text_pairs)
+        pairs.append(_verify(text_pairs, n, _jaccard(signatures), jaccard))
+    if n:
+        vector_pairs, report["vectorCappedBuckets"] = simhash_candidates(unit, tables, bits, seed, max_bucket)
+        report["vectorCandidates"] = len(vector_pairs)
+        pairs.append(_verify(vector_pairs, n, _cosine(unit), cosine))
+    pairs = np.unique(np.concatenate(pairs)) if pairs else np.empty(0, dtype=np.int64)
+    canonical = clusters_from_pairs(pairs, n)
+    report["pairs"] = len(pairs)
+    report["lshSeconds"] = time.perf_counter() - started
+
+    sizes = np.bincount(canonical, minlength=n)
+    sizes = sizes[sizes > 1]
+    report["clusters"] = len(sizes)
+    report["duplicates"] = int(sizes.sum() - len(sizes))
+    report["clusterSizes"] = {int(s): int(c) for s, c in zip(*np.unique(sizes, return_counts=True))}
+
+    if exhaustive:
+        started = time.perf_counter()
+        exact = exhaustive_pairs(signatures, unit, jaccard, cosine)
+        report["exhaustiveSeconds"] = time.perf_counter() - started
+        report["exhaustivePairs"] = len(exact)
+        report["pairRecall"] = float(np.isin(exact, pairs).mean()) if len(exact) else 1.0
+        # Доля статей, получивших тот же канонический элемент, что и при полном переборе
+        report["canonicalAgreement"] = float((clusters_from_pairs(exact, n) == canonical).mean()) if n else 1.0
+    return canonical, report
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"Почти-дубликаты: {report['clusters']} кластеров, {report['duplicates']} лишних элементов "
+        f"из {report['items']} ({report['pairs']} подтверждённых пар)",
+        "  размеры кластеров: " + (", ".join(f"{size}×{count}" for size, count in
+                                             report["clusterSizes"].items()) or "—"),
+        f"  LSH: {report['lshSeconds']:.2f} с, кандидатов "
+        f"{report.get('textCandidates', 0)} по тексту и {report.get('vectorCandidates', 0)} "
+        f"по эмбеддингам из {report['possiblePairs']} возможных пар",
+    ]
+    capped = report.get("textCappedBuckets", 0) + report.get("vectorCappedBuckets", 0)
+    if capped:
+        lines.append(f"  корзин LSH больше {report['maxBucket']} элементов: {capped} — в них пары "
+                     f"только с первыми {report['maxBucket']}")
+    if "exhaustiveSeconds" in report:
+        speedup = report["exhaustiveSeconds"] / report["lshSeconds"] if report["lshSeconds"] else float("inf")
+        lines.append(
+            f"  полный перебор: {report['exhaustiveSeconds']:.2f} с против {report['lshSeconds']:.2f} с "
+            f"у LSH ({speedup:.1f}×), "
+            f"{report['exhaustivePairs']} пар, полнота LSH {report['pairRecall']:.3f}, "
+            f"совпадение канонических элементов {report['canonicalAgreement']:.3f}"
+        )
+    return "\n".join(lines)
+
+
+def _article_text(attrs: dict) -> str:
+    return f"{attrs.get('title', '')}\n{attrs.get('content', '')}"
+
+
+def with_dedup(items, mode: str = "tag", report: dict = None, exhaustive: bool = False, **params):
+    """
+    Пропускает элементы фида, помечая почти-дубликаты: mode="tag" дописывает
+    в attributes последней версии дубликата canonicalId, mode="drop" убирает
+    из потока все элементы id-дубликатов. report (если передан) заполняется
+    отчётом find_duplicates. Параметры поиска — как у find_duplicates.
+    """
+    from related import spool_items
+
+    spool, ids, live, matrix = spool_items(items)
+    live_rows = np.flatnonzero(live)
+    texts = [None] * len(ids)
+    row = 0
+    for line in spool:
+        item = json.loads(line)
+        if item["action"] == "upsert":
+            if live[row]:
+                texts[row] = _article_text(item["attributes"])
+            row += 1
+    canonical, found = find_duplicates([texts[i] for i in live_rows], matrix[live_rows],
+                                       exhaustive=exhaustive, **params)
+    del matrix
+    if report is not None:
+        report.update(found)
+    canonical_of = {ids[live_rows[i]]: ids[live_rows[c]] for i, c in enumerate(canonical) if c != i}
+
+    spool.seek(0)
+    row = 0
+    for line in spool:
+        item = json.loads(line)
+        canonical_id = canonical_of.get(item["id"])
+        is_upsert = item["action"] == "upsert"
+        if canonical_id is not None:
+            if mode == "drop":
+                row += is_upsert
+                continue
+            if is_upsert and live[row]:
+                item["attributes"]["canonicalId"] = canonical_id
+        row += is_upsert
+        yield item
+    spool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск почти-дубликатов статей (MinHash + SimHash LSH)")
+    parser.add_argument("input", help="articles.json, сгенерированный generate_test_data.py")
+    parser.add_argument("--cosine", type=float, default=DEFAULT_COSINE,
+                        help="порог косинуса эмбеддингов для дубликата")
+    parser.add_argument("--jaccard", type=float, default=DEFAULT_JACCARD,
+                        help="порог оценки Жаккара по шинглам для дубликата")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM, help="длина MinHash-сигнатуры")
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, help="число полос MinHash LSH")
+    parser.add_argument("--tables", type=int, default=DEFAULT_TABLES, help="число таблиц SimHash LSH")
+    parser.add_argument("--bits", type=int, default=DEFAULT_BITS, help="бит на таблицу SimHash LSH")
+    parser.add_argument("--max-bucket", type=int, default=DEFAULT_MAX_BUCKET,
+                        help="в корзинах LSH крупнее пары образуют только первые столько элементов")
+    parser.add_argument("--shingle", type=int, default=DEFAULT_SHINGLE, help="длина шингла в словах")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="сравнить со временем и результатом полного попарного перебора")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт и кластеры в JSON")
+    args = parser.parse_args()
+
+    from generate_test_data import decode_embedding
+
+    with open(args.input, encoding="utf-8") as f:
+        latest = {}
+        for item in json.load(f)["data"]:
+            latest.pop(item["id"], None)
+            if item.get("action") == "upsert" and item.get("attributes"):
+                latest[item["id"]] = item
+    upserts = list(latest.values())
+    matrix = np.stack([decode_embedding(item["attributes"]["embeddings"]) for item in upserts])
+    canonical, report = find_duplicates(
+        [_article_text(item["attributes"]) for item in upserts], matrix,
+        args.cosine, args.jaccard, args.num_perm, args.bands, args.tables, args.bits,
+        args.shingle, args.seed, args.exhaustive, args.max_bucket,
+    )
+    clusters = {}
+    for i, c in enumerate(canonical):
+        clusters.setdefault(int(c), []).append(i)
+    clusters = [[upserts[i]["attributes"].get("title") or upserts[i]["id"] for i in members]
+                for members in clusters.values() if len(members) > 1]
+    if args.json:
+        print(json.dumps({"report": report, "clusters": clusters}, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report))
+        for titles in clusters:
+            print("  - " + " | ".join(titles))
@@ -0,0 +1,237 @@
+"""
+Инкрементальная генерация фида: только изменения относительно прошлого запуска.
+
+Манифест хранит для каждой статьи стабильный id, хэш содержимого и выданный
+updatedAt, а также наибольший выданный updatedAt запуска. Каждый элемент дельты
+получает свой updatedAt (шаг — секунда), строго больше всех прошлых: протокол
+отдаёт updatedAt > since, а nextSince берётся у последнего элемента страницы,
+так что одинаковые метки потеряли бы всё, что не поместилось в первую страницу. При очередном запуске в выход попадают только новые и изменённые
+статьи (upsert) и удаления статей, пропавших из входа, — поэтому объём
+синхронизации на клиенте (docs/content_delta_sync_spec.md) зависит от числа
+правок, а не от размера корпуса. Кодируются тоже только изменённые статьи.
+
+Кроме хэшей манифест хранит параметры, от которых зависят эмбеддинги в выходе
+(модель, кодировка, чанкинг, понижение размерности). Если они изменились,
+все статьи считаются изменёнными и перекодируются — иначе в фиде остались бы
+эмбеддинги в старом формате или пространстве.
+
+Статья без явного id получает uuid5 от заголовка (повторяющиеся заголовки
+различаются порядковым номером), так что id не меняется между запусками.
+Манифест можно один раз построить из ранее сгенерированного articles.json.
+"""
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+from corpus_io import _utc_now
+
+MANIFEST_VERSION = 2
+# В манифестах версии 1 параметров ещё нет — первый запуск по ним пересобирает всё
+SUPPORTED_VERSIONS = (1, MANIFEST_VERSION)
+
+_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/nikkiw/smart-feed/articles")
+
+
+def content_hash(title: str, short_description: str, content: str,
+                 main_image_url: str, tags: list, model_name: str) -> str:
+    """Хэш всего, что попадает в элемент фида (кроме id и updatedAt)."""
+    payload = json.dumps(
+        [title, short_description, content, main_image_url, list(tags), model_name],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def article_hash(art: dict, model_name: str) -> str:
+    return content_hash(art["title"], art["short_description"], art["content"],
+                        art["main_image_url"], art["tags"], model_name)
+
+
+def base_type_name(type_name: str) -> str:
+    """Имя модели из typeName эмбеддингов без суффикса понижения размерности ("+pca128")."""
+    return type_name.split("+", 1)[0]
+
+
+def stable_id(key: str) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, key))
+
+
+def _parse_utc(timestamp: str) -> int:
+    return int(datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp())
+
+
+def _format_utc(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class DeltaTracker:
+    """
+    Сравнивает поток статей с манифестом прошлого запуска.
+
+        tracker = DeltaTracker.load("articles.manifest.json", model_name, settings=settings)
+        changed = tracker.filter(articles)     # только новые / изменённые статьи
+        ...кодируем changed и пишем элементы...
+        deletes = tracker.iter_deletes()       # после того, как поток changed исчерпан
+        tracker.save()
+    """
+
+    def __init__(self, path: str, model_name: str, entries: dict = None,
+                 run_timestamp: str = None, settings: dict = None, previous_settings: dict = None,
+                 last_updated_at: str = ""):
+        self.path = path
+        self.model_name = model_name
+        self.entries = entries or {}
+        self.settings = settings or {}
+        # Параметры, которые отличаются от прошлого запуска (сравниваются только
+        # известные обоим; previous_settings=None — прошлые параметры неизвестны)
+        if previous_settings is None:
+            self.changed_settings = ["settings"] if self.entries else []
+        else:
+            self.changed_settings = sorted(
+                key for key in self.settings
+                if key in previous_settings and previous_settings[key] != self.settings[key]
+            )
+        self._by_id = {entry["id"]: key for key, entry in self.entries.items()}
+        # Изменения этого запуска начинаются строго после прошлых, иначе клиент
+        # с lastSyncAt = прошлому nextSince их пропустит; удаления в entries не остаются,
+        # поэтому их метки учитываются через last_updated_at
+        previous_max = max([e["updatedAt"] for e in self.entries.values()] + [last_updated_at])
+        now = _utc_now()
+        if run_timestamp is None:
+            run_timestamp = now if now > previous_max else _format_utc(_parse_utc(previous_max) + 1)
+        self.run_timestamp = run_timestamp
+        self._clock = _parse_utc(self.run_timestamp)
+        self.last_updated_at = previous_max
+        self.seen = set()
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0, "deleted": 0}
+        self._title_occurrences = {}
+        self._updates = {}
+
+    @classmethod
+    def load(cls, path: str, model_name: str, bootstrap_feed: str = None,
+             settings: dict = None) -> "DeltaTracker":
+        """
+        Читает манифест; если его нет — строит из bootstrap_feed (articles.json) или начинает с нуля.
+        settings — параметры эмбеддингов этого запуска; при расхождении с манифестом
+        все статьи перекодируются.
+        """
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") not in SUPPORTED_VERSIONS:
+                raise ValueError(f"{path}: неподдерживаемая версия манифеста {manifest.get('version')!r}")
+            return cls(path, model_name, manifest["articles"], settings=settings,
+                       previous_settings=manifest.get("settings"),
+                       last_updated_at=manifest.get("lastUpdatedAt", ""))
+        if bootstrap_feed:
+            entries, feed_settings = manifest_entries_from_feed(bootstrap_feed)
+            return cls(path, model_name, entries, settings=settings, previous_settings=feed_settings)
+        return cls(path, model_name, settings=settings, previous_settings={})
+
+    def _next_timestamp(self) -> str:
+        """Очередной updatedAt запуска: каждый выданный элемент на секунду позже предыдущего."""
+        timestamp = _format_utc(self._clock)
+        self._clock += 1
+        self.last_updated_at = timestamp
+        return timestamp
+
+    def _key(self, art: dict) -> str:
+        if art.get("id"):
+            return self._by_id.get(art["id"], "id:" + art["id"])
+        n = self._title_occurrences.get(art["title"], 0) + 1
+        self._title_occurrences[art["title"]] = n
+        return art["title"] if n == 1 else f"{art['title']}#{n}"
+
+    def filter(self, articles):
+        """Генератор новых и изменённых статей с проставленными id и updatedAt."""
+        for art in articles:
+            key = self._key(art)
+            self.seen.add(key)
+            entry = self.entries.get(key)
+            digest = article_hash(art, self.model_name)
+            if entry is not None and entry["hash"] == digest and not self.changed_settings:
+                self.counts["unchanged"] += 1
+                continue
+            self.counts["changed" if entry is not None else "new"] += 1
+            art_id = entry["id"] if entry is not None else (art.get("id") or stable_id(key))
+            updated_at = self._next_timestamp()
+            self._updates[key] = {"id": art_id, "hash": digest, "updatedAt": updated_at}
+            yield dict(art, id=art_id, updated_at=updated_at)
+
+    def iter_deletes(self):
+        """Элементы action=delete для статей манифеста, которых не было во входе."""
+        from generate_test_data import build_delete_item
+
+        for key in sorted(set(self.entries) - self.seen):
+            self.counts["deleted"] += 1
+            yield build_delete_item(self.entries[key]["id"], self._next_timestamp())
+
+    def save(self) -> None:
+        """Записывает манифест атомарно (через временный файл)."""
+        entries = {key: entry for key, entry in self.entries.items() if key in self.seen}
+        entries.update(self._updates)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "settings": self.settings,
+                       "lastUpdatedAt": self.last_updated_at, "articles": entries}, f,
+                      ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def report(self) -> str:
+        c = self.counts
+        report = (
+            f"Инкрементальный режим ({self.run_timestamp}): новых {c['new']}, изменённых "
+            f"{c['changed']}, без изменений {c['unchanged']}, удалённых {c['deleted']}"
+        )
+        if self.changed_settings:
+            report += f"; полная пересборка — изменились параметры: {', '.join(self.changed_settings)}"
+        return report
+
+
+def feed_settings(embeddings: dict) -> dict:
+    """
+    Параметры, которые можно восстановить по attributes.embeddings готового фида:
+    модель, кодировка, масштабы int8 и понижение размерности (суффикс typeName).
+    Чанкинг по фиду не восстановить — он считается совпадающим с текущим запуском.
+    """
+    type_name = embeddings["typeName"]
+    encoding = embeddings.get("encoding", "list")
+    settings = {
+        "model": base_type_name(type_name),
+        "encoding": encoding,
+        "reduce": type_name.split("+", 1)[1] if "+" in type_name else None,
+    }
+    if encoding == "i8-base64":
+        settings["int8Scales"] = "per-vector" if "scale" in embeddings else "per-dim"
+    return settings
+
+
+def manifest_entries_from_feed(path: str) -> tuple:
+    """
+    (записи манифеста, параметры эмбеддингов) из ранее сгенерированного
+    articles.json; ключ записи — заголовок.
+    """
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)["data"]
+    entries = {}
+    settings = None
+    occurrences = {}
+    for item in items:
+        attrs = item.get("attributes")
+        if item.get("action") != "upsert" or not attrs:
+            continue
+        n = occurrences.get(attrs["title"], 0) + 1
+        occurrences[attrs["title"]] = n
+        key = attrs["title"] if n == 1 else f"{attrs['title']}#{n}"
+        entries[key] = {
+            "id": item["id"],
+            "hash": content_hash(attrs["title"], attrs["shortDescription"], attrs["content"],
+                                 item["mainImageUrl"], item["tags"],
+                                 base_type_name(attrs["embeddings"]["typeName"])),
+            "updatedAt": item["updatedAt"],
+        }
+        if settings is None:
+            settings = feed_settings(attrs["embeddings"])
+    return entries, settings or {}
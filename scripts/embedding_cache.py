@@ -0,0 +1,174 @@
+"""
+Персистентный content-addressed кэш эмбеддингов чанков.
+
+Ключ записи — sha256 от имени модели, параметров чанкинга (режим, max_len, stride)
+и текста чанка, поэтому при перегенерации articles.json заново кодируются
+только новые или изменённые фрагменты текста. Размер кэша ограничен:
+при превышении лимита вытесняются записи, к которым дольше всего не обращались.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "embeddings.sqlite"
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def chunk_key(model_name: str, max_len: int, stride: int, chunk: str,
+              chunking: str = "chars") -> str:
+    """Content-addressed ключ чанка: модель + параметры чанкинга + хэш текста."""
+    h = hashlib.sha256()
+    for part in (model_name, chunking, str(max_len), str(stride), chunk):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+_STATS_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS embeddings_stats_insert AFTER INSERT ON embeddings BEGIN"
+    " UPDATE cache_stats SET bytes = bytes + LENGTH(NEW.vector) WHERE id = 0; END",
+    "CREATE TRIGGER IF NOT EXISTS embeddings_stats_delete AFTER DELETE ON embeddings BEGIN"
+    " UPDATE cache_stats SET bytes = bytes - LENGTH(OLD.vector) WHERE id = 0; END",
+    "CREATE TRIGGER IF NOT EXISTS embeddings_stats_update AFTER UPDATE OF vector ON embeddings BEGIN"
+    " UPDATE cache_stats SET bytes = bytes + LENGTH(NEW.vector) - LENGTH(OLD.vector) WHERE id = 0; END",
+)
+
+
+class EmbeddingCache:
+    """
+    Кэш эмбеддингов поверх SQLite (векторы хранятся как float32-байты).
+    Вытеснение — LRU по времени последнего обращения, пока суммарный размер
+    векторов не станет меньше max_bytes. Суммарный размер хранится в таблице
+    cache_stats и поддерживается триггерами, так что он общий для всех
+    соединений к файлу и не требует полного прохода по таблице.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # timeout: кэш могут одновременно использовать воркеры encode_pool;
+        # check_same_thread=False: в pipeline кэшем пользуется поток кодирования
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        with self._conn:
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_stats ("
+                " id INTEGER PRIMARY KEY CHECK (id = 0),"
+                " bytes INTEGER NOT NULL)"
+            )
+            # Для кэшей, созданных до cache_stats, итог считается один раз
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_stats (id, bytes)"
+                " SELECT 0, COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            )
+            for trigger in _STATS_TRIGGERS:
+                self._conn.execute(trigger)
+
+    def get_many(self, keys: list) -> dict:
+        """Возвращает {key: np.ndarray} для найденных ключей и обновляет счётчики."""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        # SQLite ограничивает число параметров в запросе — читаем пачками
+        for start in range(0, len(unique), 500):
+            part = unique[start : start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            # Сразу фиксируем: иначе открытая транзакция держит блокировку файла,
+            # и put_many других воркеров ждут её до таймаута
+            self._conn.commit()
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items: dict) -> None:
+        """Сохраняет {key: вектор} и при необходимости вытесняет старые записи."""
+        now = time.time()
+        self._conn.executemany(
+            # Не INSERT OR REPLACE: удаление при REPLACE не вызывает триггер cache_stats
+            "INSERT INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET vector = excluded.vector, last_used = excluded.last_used",
+            [
+                (key, np.asarray(vec, dtype=np.float32).tobytes(), now)
+                for key, vec in items.items()
+            ],
+        )
+        self._conn.commit()
+        self.evict()
+
+    def size_bytes(self) -> int:
+        row = self._conn.execute("SELECT bytes FROM cache_stats WHERE id = 0")
+        return int(row.fetchone()[0])
+
+    def evict(self) -> int:
+        """Удаляет самые давно использованные записи, пока кэш больше max_bytes."""
+        excess = self.size_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+        removed = 0
+        while excess > 0:
+            # Самые старые записи пачками, а не вся таблица целиком
+            rows = self._conn.execute(
+                "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_used ASC LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((key,))
+                excess -= size
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+            removed += len(victims)
+        self._conn.commit()
+        self.evicted += removed
+        return removed
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0.0
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return (
+            f"Кэш эмбеддингов: попаданий {self.hits}, промахов {self.misses} "
+            f"({hit_rate:.1f}% hit rate), вытеснено {self.evicted}, "
+            f"записей {count}, {self.size_bytes() / 1024 / 1024:.1f} MiB из "
+            f"{self.max_bytes / 1024 / 1024:.0f} MiB"
+        )
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
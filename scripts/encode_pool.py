@@ -0,0 +1,152 @@
+"""
+Многопроцессное кодирование статей на CPU.
+
+Поток окон статей раздаётся пулу процессов: каждый воркер один раз загружает
+модель, работает со своим числом потоков (torch или ONNX Runtime) и возвращает эмбеддинги окна
+одной float32-матрицей NumPy (передаётся как буфер, без списков Python float).
+Результаты отдаются строго в порядке входных окон, а число окон «в полёте»
+ограничено, поэтому память не растёт с размером корпуса.
+"""
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+_worker_cache = None
+
+
+def _init_worker(threads: int, model_name: str, backend: str, cache_path: str,
+                 cache_max_bytes: int):
+    global _worker_cache
+    import generate_test_data
+
+    # ONNX-бэкенды работают без torch; их потоки задаёт encoders.OnnxEncoder
+    if backend == "torch":
+        import torch
+
+        torch.set_num_threads(threads)
+    generate_test_data.MODEL_NAME = model_name
+    generate_test_data.ENCODER_BACKEND = backend
+    generate_test_data.ENCODER_THREADS = threads
+    generate_test_data.get_model()
+    if cache_path is not None:
+        from embedding_cache import EmbeddingCache
+
+        _worker_cache = EmbeddingCache(cache_path, cache_max_bytes)
+
+
+def _embed_window(texts: list, max_len: int, stride: int, batch_size: int, chunking: str):
+    from generate_test_data import embed_corpus
+
+    started = time.perf_counter()
+    hits, misses = (_worker_cache.hits, _worker_cache.misses) if _worker_cache else (0, 0)
+    stats = {}
+    embeddings = embed_corpus(texts, max_len, stride, _worker_cache, batch_size, chunking, stats)
+    if _worker_cache is not None:
+        stats["cache_hits"] = _worker_cache.hits - hits
+        stats["cache_misses"] = _worker_cache.misses - misses
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    return os.getpid(), embeddings, stats, time.perf_counter() - started
+
+
+class EncodePool:
+    """
+    Пул воркеров для embed_corpus. Использование:
+
+        with EncodePool(workers=4) as pool:
+            for arts, embeddings in pool.map_windows(windows, chunking="tokens"):
+                ...
+        print(pool.report())
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int = None, cache=None,
+                 max_in_flight: int = None, model_name: str = None, backend: str = None):
+        import generate_test_data
+
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.cache = cache
+        self.max_in_flight = max_in_flight or workers * 2
+        self.per_worker = {}
+        self.articles = 0
+        self.wall_seconds = 0.0
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            # spawn: воркеры не наследуют уже инициализированные потоки torch родителя
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                self.threads_per_worker,
+                model_name or generate_test_data.MODEL_NAME,
+                backend or generate_test_data.ENCODER_BACKEND,
+                cache.path if cache is not None else None,
+                cache.max_bytes if cache is not None else None,
+            ),
+        )
+
+    def map_windows(self, windows, max_len: int = 256, stride: int = None,
+                    batch_size: int = 64, chunking: str = "chars", stats: dict = None):
+        """
+        Для каждого окна статей отдаёт (окно, матрица эмбеддингов) в порядке входа.
+        Параметры чанкинга и батча — как у generate_test_data.embed_corpus.
+        Счётчики чанков воркеров суммируются в stats, попадания в кэш — в self.cache.
+        """
+        started = time.perf_counter()
+        pending = deque()
+
+        def collect():
+            arts, future = pending.popleft()
+            pid, embeddings, worker_stats, seconds = future.result()
+            worker = self.per_worker.setdefault(pid, {"articles": 0, "seconds": 0.0})
+            worker["articles"] += len(arts)
+            worker["seconds"] += seconds
+            self.articles += len(arts)
+            if self.cache is not None:
+                self.cache.hits += worker_stats.pop("cache_hits", 0)
+                self.cache.misses += worker_stats.pop("cache_misses", 0)
+            if stats is not None:
+                for key, value in worker_stats.items():
+                    stats[key] = stats.get(key, 0) + value
+            return arts, embeddings
+
+        try:
+            for arts in windows:
+                texts = [art["content"] for art in arts]
+                future = self._executor.submit(
+                    _embed_window, texts, max_len, stride, batch_size, chunking
+                )
+                pending.append((arts, future))
+                if len(pending) >= self.max_in_flight:
+                    yield collect()
+            while pending:
+                yield collect()
+        finally:
+            self.wall_seconds += time.perf_counter() - started
+
+    def report(self) -> str:
+        lines = [
+            f"Воркеров: {self.workers}, потоков torch на воркер: {self.threads_per_worker}"
+        ]
+        for i, (pid, w) in enumerate(sorted(self.per_worker.items()), 1):
+            rate = w["articles"] / w["seconds"] if w["seconds"] else 0.0
+            lines.append(
+                f"  воркер {i} (pid {pid}): {w['articles']} статей за {w['seconds']:.2f} с "
+                f"({rate:.1f} статей/с)"
+            )
+        total_rate = self.articles / self.wall_seconds if self.wall_seconds else 0.0
+        lines.append(
+            f"  всего: {self.articles} статей за {self.wall_seconds:.2f} с ({total_rate:.1f} статей/с)"
+        )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
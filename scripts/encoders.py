@@ -0,0 +1,282 @@
+"""
+Бэкенды кодирования чанков.
+
+"torch"     — SentenceTransformer на PyTorch (исходное поведение, по умолчанию);
+"onnx"      — тот же трансформер, экспортированный в ONNX и исполняемый ONNX Runtime;
+"onnx-int8" — ONNX-модель после динамического int8-квантования весов.
+
+ONNX-модель один раз экспортируется из локально закэшированной модели
+sentence-transformers в .cache/onnx/<модель>/ рядом со скриптом; туда же
+сохраняются токенизатор и параметры пулинга, так что при следующих запусках
+PyTorch-модель не загружается. OnnxEncoder повторяет интерфейс
+SentenceTransformer, которым пользуется generate_test_data: encode(),
+tokenizer и max_seq_length.
+
+Проверка совпадения с torch и замер ускорения на sample_articles:
+python encoders.py --backend onnx-int8
+"""
+import argparse
+import inspect
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+DEFAULT_ONNX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "onnx")
+ONNX_OPSET = 17
+
+# Минимально допустимый косинус между эмбеддингами чанка от torch и от бэкенда
+DEFAULT_MIN_COSINE = {"onnx": 0.9999, "onnx-int8": 0.98}
+
+_CONFIG_FILE = "encoder.json"
+
+
+def _model_dir(model_name: str, onnx_dir: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name.strip("/\\"))
+    return os.path.join(onnx_dir, slug)
+
+
+def _pipeline_config(st) -> dict:
+    """Пулинг и нормализация из модулей SentenceTransformer (кроме самого трансформера)."""
+    pooling = "mean"
+    normalize = False
+    for module in list(st)[1:]:
+        name = type(module).__name__
+        if name == "Pooling":
+            # В конфиге Pooling режимы — флаги pooling_mode_*; включены могут быть несколько
+            cfg = module.get_config_dict()
+            modes = sorted(key[len("pooling_mode_"):] for key, value in cfg.items()
+                           if key.startswith("pooling_mode_") and value is True)
+            if modes not in (["mean_tokens"], ["cls_token"]):
+                raise ValueError(f"Пулинг {modes} не поддерживается ONNX-бэкендом "
+                                 f"(поддерживаются только mean_tokens и cls_token)")
+            pooling = "mean" if modes == ["mean_tokens"] else "cls"
+        elif name == "Normalize":
+            normalize = True
+        else:
+            raise ValueError(f"Модуль {name} не поддерживается ONNX-бэкендом")
+    return {"pooling": pooling, "normalize": normalize, "max_seq_length": st.max_seq_length}
+
+
+def export_onnx(model_name: str, out_dir: str) -> None:
+    """Экспортирует трансформер модели в out_dir/model.onnx вместе с токенизатором."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    st = SentenceTransformer(model_name, device="cpu")
+    config = _pipeline_config(st)
+    tokenizer = st.tokenizer
+    input_names = list(tokenizer.model_input_names)
+    config["input_names"] = input_names
+
+    class _Transformer(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    # Пример с padding'ом, чтобы в граф попала ветка с маской внимания
+    sample = tokenizer(["export sample", "a longer export sample with padding"],
+                       padding=True, return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_path = os.path.join(out_dir, "model.onnx.tmp")
+    # dynamo=False нужен torch >= 2.5, где экспорт по умолчанию переходит на dynamo;
+    # в более старых версиях такого аргумента нет, а TorchScript-экспорт и так основной
+    extra = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        extra["dynamo"] = False
+    with torch.no_grad():
+        torch.onnx.export(
+            _Transformer(st[0].auto_model).eval(),
+            tuple(sample[name] for name in input_names),
+            tmp_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+            **extra,
+        )
+    tokenizer.save_pretrained(out_dir)
+    with open(os.path.join(out_dir, _CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=1)
+    os.replace(tmp_path, os.path.join(out_dir, "model.onnx"))
+
+
+def quantize_onnx(out_dir: str) -> None:
+    """Динамическое int8-квантование весов out_dir/model.onnx -> model-int8.onnx."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = os.path.join(out_dir, "model-int8.onnx.tmp")
+    quantize_dynamic(os.path.join(out_dir, "model.onnx"), tmp_path, weight_type=QuantType.QInt8)
+    os.replace(tmp_path, os.path.join(out_dir, "model-int8.onnx"))
+
+
+class OnnxEncoder:
+    """
+    Кодировщик на ONNX Runtime с интерфейсом SentenceTransformer.encode.
+    quantize=True — использовать int8-модель; threads — intra-op потоки ONNX Runtime
+    (None — по числу ядер).
+    """
+
+    def __init__(self, model_name: str, quantize: bool = False, threads: int = None,
+                 onnx_dir: str = DEFAULT_ONNX_DIR):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.model_dir = _model_dir(model_name, onnx_dir)
+        if not os.path.exists(os.path.join(self.model_dir, "model.onnx")):
+            export_onnx(model_name, self.model_dir)
+        model_file = "model.onnx"
+        if quantize:
+            model_file = "model-int8.onnx"
+            if not os.path.exists(os.path.join(self.model_dir, model_file)):
+                quantize_onnx(self.model_dir)
+        self.model_path = os.path.join(self.model_dir, model_file)
+
+        with open(os.path.join(self.model_dir, _CONFIG_FILE), encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.max_seq_length = self.config["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            self.model_path, options, providers=["CPUExecutionProvider"]
+        )
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True,
+               **kwargs) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size)[0]
+        input_names = self.config["input_names"]
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            encoded = self.tokenizer(
+                list(sentences[start:start + batch_size]), padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np",
+            )
+            feed = {name: encoded[name].astype(np.int64) for name in input_names}
+            hidden = self.session.run(None, feed)[0]
+            if self.config["pooling"] == "cls":
+                pooled = hidden[:, 0]
+            else:
+                mask = encoded["attention_mask"][..., None].astype(np.float32)
+                pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            if self.config["normalize"]:
+                pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            batches.append(pooled.astype(np.float32))
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate(batches)
+
+
+def load_encoder(model_name: str, backend: str = "torch", threads: int = None):
+    """Кодировщик модели model_name для выбранного бэкенда."""
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model_name)
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxEncoder(model_name, quantize=backend == "onnx-int8", threads=threads)
+    raise ValueError(f"Неизвестный бэкенд кодирования: {backend!r}, ожидается один из {ENCODER_BACKENDS}")
+
+
+def _timed_encode(encoder, chunks: list, batch_size: int) -> tuple:
+    encoder.encode(chunks[:batch_size], batch_size=batch_size)  # прогрев
+    started = time.perf_counter()
+    embeddings = encoder.encode(chunks, batch_size=batch_size, convert_to_numpy=True)
+    return np.asarray(embeddings, dtype=np.float32), time.perf_counter() - started
+
+
+def compare_backends(model_name: str, backend: str, texts: list, max_len: int = 256,
+                     batch_size: int = 64, chunking: str = "tokens") -> dict:
+    """
+    Кодирует чанки texts через torch и через backend и сравнивает эмбеддинги:
+    косинусы по чанкам и по статьям (среднее чанков), время и ускорение.
+    """
+    import generate_test_data
+
+    generate_test_data.MODEL_NAME = model_name
+    generate_test_data.ENCODER_BACKEND = "torch"
+    chunks, counts = [], []
+    for text in texts:
+        text_chunks = generate_test_data.chunk_text(text, max_len, None, chunking)
+        chunks.extend(text_chunks)
+        counts.append(len(text_chunks))
+    # Одинаковый порядок (по длине) для обоих бэкендов — батчи с минимальным padding
+    chunks_sorted = sorted(chunks, key=len, reverse=True)
+    order = {chunk: i for i, chunk in enumerate(chunks_sorted)}
+
+    reference, torch_seconds = _timed_encode(
+        generate_test_data.get_model(), chunks_sorted, batch_size
+    )
+    candidate, backend_seconds = _timed_encode(
+        load_encoder(model_name, backend), chunks_sorted, batch_size
+    )
+
+    def cosines(a, b):
+        a = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+        b = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+        return (a * b).sum(axis=1)
+
+    chunk_cos = cosines(reference, candidate)
+    rows = np.asarray([order[chunk] for chunk in chunks])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    article_cos = cosines(np.add.reduceat(reference[rows], offsets, axis=0),
+                          np.add.reduceat(candidate[rows], offsets, axis=0))
+    return {
+        "backend": backend,
+        "chunks": len(chunks),
+        "articles": len(texts),
+        "chunk_cosine_min": float(chunk_cos.min()),
+        "chunk_cosine_mean": float(chunk_cos.mean()),
+        "article_cosine_min": float(article_cos.min()),
+        "torch_seconds": torch_seconds,
+        "backend_seconds": backend_seconds,
+        "speedup": torch_seconds / backend_seconds if backend_seconds else float("inf"),
+    }
+
+
+def format_comparison(report: dict, min_cosine: float) -> str:
+    status = "OK" if report["chunk_cosine_min"] >= min_cosine else "ПРЕВЫШЕН ДОПУСК"
+    return "\n".join([
+        f"{report['backend']}: {report['chunks']} чанков из {report['articles']} статей",
+        f"  косинус с torch по чанкам: min {report['chunk_cosine_min']:.6f}, "
+        f"среднее {report['chunk_cosine_mean']:.6f} (допуск {min_cosine}) — {status}",
+        f"  косинус с torch по статьям: min {report['article_cosine_min']:.6f}",
+        f"  torch {report['torch_seconds']:.2f} с, {report['backend']} "
+        f"{report['backend_seconds']:.2f} с, ускорение {report['speedup']:.2f}×",
+    ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Сравнение ONNX-бэкенда с torch на sample_articles: точность и скорость"
+    )
+    parser.add_argument("--backend", choices=ENCODER_BACKENDS[1:], default="onnx")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2",
+                        help="модель sentence-transformers (имя или локальный путь)")
+    parser.add_argument("--max-len", type=int, default=256, help="размер чанка в токенах")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--min-cosine", type=float, default=None,
+                        help="минимальный косинус по чанкам (по умолчанию зависит от бэкенда)")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    args = parser.parse_args()
+
+    from sample_articles import SAMPLE_ARTICLES
+
+    min_cosine = args.min_cosine if args.min_cosine is not None else DEFAULT_MIN_COSINE[args.backend]
+    report = compare_backends(args.model, args.backend,
+                              [art["content"] for art in SAMPLE_ARTICLES],
+                              args.max_len, args.batch_size)
+    print(json.dumps(report, indent=2) if args.json else format_comparison(report, min_cosine))
+    sys.exit(0 if report["chunk_cosine_min"] >= min_cosine else 1)
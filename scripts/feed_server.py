@@ -0,0 +1,106 @@
+"""
+Локальный сервер протокола синхронизации поверх страниц generate_test_data.py --pages.
+
+Отвечает как mock-server: /updates?since=&limit= (pagination.read_updates) и
+/content/{type}/{id} (последняя версия элемента; удалённый — 404). Страницы уже
+разбиты при генерации, поэтому limit, отличный от --page-size страниц, отклоняется
+с 400 — иначе отчёт load_test.py приписал бы замеру чужой limit. Нужен, чтобы
+гонять load_test.py по фикстуре любого размера. HTTP/1.1 с keep-alive, по потоку
+на соединение.
+
+Запуск: python feed_server.py pages/ [--port 8080]
+"""
+import argparse
+import functools
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from pagination import INDEX_FILE, read_updates
+
+
+class FeedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pages_dir: str):
+        super().__init__(address, FeedHandler)
+        self.pages_dir = pages_dir
+        with open(os.path.join(pages_dir, INDEX_FILE), encoding="utf-8") as f:
+            self.index = json.load(f)
+        # (type, id) -> номер страницы с последней версией элемента
+        self.locations = {}
+        for number, page in enumerate(self.index["pages"]):
+            for item in self._page(page["file"]):
+                self.locations[(item["type"], item["id"])] = number
+        self._page.cache_clear()
+
+    @functools.lru_cache(maxsize=64)
+    def _page(self, file_name: str) -> list:
+        with open(os.path.join(self.pages_dir, file_name), encoding="utf-8") as f:
+            return json.load(f)["data"]
+
+    def find_content(self, content_type: str, item_id: str):
+        number = self.locations.get((content_type, item_id))
+        if number is None:
+            return None
+        for item in reversed(self._page(self.index["pages"][number]["file"])):
+            if item["id"] == item_id and item["type"] == content_type:
+                return item if item["action"] == "upsert" else None
+        return None
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят двумя записями: с алгоритмом Нейгла вторая ждёт
+    # delayed ACK клиента (~40 мс), и нагрузочный тест мерил бы TCP, а не сервер
+    disable_nagle_algorithm = True
+
+    def _respond(self, status: int, payload) -> None:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        if parts == ["updates"]:
+            query = parse_qs(url.query)
+            since = query.get("since", [""])[0]
+            if not since:
+                self._respond(400, {"error": "Missing 'since'"})
+                return
+            page_size = self.server.index["pageSize"]
+            limit = query.get("limit", [str(page_size)])[0]
+            if limit != str(page_size):
+                self._respond(400, {"error": f"Pages are pre-built with limit={page_size}, got limit={limit}"})
+                return
+            self._respond(200, read_updates(self.server.pages_dir, since, self.server.index))
+        elif len(parts) == 3 and parts[0] == "content":
+            item = self.server.find_content(parts[1], parts[2])
+            if item is None:
+                self._respond(404, {"error": "Not found"})
+            else:
+                self._respond(200, item)
+        else:
+            self._respond(404, {"error": "Not found"})
+
+    def log_message(self, format, *args):
+        # Журнал каждого запроса под нагрузкой только мешает замерам
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сервер /updates и /content поверх страниц --pages")
+    parser.add_argument("pages", help="каталог страниц generate_test_data.py --pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server = FeedServer((args.host, args.port), args.pages)
+    print(f"{server.index['total']} элементов, {len(server.index['pages'])} страниц: "
+          f"http://{args.host}:{args.port}")
+    server.serve_forever()
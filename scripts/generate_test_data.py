@@ -1,875 +1,942 @@
-from sentence_transformers import SentenceTransformer
+import argparse
+import base64
+import contextlib
+import copy
+import functools
+import io
+import itertools
 import json
+import os
+import re
+import time
 import uuid
 from datetime import datetime
+from itertools import islice
 import numpy as np
 
+from corpus_io import INPUT_FORMATS, iter_articles
+from dedup import DEDUP_MODES, DEFAULT_COSINE, DEFAULT_JACCARD
+from embedding_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES, EmbeddingCache, chunk_key
+from encoders import ENCODER_BACKENDS, load_encoder
+from quantization import QUANTIZATION_MODES, Int8Quantizer
+from reduction import DEFAULT_DIM, REDUCTION_METHODS
+
 # 1) Модель
 MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
-model = SentenceTransformer(MODEL_NAME)
-
-
-def embed_long_text(text: str, max_len: int = 256) -> list:
-    """
-    Разбиваем text на перекрывающиеся чанки max_len токенов и возвращаем усреднённый эмбеддинг.
-    При этом все чанки кодируем одним вызовом model.encode(...)
-    """
-    
-    # Иначе — формируем чанки с перекрытием
-    chunks: list[str] = []
-    if len(text) < max_len:
-        chunks.append(text)
-    else:     
-        stride = max_len // 2
-        for start in range(0, len(text), max_len - stride):
-            chunk = text[start : start + max_len]
-            chunks.append(chunk)
-            if start + max_len >= len(text):
-                break
-
-    # Кодируем все чанки одним вызовом
-    embeddings = model.encode(chunks, convert_to_numpy=True)
-    # Усредняем по всем чанкам
-    avg_emb = np.mean(embeddings, axis=0)
-    return avg_emb.tolist()
-
-def generate_article_json(articles):
-    output = {"data": []}
-    for art in articles:
-        art_id = art.get("id", str(uuid.uuid4()))
-        emb = embed_long_text(art["content"])
-        
-        item = {
-            "id": art_id,
-            "type": "article",
-            "action": "upsert",
-            "updatedAt": (
-                art["updated_at"].isoformat() + "Z"
-                if isinstance(art["updated_at"], datetime)
-                else art["updated_at"]
-            ),
-            "mainImageUrl": art["main_image_url"],
-            "tags": art["tags"],
-            "attributes": {
-                "title": art["title"],
-                "shortDescription": art["short_description"],
-                "content": art["content"],
-                "embeddings": {
-                    "typeName": MODEL_NAME,
-                    "size": len(emb),
-                    "data": emb
-                }
-            }
-        }
-        output["data"].append(item)
-    return json.dumps(output, ensure_ascii=False, indent=2)
-
-if __name__ == "__main__":
-    from datetime import datetime
-
-    sample_articles = [
-    {
-        "title": "AI Revolution in Healthcare",
-        "short_description": "How artificial intelligence is transforming medical diagnostics.",
-        "content": """# AI Revolution in Healthcare
-
-Artificial intelligence is rapidly changing how doctors diagnose and treat diseases. Machine learning algorithms can now detect cancer in medical images with accuracy matching experienced radiologists.
-
-## Key Applications
-- **Early Detection**: AI identifies patterns in X-rays and MRIs that humans might miss
-- **Drug Discovery**: Algorithms accelerate the development of new medications
-- **Personalized Treatment**: AI analyzes patient data to customize therapy plans
-
-## Challenges Ahead
-Despite promising results, AI in healthcare faces regulatory hurdles and data privacy concerns. Medical professionals emphasize that AI should augment, not replace, human expertise.
-
-The future looks bright as hospitals worldwide adopt these technologies, potentially saving millions of lives through earlier and more accurate diagnoses.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology", "health"],
-        "updated_at": datetime(2024, 6, 1, 9, 15)
-    },
-    {
-        "title": "Blockchain Beyond Bitcoin",
-        "short_description": "Exploring blockchain applications in various industries.",
-        "content": """# Blockchain Beyond Bitcoin
-
-While cryptocurrency grabbed headlines, blockchain technology's real potential extends far beyond digital money. This distributed ledger system is revolutionizing multiple sectors.
-
-## Real-World Applications
-- **Supply Chain**: Tracking products from manufacture to delivery
-- **Healthcare**: Securing patient records and ensuring data integrity
-- **Real Estate**: Streamlining property transactions and reducing fraud
-
-## How It Works
-Blockchain creates an immutable record of transactions, verified by multiple parties. This transparency builds trust without centralized authorities.
-
-Companies like IBM and Microsoft are investing billions in blockchain solutions. As the technology matures, expect to see it powering everything from voting systems to digital identities.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology", "finance"],
-        "updated_at": datetime(2024, 5, 28, 14, 30)
-    },
-    {
-        "title": "The Power of Compound Interest",
-        "short_description": "Understanding the eighth wonder of the world.",
-        "content": """# The Power of Compound Interest
-
-Albert Einstein allegedly called compound interest "the eighth wonder of the world." Whether he said it or not, the principle remains one of the most powerful forces in finance.
-
-## The Magic Formula
-Compound interest means earning returns on your returns. A $1,000 investment at 7% annual return becomes:
-- Year 1: $1,070
-- Year 10: $1,967
-- Year 30: $7,612
-
-## Starting Early Matters
-The key is time. Someone who invests $200 monthly starting at 25 will have more at retirement than someone investing $400 monthly starting at 35.
-
-## Practical Tips
-- Maximize employer 401(k) matches
-- Reinvest dividends automatically
-- Consider low-cost index funds
-
-Small, consistent investments today can create significant wealth tomorrow.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance"],
-        "updated_at": datetime(2024, 5, 25, 11, 0)
-    },
-    {
-        "title": "Mental Health in the Digital Age",
-        "short_description": "Navigating wellness in a connected world.",
-        "content": """# Mental Health in the Digital Age
-
-Social media and constant connectivity have created new mental health challenges. Understanding these impacts is crucial for maintaining psychological wellbeing.
-
-## Digital Stressors
-- **Information Overload**: Constant news updates trigger anxiety
-- **Social Comparison**: Curated online lives fuel inadequacy feelings
-- **Sleep Disruption**: Blue light affects natural sleep cycles
-
-## Healthy Strategies
-1. Set device boundaries - no phones during meals
-2. Practice digital detoxes - weekend breaks from social media
-3. Use wellness apps mindfully - meditation and breathing exercises
-
-## Finding Balance
-Technology isn't inherently harmful. Video calls connect distant families, apps provide therapy access, and online communities offer support. The key is intentional, balanced use.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health", "technology"],
-        "updated_at": datetime(2024, 5, 22, 16, 45)
-    },
-    {
-        "title": "The Future of Online Learning",
-        "short_description": "How digital platforms are reshaping education.",
-        "content": """# The Future of Online Learning
-
-Education is undergoing a digital transformation. Online learning platforms are making quality education accessible to millions worldwide, breaking down traditional barriers.
-
-## Key Advantages
-- **Flexibility**: Learn at your own pace, anywhere
-- **Affordability**: Often cheaper than traditional programs
-- **Variety**: Access courses from global institutions
-
-## Emerging Trends
-Virtual reality classrooms, AI tutors, and gamified learning are enhancing engagement. Micro-credentials and digital badges are gaining employer recognition.
-
-## Challenges to Address
-- Maintaining student motivation
-- Ensuring academic integrity
-- Building virtual communities
-
-As technology advances, hybrid models combining online and in-person elements may become the norm, offering the best of both worlds.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["education", "technology"],
-        "updated_at": datetime(2024, 5, 20, 13, 30)
-    },
-    {
-        "title": "Sustainable Investing 101",
-        "short_description": "Aligning your portfolio with your values.",
-        "content": """# Sustainable Investing 101
-
-Environmental, Social, and Governance (ESG) investing is no longer a niche strategy. Investors increasingly seek returns while supporting positive change.
-
-## What is ESG?
-- **Environmental**: Climate action, renewable energy
-- **Social**: Fair labor practices, community development
-- **Governance**: Ethical leadership, transparency
-
-## Performance Myths Debunked
-Studies show ESG funds often match or outperform traditional investments. Companies with strong sustainability practices tend to be better managed overall.
-
-## Getting Started
-1. Research ESG ratings of funds
-2. Consider impact investing options
-3. Look for green bonds
-4. Avoid "greenwashing" - verify claims
-
-Your investments can generate returns while funding the transition to a sustainable economy.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance", "environment"],
-        "updated_at": datetime(2024, 5, 18, 10, 15)
-    },
-    {
-        "title": "Urban Farming Revolution",
-        "short_description": "Growing food in the heart of the city.",
-        "content": """# Urban Farming Revolution
-
-Cities worldwide are transforming rooftops, vacant lots, and even underground spaces into productive farms. This movement addresses food security while reducing environmental impact.
-
-## Innovative Techniques
-- **Vertical Farming**: Stack crops in towers to maximize space
-- **Hydroponics**: Grow plants without soil using nutrient solutions
-- **Aquaponics**: Combine fish farming with vegetable production
-
-## Benefits
-Urban farms reduce transportation emissions, provide fresh produce to food deserts, and create green jobs. They also help cities manage stormwater and reduce heat island effects.
-
-## Join the Movement
-Start small with balcony gardens or community plots. Many cities offer grants and training for aspiring urban farmers. Every green space counts in building sustainable cities.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["environment"],
-        "updated_at": datetime(2024, 5, 15, 8, 0)
-    },
-    {
-        "title": "Personalized Medicine Breakthrough",
-        "short_description": "How genetics is revolutionizing treatment.",
-        "content": """# Personalized Medicine Breakthrough
-
-Gone are the days of one-size-fits-all healthcare. Personalized medicine uses genetic information to tailor treatments to individual patients, improving outcomes and reducing side effects.
-
-## How It Works
-Doctors analyze your DNA to:
-- Predict disease risk
-- Choose optimal medications
-- Determine correct dosages
-- Identify potential drug interactions
-
-## Real Success Stories
-Cancer patients now receive targeted therapies based on tumor genetics. Pharmacogenomics helps doctors prescribe antidepressants that work best for each patient's genetic makeup.
-
-## The Road Ahead
-Costs are dropping rapidly. What once cost millions now costs hundreds. Soon, genetic testing may be as routine as blood pressure checks, ushering in an era of truly personalized healthcare.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health"],
-        "updated_at": datetime(2024, 5, 12, 15, 20)
-    },
-    {
-        "title": "Cybersecurity for Small Business",
-        "short_description": "Essential protection strategies for limited budgets.",
-        "content": """# Cybersecurity for Small Business
-
-Small businesses are prime targets for cybercriminals, yet many lack adequate protection. Here's how to secure your business without breaking the bank.
-
-## Critical Steps
-1. **Regular Updates**: Keep all software patched
-2. **Strong Passwords**: Use password managers and two-factor authentication
-3. **Employee Training**: Most breaches involve human error
-4. **Data Backups**: Follow the 3-2-1 rule (3 copies, 2 different media, 1 offsite)
-
-## Affordable Tools
-- Free antivirus for small teams
-- Cloud-based security services
-- Open-source firewalls
-
-## Incident Response
-Have a plan before disaster strikes. Know who to call, how to isolate affected systems, and what to tell customers. Preparation can mean the difference between a minor incident and business closure.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology", "finance"],
-        "updated_at": datetime(2024, 5, 10, 11, 45)
-    },
-    {
-        "title": "Climate Change and Your Health",
-        "short_description": "Understanding the health impacts of a warming planet.",
-        "content": """# Climate Change and Your Health
-
-Climate change isn't just an environmental issue—it's a public health emergency. Rising temperatures and extreme weather directly affect human health in multiple ways.
-
-## Direct Impacts
-- **Heat Stress**: More frequent heatwaves increase cardiovascular strain
-- **Air Quality**: Wildfire smoke and pollution worsen respiratory conditions
-- **Disease Spread**: Warmer climates expand mosquito-borne illness ranges
-
-## Vulnerable Populations
-Children, elderly, and those with chronic conditions face highest risks. Low-income communities often lack resources to adapt.
-
-## Protective Actions
-- Stay hydrated during heat events
-- Monitor air quality alerts
-- Support clean energy initiatives
-- Prepare emergency kits for extreme weather
-
-Individual and collective action can help mitigate these growing health threats.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health", "environment"],
-        "updated_at": datetime(2024, 5, 8, 9, 30)
-    },
-    {
-        "title": "Gamification in Education",
-        "short_description": "Making learning fun and engaging through game mechanics.",
-        "content": """# Gamification in Education
-
-Educational games aren't just for kids anymore. Gamification—applying game design elements to learning—is transforming how people of all ages acquire new skills.
-
-## Core Elements
-- **Points and Badges**: Reward progress and achievements
-- **Leaderboards**: Foster healthy competition
-- **Quests**: Break learning into manageable missions
-- **Immediate Feedback**: Know instantly if you're on track
-
-## Success Stories
-Language apps like Duolingo keep millions engaged through streaks and levels. Coding platforms use puzzle-solving to teach programming concepts. Even medical schools use simulations for surgical training.
-
-## Implementation Tips
-Start small—add progress bars or achievement certificates. Focus on intrinsic motivation, not just external rewards. The goal is sustained engagement, not just temporary excitement.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["education"],
-        "updated_at": datetime(2024, 5, 5, 14, 15)
-    },
-    {
-        "title": "Renewable Energy Investing",
-        "short_description": "Opportunities in the clean energy transition.",
-        "content": """# Renewable Energy Investing
-
-The renewable energy sector is experiencing explosive growth. Smart investors are positioning themselves to benefit from the inevitable transition away from fossil fuels.
-
-## Investment Options
-- **Solar and Wind Stocks**: Companies manufacturing and installing systems
-- **Energy Storage**: Battery technology is crucial for renewable adoption
-- **Green ETFs**: Diversified exposure to the clean energy sector
-- **Yieldcos**: Companies that own operating renewable assets
-
-## Market Drivers
-Government incentives, falling technology costs, and corporate sustainability commitments are accelerating adoption. The sector is moving from alternative to mainstream.
-
-## Risk Considerations
-Policy changes, technology disruption, and competition affect returns. Diversification across technologies and geographies helps manage risk while capturing growth potential.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance", "environment"],
-        "updated_at": datetime(2024, 5, 2, 10, 45)
-    },
-    {
-        "title": "Sleep Science Breakthroughs",
-        "short_description": "Latest discoveries in understanding and improving sleep.",
-        "content": """# Sleep Science Breakthroughs
-
-Recent research is revolutionizing our understanding of sleep. New findings reveal why quality rest is even more critical than previously thought.
-
-## Key Discoveries
-- **Brain Cleaning**: Sleep triggers a washing system that clears toxic proteins
-- **Memory Consolidation**: Different sleep stages serve specific learning functions
-- **Immune Function**: Poor sleep weakens vaccine effectiveness
-
-## Optimization Strategies
-1. **Temperature**: Cool rooms (65-68°F) promote deeper sleep
-2. **Consistency**: Regular sleep schedules sync circadian rhythms
-3. **Light Exposure**: Morning sunlight, evening dimness
-
-## Technology Helpers
-Smart mattresses adjust firmness, sleep apps track patterns, and white noise machines mask disruptions. Use technology wisely—avoid screens before bed.
-
-Prioritizing sleep isn't lazy—it's a performance enhancer.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health"],
-        "updated_at": datetime(2024, 4, 30, 7, 0)
-    },
-    {
-        "title": "Quantum Computing Explained",
-        "short_description": "Understanding the next computing revolution.",
-        "content": """# Quantum Computing Explained
-
-Quantum computers promise to solve problems that would take classical computers millions of years. But how do they work, and what can they actually do?
-
-## The Quantum Difference
-Traditional computers use bits (0 or 1). Quantum computers use qubits that can be both simultaneously through "superposition." This parallel processing enables exponential speedups for certain problems.
-
-## Practical Applications
-- **Drug Discovery**: Simulate molecular interactions
-- **Cryptography**: Break current encryption, create quantum-safe alternatives
-- **Finance**: Optimize portfolios and detect fraud
-- **Climate Modeling**: Process vast environmental datasets
-
-## Current Limitations
-Quantum computers need near-absolute zero temperatures and are prone to errors. They won't replace traditional computers but will complement them for specific tasks.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology"],
-        "updated_at": datetime(2024, 4, 28, 13, 20)
-    },
-    {
-        "title": "Financial Literacy for Teens",
-        "short_description": "Essential money skills for the next generation.",
-        "content": """# Financial Literacy for Teens
-
-Teaching teenagers about money management sets them up for lifelong financial success. Yet many schools still don't cover these crucial life skills.
-
-## Core Concepts
-- **Budgeting**: Track income and expenses using apps
-- **Saving**: Pay yourself first—even $20/month matters
-- **Credit**: Understand how credit scores work before getting that first card
-- **Investing**: Start with basic index funds
-
-## Real-World Practice
-Give teens hands-on experience:
-- Let them manage a clothing budget
-- Open a joint checking account
-- Match their savings contributions
-- Discuss family financial decisions
-
-## Resources
-Many banks offer teen accounts with parental controls. Investment apps allow fractional share purchases. Online courses gamify financial concepts.
-
-Starting early creates habits that compound over a lifetime.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance", "education"],
-        "updated_at": datetime(2024, 4, 25, 16, 0)
-    },
-    {
-        "title": "Ocean Plastic Solutions",
-        "short_description": "Innovative approaches to marine pollution.",
-        "content": """# Ocean Plastic Solutions
-
-Eight million tons of plastic enter our oceans yearly. While the problem seems overwhelming, innovative solutions are emerging from unexpected places.
-
-## Cleanup Technologies
-- **Ocean Cleanup Arrays**: Passive systems that use currents to collect debris
-- **Drone Swarms**: AI-powered drones identify and retrieve plastic
-- **Bioplastics**: Materials that safely biodegrade in marine environments
-
-## Prevention Strategies
-- Circular economy models
-- Improved waste management in coastal areas
-- Alternative packaging materials
-
-## Individual Actions
-Choose reusable products, support ocean-friendly brands, participate in beach cleanups, and reduce single-use plastics. Small actions multiply when millions participate.
-
-The tide is turning as governments, businesses, and individuals unite against ocean plastic.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["environment"],
-        "updated_at": datetime(2024, 4, 22, 11, 30)
-    },
-    {
-        "title": "AI in Education",
-        "short_description": "How artificial intelligence personalizes learning.",
-        "content": """# AI in Education
-
-Artificial intelligence is creating truly personalized learning experiences. AI tutors adapt to each student's pace, identifying knowledge gaps and adjusting instruction accordingly.
-
-## Current Applications
-- **Adaptive Learning**: Platforms adjust difficulty based on performance
-- **Automated Grading**: AI evaluates essays and provides feedback
-- **Predictive Analytics**: Identify at-risk students before they fall behind
-- **Language Learning**: AI conversation partners available 24/7
-
-## Benefits
-Students learn at their own pace, teachers focus on mentoring rather than repetitive tasks, and education becomes accessible to remote areas.
-
-## Ethical Considerations
-Privacy, bias in algorithms, and maintaining human connection remain challenges. The goal is AI-enhanced, not AI-replaced, education.
-
-The future classroom will blend human creativity with AI efficiency.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["education", "technology"],
-        "updated_at": datetime(2024, 4, 20, 14, 45)
-    },
-    {
-        "title": "Green Building Revolution",
-        "short_description": "Sustainable architecture for a better future.",
-        "content": """# Green Building Revolution
-
-Buildings consume 40% of global energy. Green architecture is transforming how we design, construct, and operate structures to minimize environmental impact.
-
-## Key Features
-- **Passive Design**: Orientation and materials that naturally regulate temperature
-- **Renewable Energy**: Solar panels, geothermal systems
-- **Water Conservation**: Rainwater harvesting, greywater recycling
-- **Living Walls**: Vertical gardens that purify air and insulate
-
-## Certification Systems
-LEED, BREEAM, and Living Building Challenge set standards for sustainability. These buildings often have lower operating costs and higher occupant satisfaction.
-
-## The Business Case
-Green buildings command premium rents, reduce utility costs, and attract environmentally conscious tenants. They're not just good for the planet—they're good business.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["environment"],
-        "updated_at": datetime(2024, 4, 18, 9, 15)
-    },
-    {
-        "title": "Nutrition Myths Debunked",
-        "short_description": "Science-based facts about common diet misconceptions.",
-        "content": """# Nutrition Myths Debunked
-
-Nutrition advice seems to change constantly, leaving people confused about what to eat. Let's separate fact from fiction using current scientific evidence.
-
-## Common Myths
-- **Myth**: Carbs make you fat
-- **Truth**: Excess calories from any source cause weight gain
-
-- **Myth**: Detox diets cleanse toxins
-- **Truth**: Your liver and kidneys already do this effectively
-
-- **Myth**: Organic always means healthier
-- **Truth**: Nutritional content is similar; pesticide exposure differs
-
-## Evidence-Based Guidelines
-Focus on whole foods, vary your diet, control portions, and stay hydrated. No single food is magic or poison—balance matters most.
-
-## Red Flags
-Beware extreme restrictions, expensive supplements, and miracle claims. Sustainable healthy eating is simple, not secretive.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health"],
-        "updated_at": datetime(2024, 4, 15, 12, 0)
-    },
-    {
-        "title": "Future of Work",
-        "short_description": "How technology is reshaping careers and workplaces.",
-        "content": """# Future of Work
-
-The workplace is evolving rapidly. Remote work, artificial intelligence, and changing employee expectations are creating new opportunities and challenges for workers and employers alike.
-
-## Major Trends
-- **Hybrid Models**: Combining office and remote work
-- **Skill Evolution**: Continuous learning becomes essential
-- **Gig Economy**: More professionals choosing freelance careers
-- **Automation**: AI handles routine tasks, humans focus on creativity
-
-## Preparing for Change
-Develop both technical and soft skills. Emotional intelligence, creativity, and adaptability become more valuable as machines handle routine work.
-
-## New Opportunities
-Emerging roles in AI ethics, remote collaboration, and digital wellness. Geographic barriers dissolve as talent can work from anywhere.
-
-The future belongs to lifelong learners who embrace change.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology", "education"],
-        "updated_at": datetime(2024, 4, 12, 15, 30)
-    },
-    {
-        "title": "AI Revolution in Healthcare: Transforming Patient Care",
-        "short_description": "How artificial intelligence is revolutionizing medical diagnosis and treatment.",
-        "content": """# AI Revolution in Healthcare: Transforming Patient Care
-
-Artificial intelligence is fundamentally changing how we approach healthcare, from diagnosis to treatment planning. Machine learning algorithms can now analyze medical images with accuracy that rivals experienced radiologists, detecting early-stage cancers and other conditions that might be missed by human eyes.
-
-## Key Applications
-
-AI-powered diagnostic tools are being deployed in hospitals worldwide, helping doctors make faster and more accurate decisions. These systems can process vast amounts of patient data, identifying patterns and correlations that inform treatment strategies.
-
-Predictive analytics help healthcare providers anticipate patient needs, reducing readmission rates and improving outcomes. Virtual health assistants provide 24/7 support, answering patient questions and monitoring vital signs remotely.
-
-The integration of AI in healthcare promises more personalized medicine, where treatments are tailored to individual genetic profiles and medical histories, leading to better patient outcomes and reduced healthcare costs.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology", "health"],
-        "updated_at": datetime(2024, 5, 1, 12, 30)
-    },
-    {
-        "title": "Cryptocurrency Investment Strategies for Beginners",
-        "short_description": "Essential guide to starting your cryptocurrency investment journey safely.",
-        "content": """# Cryptocurrency Investment Strategies for Beginners
-
-Entering the cryptocurrency market can be overwhelming for newcomers. Understanding basic investment principles and risk management is crucial for success in this volatile market.
-
-## Getting Started
-
-Begin with established cryptocurrencies like Bitcoin and Ethereum before exploring altcoins. Dollar-cost averaging helps reduce the impact of market volatility by spreading purchases over time.
-
-Never invest more than you can afford to lose. Cryptocurrency markets are highly volatile and can experience significant price swings within hours.
-
-## Security First
-
-Use reputable exchanges and enable two-factor authentication. Consider hardware wallets for long-term storage of significant amounts. Keep private keys secure and never share them with anyone.
-
-Research thoroughly before investing in any cryptocurrency project. Look at the team, technology, use case, and community support. Diversification across different cryptocurrencies can help manage risk while potentially maximizing returns.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance", "technology"],
-        "updated_at": datetime(2024, 5, 2, 14, 15)
-    },
-    {
-        "title": "Online Learning: The Future of Education",
-        "short_description": "How digital platforms are reshaping education and making learning accessible.",
-        "content": """# Online Learning: The Future of Education
-
-The digital transformation of education has accelerated dramatically, making quality learning accessible to millions worldwide. Online platforms offer flexibility and personalization that traditional classrooms often cannot match.
-
-## Advantages of Digital Learning
-
-Students can learn at their own pace, revisiting difficult concepts and advancing quickly through familiar material. Interactive multimedia content engages different learning styles, from visual learners to hands-on practitioners.
-
-Global accessibility breaks down geographical barriers, allowing students in remote areas to access world-class education. Cost-effectiveness makes quality education more affordable for many families.
-
-## Challenges and Solutions
-
-Maintaining student engagement requires innovative teaching methods and regular interaction. Technical requirements and digital literacy gaps need addressing to ensure equal access.
-
-The future of education likely combines online and offline elements, creating hybrid learning environments that maximize the benefits of both approaches while addressing their respective limitations.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["education", "technology"],
-        "updated_at": datetime(2024, 5, 3, 9, 45)
-    },
-    {
-        "title": "Sustainable Energy Solutions for Climate Change",
-        "short_description": "Exploring renewable energy technologies that can help combat climate change.",
-        "content": """# Sustainable Energy Solutions for Climate Change
-
-The transition to renewable energy is critical for addressing climate change and reducing our dependence on fossil fuels. Solar, wind, and hydroelectric power are becoming increasingly cost-effective and efficient.
-
-## Solar Power Revolution
-
-Photovoltaic technology has improved dramatically while costs have plummeted. Solar panels now generate electricity at prices competitive with traditional energy sources in many regions.
-
-Battery storage solutions are solving the intermittency problem, allowing solar energy to power homes and businesses even when the sun isn't shining.
-
-## Wind Energy Growth
-
-Offshore wind farms are generating massive amounts of clean energy, with turbines becoming larger and more efficient. Wind power is now one of the cheapest sources of electricity in many countries.
-
-## The Path Forward
-
-Government policies and private investment are accelerating the renewable energy transition. Smart grids and energy storage technologies are making renewable energy more reliable and practical for widespread adoption.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["environment", "technology"],
-        "updated_at": datetime(2024, 5, 4, 16, 20)
-    },
-    {
-        "title": "Mental Health in the Digital Age",
-        "short_description": "Understanding and managing mental health challenges in our connected world.",
-        "content": """# Mental Health in the Digital Age
-
-Our increasingly connected world brings both opportunities and challenges for mental health. While technology can provide support and resources, it can also contribute to anxiety, depression, and social isolation.
-
-## Digital Wellness Strategies
-
-Setting boundaries with technology use is essential for mental well-being. Regular digital detoxes help reset our relationship with devices and social media.
-
-Mindfulness apps and online therapy platforms make mental health resources more accessible than ever before. These tools can complement traditional therapy and provide support between sessions.
-
-## Social Media Impact
-
-Social media can negatively impact self-esteem and create unrealistic comparisons. Curating feeds to include positive, inspiring content while unfollowing accounts that trigger negative feelings is important.
-
-## Building Resilience
-
-Developing healthy coping mechanisms, maintaining real-world relationships, and practicing self-care are crucial for thriving in the digital age. Professional help should be sought when needed, as mental health is just as important as physical health.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health", "technology"],
-        "updated_at": datetime(2024, 5, 5, 11, 10)
-    },
-    {
-        "title": "Personal Finance Budgeting Basics",
-        "short_description": "Essential budgeting strategies to take control of your financial future.",
-        "content": """# Personal Finance Budgeting Basics
-
-Creating and maintaining a budget is the foundation of financial health. A well-planned budget helps you track spending, save for goals, and avoid debt while building long-term wealth.
-
-## The 50/30/20 Rule
-
-Allocate 50% of after-tax income to needs (housing, utilities, groceries), 30% to wants (entertainment, dining out), and 20% to savings and debt repayment. This simple framework provides structure while allowing flexibility.
-
-## Tracking Expenses
-
-Use budgeting apps or spreadsheets to monitor spending patterns. Categorize expenses to identify areas where you might be overspending and opportunities to cut costs.
-
-## Emergency Fund Priority
-
-Build an emergency fund covering 3-6 months of expenses before focusing on other financial goals. This safety net prevents debt accumulation during unexpected situations.
-
-## Automation Benefits
-
-Set up automatic transfers to savings accounts and automatic bill payments to ensure consistency. Pay yourself first by automatically saving before spending on discretionary items.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance"],
-        "updated_at": datetime(2024, 5, 6, 13, 25)
-    },
-    {
-        "title": "STEM Education: Preparing Students for Tomorrow",
-        "short_description": "Why STEM education is crucial for preparing students for future careers.",
-        "content": """# STEM Education: Preparing Students for Tomorrow
-
-Science, Technology, Engineering, and Mathematics (STEM) education is essential for preparing students for the jobs of the future. As technology continues to advance, STEM skills become increasingly valuable across all industries.
-
-## Critical Thinking Development
-
-STEM education emphasizes problem-solving, analytical thinking, and logical reasoning. These skills are transferable to many career paths and help students become better decision-makers in all aspects of life.
-
-## Hands-On Learning
-
-Project-based learning in STEM subjects engages students actively in the learning process. Building robots, conducting experiments, and coding programs make abstract concepts tangible and memorable.
-
-## Career Opportunities
-
-STEM careers typically offer higher salaries and job security. From healthcare and engineering to data science and renewable energy, STEM fields are driving innovation and economic growth.
+# Бэкенд кодирования (см. encoders.ENCODER_BACKENDS) и intra-op потоки ONNX Runtime
+ENCODER_BACKEND = "torch"
+ENCODER_THREADS = None
+# Профилировщик стадий (--profile, см. profiling.Profiler); None — без инструментирования
+PROFILER = None
 
-## Inclusive Approach
 
-Encouraging diversity in STEM education ensures that all students, regardless of background or gender, have opportunities to pursue these rewarding career paths. Early exposure and supportive environments are key to building interest and confidence.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["education", "technology"],
-        "updated_at": datetime(2024, 5, 7, 10, 40)
-    },
-    {
-        "title": "Ocean Conservation: Protecting Marine Ecosystems",
-        "short_description": "Critical steps needed to preserve our oceans and marine life for future generations.",
-        "content": """# Ocean Conservation: Protecting Marine Ecosystems
+def _stage(name: str, items: int = 0):
+    """Замер стадии name, если включён PROFILER; иначе пустой контекст."""
+    return PROFILER.stage(name, items) if PROFILER is not None else contextlib.nullcontext()
 
-Our oceans face unprecedented threats from pollution, overfishing, and climate change. Protecting marine ecosystems is crucial for maintaining biodiversity and supporting billions of people who depend on ocean resources.
 
-## Plastic Pollution Crisis
+@functools.lru_cache(maxsize=None)
+def _load_model(model_name: str, backend: str = "torch", threads: int = None):
+    # torch / sentence_transformers / onnxruntime импортируются только при первом обращении
+    # к модели: пути без эмбеддингов (сериализация, конвертация форматов) их не загружают
+    with _stage("model_load"):
+        return load_encoder(model_name, backend, threads)
 
-Millions of tons of plastic waste enter our oceans annually, harming marine life and contaminating the food chain. Reducing single-use plastics and improving waste management systems are essential steps.
 
-Marine protected areas provide safe havens for fish populations to recover and ecosystems to thrive. These areas also support sustainable fishing practices and eco-tourism.
+def get_model():
+    """Лениво созданная и закэшированная модель MODEL_NAME на бэкенде ENCODER_BACKEND."""
+    return _load_model(MODEL_NAME, ENCODER_BACKEND, ENCODER_THREADS)
 
-## Climate Change Impact
 
-Ocean acidification and rising temperatures threaten coral reefs and marine species. Reducing carbon emissions and supporting renewable energy helps address these climate-related challenges.
+def _cache_model_id() -> str:
+    """Имя модели для ключей кэша: эмбеддинги разных бэкендов не смешиваются."""
+    return MODEL_NAME if ENCODER_BACKEND == "torch" else f"{MODEL_NAME}#{ENCODER_BACKEND}"
 
-## Individual Actions
 
-Everyone can contribute to ocean conservation through conscious consumer choices, supporting sustainable seafood, participating in beach cleanups, and advocating for stronger environmental policies. Small actions collectively make a significant impact on ocean health.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["environment"],
-        "updated_at": datetime(2024, 5, 8, 15, 55)
-    },
-    {
-        "title": "Blockchain Technology Beyond Cryptocurrency",
-        "short_description": "Exploring blockchain applications in supply chain, healthcare, and governance.",
-        "content": """# Blockchain Technology Beyond Cryptocurrency
+# Размер батча model.encode и число статей, чанки которых кодируются вместе
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_WINDOW = 256
 
-While blockchain is best known for powering cryptocurrencies, its applications extend far beyond digital money. This distributed ledger technology offers transparency, security, and decentralization across various industries.
+# "chars" — окна по max_len символов (исходное поведение),
+# "tokens" — окна по max_len токенов токенизатора модели с разбиением по разметке Markdown
+CHUNKING_MODES = ("chars", "tokens")
+# Перекрытие (в токенах) при нарезке абзацев, не помещающихся в одно окно модели
+DEFAULT_TOKEN_OVERLAP = 32
 
-## Supply Chain Transparency
+# "json" — конверт {"data": [...]}, "ndjson" — по элементу на строку
+OUTPUT_FORMATS = ("json", "ndjson")
+# Форматы attributes.embeddings.data, см. encode_embedding
+EMBEDDING_ENCODINGS = ("list", "f32-base64", "f16-base64", "i8-base64")
 
-Blockchain enables complete traceability of products from origin to consumer. Companies can track food safety, verify authenticity of luxury goods, and ensure ethical sourcing of materials.
+_HEADING_RE = re.compile(r"#{1,6}\s")
 
-## Healthcare Records
 
-Secure, interoperable health records on blockchain give patients control over their data while enabling healthcare providers to access complete medical histories when needed.
-
-## Digital Identity
-
-Blockchain-based identity systems reduce fraud and give individuals control over their personal information. This technology can streamline verification processes while protecting privacy.
-
-## Smart Contracts
-
-Automated contracts execute when predetermined conditions are met, reducing the need for intermediaries and increasing efficiency in various business processes.
-
-The technology's potential for creating more transparent, efficient, and secure systems continues to drive innovation across industries.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["technology", "finance"],
-        "updated_at": datetime(2024, 5, 9, 12, 15)
-    },
-    {
-        "title": "Nutrition Myths Debunked by Science",
-        "short_description": "Separating fact from fiction in popular nutrition beliefs and diet trends.",
-        "content": """# Nutrition Myths Debunked by Science
-
-Nutrition misinformation spreads rapidly, leading to confusion about healthy eating. Scientific research helps separate evidence-based nutrition advice from popular myths and marketing claims.
-
-## Myth: Carbs Are Always Bad
-
-Complex carbohydrates from whole grains, fruits, and vegetables provide essential nutrients and energy. The quality and quantity of carbohydrates matter more than avoiding them entirely.
-
-## Myth: Fat Makes You Fat
-
-Healthy fats from sources like avocados, nuts, and olive oil are essential for hormone production and nutrient absorption. Total calorie balance, not fat intake alone, determines weight changes.
-
-## Myth: Detox Diets Cleanse Toxins
-
-Your liver and kidneys naturally detoxify your body. Expensive detox products and extreme cleanses are unnecessary and potentially harmful.
-
-## Evidence-Based Approach
-
-Focus on whole foods, balanced meals, and sustainable eating patterns rather than following restrictive fad diets. Consult registered dietitians for personalized nutrition advice based on scientific evidence rather than social media trends.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["health"],
-        "updated_at": datetime(2024, 5, 10, 14, 30)
-    },
-    {
-        "title": "Investment Diversification Strategies",
-        "short_description": "Building a balanced investment portfolio to minimize risk and maximize returns.",
-        "content": """# Investment Diversification Strategies
-
-Diversification is a fundamental principle of investing that helps reduce risk while potentially improving returns. By spreading investments across different asset classes, sectors, and geographic regions, investors can protect their portfolios from market volatility.
-
-## Asset Class Diversification
-
-Combine stocks, bonds, real estate, and commodities in your portfolio. Each asset class responds differently to economic conditions, providing balance during market fluctuations.
-
-## Geographic Diversification
-
-International investments provide exposure to different economies and currencies. Emerging markets offer growth potential, while developed markets provide stability.
-
-## Sector Diversification
-
-Avoid concentrating investments in a single industry. Technology, healthcare, consumer goods, and financial services each have different risk profiles and growth patterns.
-
-## Rebalancing Strategy
-
-Regularly review and adjust your portfolio to maintain target allocations. Market movements can shift your asset allocation away from your intended strategy.
-
-Time horizon and risk tolerance should guide your diversification strategy. Younger investors can typically accept more risk for potentially higher returns.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["finance"],
-        "updated_at": datetime(2024, 5, 11, 16, 45)
-    },
-    {
-        "title": "Personalized Learning in Modern Classrooms",
-        "short_description": "How adaptive learning technologies are customizing education for individual students.",
-        "content": """# Personalized Learning in Modern Classrooms
-
-Personalized learning adapts instruction to meet individual student needs, preferences, and learning styles. Technology enables teachers to provide customized educational experiences that help every student reach their potential.
-
-## Adaptive Learning Platforms
-
-AI-powered systems adjust difficulty levels and content presentation based on student performance. These platforms identify knowledge gaps and provide targeted practice to address specific learning needs.
+def split_into_chunks(text: str, max_len: int = 256, stride: int = None) -> list:
+    """
+    Режем text на перекрывающиеся чанки по max_len символов.
+    stride — размер перекрытия соседних чанков (по умолчанию половина max_len).
+    """
+    if stride is None:
+        stride = max_len // 2
+    chunks: list[str] = []
+    if len(text) < max_len:
+        chunks.append(text)
+    else:
+        for start in range(0, len(text), max_len - stride):
+            chunk = text[start : start + max_len]
+            chunks.append(chunk)
+            if start + max_len >= len(text):
+                break
+    return chunks
 
-## Multiple Learning Pathways
 
-Students can choose from various ways to engage with content, whether through visual presentations, hands-on activities, or collaborative projects. This flexibility accommodates different learning preferences.
+def _markdown_blocks(text: str) -> list:
+    """
+    Делит Markdown на блоки (start, end, is_heading): абзацы разделяются
+    пустыми строками, заголовок всегда начинает новый блок.
+    """
+    blocks = []
+    start = None
+    heading = False
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        is_heading = bool(_HEADING_RE.match(stripped))
+        if not stripped or is_heading:
+            if start is not None:
+                blocks.append((start, pos, heading))
+                start = None
+        if stripped and start is None:
+            start, heading = pos, is_heading
+        if is_heading:
+            blocks.append((start, pos + len(line), True))
+            start = None
+        pos += len(line)
+    if start is not None:
+        blocks.append((start, pos, heading))
+    return blocks
+
+
+def split_into_token_chunks(text: str, max_len: int = 256, stride: int = None,
+                            tokenizer=None) -> list:
+    """
+    Режем text на чанки не длиннее max_len токенов токенизатора модели.
+    Если статья целиком помещается в max_seq_length модели — чанк один.
+    Иначе чанки собираются из целых абзацев, границы по возможности ставятся
+    перед заголовками; абзац длиннее окна режется по offsets токенизатора
+    с перекрытием stride токенов.
+    tokenizer — отдельная копия токенизатора модели для потока, который режет
+    текст параллельно с model.encode (по умолчанию model.tokenizer).
+    """
+    if stride is None:
+        stride = DEFAULT_TOKEN_OVERLAP
+    # [CLS] и [SEP] тоже занимают место в окне модели
+    model = get_model()
+    limit = min(max_len, model.max_seq_length) - 2
+    with _stage("tokenize"):
+        encoding = (tokenizer or model.tokenizer)(text, add_special_tokens=False,
+                                                  return_offsets_mapping=True)
+    offsets = np.asarray(encoding["offset_mapping"], dtype=np.int64).reshape(-1, 2)
+    if PROFILER is not None:
+        PROFILER.count("tokens", len(offsets))
+    if len(offsets) <= limit:
+        return [text]
+
+    token_starts = offsets[:, 0]
+    chunks = []
+    current_start = current_end = None
+    current_tokens = 0
+
+    def flush():
+        nonlocal current_start, current_tokens
+        if current_start is not None:
+            chunks.append(text[current_start:current_end].strip())
+        current_start, current_tokens = None, 0
+
+    for start, end, is_heading in _markdown_blocks(text):
+        first, last = np.searchsorted(token_starts, [start, end])
+        n_tokens = int(last - first)
+        if n_tokens == 0:
+            continue
+        if n_tokens > limit:
+            flush()
+            step = max(limit - stride, 1)
+            for i in range(first, last, step):
+                j = min(i + limit, last)
+                chunks.append(text[offsets[i, 0]:offsets[j - 1, 1]])
+                if j == last:
+                    break
+            continue
+        # Заголовок начинает новый чанк, если текущий заполнен хотя бы наполовину
+        if current_tokens + n_tokens > limit or (is_heading and current_tokens * 2 >= limit):
+            flush()
+        if current_start is None:
+            current_start = start
+        current_end = end
+        current_tokens += n_tokens
+    flush()
+    return chunks or [text]
+
+
+def chunk_text(text: str, max_len: int = 256, stride: int = None,
+               chunking: str = "chars", tokenizer=None) -> list:
+    if chunking == "tokens":
+        return split_into_token_chunks(text, max_len, stride, tokenizer)
+    if chunking == "chars":
+        return split_into_chunks(text, max_len, stride)
+    raise ValueError(f"Неизвестный режим чанкинга: {chunking!r}, ожидается один из {CHUNKING_MODES}")
+
+
+def _resolve_stride(max_len: int, stride: int, chunking: str) -> int:
+    if stride is not None:
+        return stride
+    return DEFAULT_TOKEN_OVERLAP if chunking == "tokens" else max_len // 2
+
+
+def _encode_bucketed(chunks: list, batch_size: int) -> np.ndarray:
+    """
+    Кодирует чанки, предварительно отсортировав их по длине: в каждый батч
+    попадают тексты близкой длины, и на padding почти не тратится время.
+    """
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]), reverse=True)
+    model = get_model()
+    with _stage("encode", len(chunks)):
+        encoded = model.encode([chunks[i] for i in order], batch_size=batch_size,
+                               convert_to_numpy=True)
+    result = np.empty_like(encoded)
+    result[order] = encoded
+    return result
+
+
+def encode_chunks(chunks: list, max_len: int = 256, stride: int = None,
+                  cache: EmbeddingCache = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE,
+                  chunking: str = "chars") -> np.ndarray:
+    """
+    Кодирует чанки батчами по batch_size, одинаковые чанки — один раз.
+    Если передан cache — кодируются только чанки, которых ещё нет в кэше.
+    """
+    stride = _resolve_stride(max_len, stride, chunking)
+    if cache is None:
+        unique = list(dict.fromkeys(chunks))
+        vectors = dict(zip(unique, _encode_bucketed(unique, batch_size)))
+        return np.stack([vectors[chunk] for chunk in chunks])
+
+    with _stage("cache_lookup", len(chunks)):
+        keys = [chunk_key(_cache_model_id(), max_len, stride, chunk, chunking) for chunk in chunks]
+        cached = cache.get_many(keys)
+    missing = {key: chunk for key, chunk in zip(keys, chunks) if key not in cached}
+    if PROFILER is not None:
+        PROFILER.count("cache_hits", len(keys) - len(missing))
+        PROFILER.count("cache_misses", len(missing))
+    if missing:
+        fresh = _encode_bucketed(list(missing.values()), batch_size)
+        new_items = dict(zip(missing.keys(), fresh))
+        with _stage("cache_store", len(new_items)):
+            cache.put_many(new_items)
+        cached.update(new_items)
+    return np.stack([cached[key] for key in keys])
+
+
+def chunk_corpus(texts: list, max_len: int = 256, stride: int = None,
+                 chunking: str = "chars", stats: dict = None, tokenizer=None) -> tuple:
+    """
+    Первая половина embed_corpus: нарезка текстов на чанки.
+    Возвращает (чанки всех текстов подряд, число чанков каждого текста,
+    время чанкинга каждого текста — только под --profile).
+    """
+    all_chunks = []
+    counts = []
+    text_seconds = []
+    for text in texts:
+        with _stage("chunking", 1) as timer:
+            chunks = chunk_text(text, max_len, stride, chunking, tokenizer)
+        all_chunks.extend(chunks)
+        counts.append(len(chunks))
+        if timer is not None:
+            text_seconds.append(timer.wall)
+        if stats is not None and chunking == "tokens":
+            stats["char_chunks"] = stats.get("char_chunks", 0) + len(split_into_chunks(text))
+    if stats is not None:
+        stats["chunks"] = stats.get("chunks", 0) + len(all_chunks)
+    return all_chunks, counts, text_seconds
+
+
+def embed_chunked(all_chunks: list, counts: list, text_seconds: list = (),
+                  max_len: int = 256, stride: int = None,
+                  cache: EmbeddingCache = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE,
+                  chunking: str = "chars") -> np.ndarray:
+    """
+    Вторая половина embed_corpus: кодирование результата chunk_corpus
+    и среднее по чанкам каждого текста. Возвращает матрицу (len(counts), dim).
+    """
+    started = time.perf_counter()
+    embeddings = encode_chunks(all_chunks, max_len, stride, cache, batch_size, chunking)
+    with _stage("pooling", len(counts)):
+        counts = np.asarray(counts)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.add.reduceat(embeddings, offsets, axis=0)
+        result = sums / counts[:, None].astype(embeddings.dtype)
+    if PROFILER is not None:
+        PROFILER.count("chunks", len(all_chunks))
+        chunk_chars = [sum(map(len, all_chunks[o:o + n])) for o, n in zip(offsets, counts)]
+        PROFILER.window_costs(text_seconds, chunk_chars, counts,
+                              time.perf_counter() - started)
+    return result
+
+
+def embed_corpus(texts: list, max_len: int = 256, stride: int = None,
+                 cache: EmbeddingCache = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 chunking: str = "chars",
+                 stats: dict = None) -> np.ndarray:
+    """
+    Эмбеддинги сразу для нескольких текстов: чанки всех текстов кодируются
+    общими батчами, а среднее по чанкам каждого текста считается векторно
+    через сегментную сумму np.add.reduceat. Возвращает матрицу (len(texts), dim).
+    В stats (если передан) накапливается число чанков, а в режиме "tokens" —
+    и число чанков, которое дала бы посимвольная нарезка.
+    """
+    all_chunks, counts, text_seconds = chunk_corpus(texts, max_len, stride, chunking, stats)
+    return embed_chunked(all_chunks, counts, text_seconds, max_len, stride, cache,
+                         batch_size, chunking)
 
-## Data-Driven Insights
 
-Learning analytics help teachers understand student progress and identify areas where additional support is needed. Real-time feedback enables quick interventions to prevent students from falling behind.
+def embed_long_text(text: str, max_len: int = 256, stride: int = None,
+                    cache: EmbeddingCache = None, chunking: str = "chars") -> list:
+    """
+    Разбиваем text на перекрывающиеся чанки (max_len символов или токенов,
+    см. chunking) и возвращаем усреднённый эмбеддинг.
+    При этом все чанки кодируем одним вызовом model.encode(...)
+    """
+    return embed_corpus([text], max_len, stride, cache, chunking=chunking)[0].tolist()
 
-## Student Agency
 
-Personalized learning empowers students to take ownership of their education by setting goals, tracking progress, and making choices about their learning journey. This autonomy increases engagement and motivation.
+def _windows(iterable, size: int = None):
+    """Нарезает iterable на списки по size элементов (size=None — один общий список)."""
+    if size is None:
+        yield list(iterable)
+        return
+    iterator = iter(iterable)
+    while True:
+        window = list(islice(iterator, size))
+        if not window:
+            return
+        yield window
 
-The combination of technology and pedagogical innovation creates more effective and inclusive learning environments.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["education", "technology"],
-        "updated_at": datetime(2024, 5, 12, 11, 20)
-    },
-    {
-        "title": "Urban Sustainability: Green Cities of the Future",
-        "short_description": "How cities are implementing sustainable practices to reduce environmental impact.",
-        "content": """# Urban Sustainability: Green Cities of the Future
 
-As urbanization accelerates globally, cities are implementing innovative sustainability practices to reduce their environmental footprint while improving quality of life for residents.
+def encode_embedding(emb, encoding: str = "list", quantizer: Int8Quantizer = None) -> dict:
+    """
+    Упаковывает вектор в объект attributes.embeddings.
+    "list"       — JSON-список чисел (формат по умолчанию, его понимают все клиенты);
+    "f32-base64" — little-endian float32 байты в base64 (~4× компактнее списка);
+    "f16-base64" — little-endian float16 байты в base64 (~8× компактнее списка);
+    "i8-base64"  — int8 в base64 (~16× компактнее списка): при per-vector квантовании
+                   масштаб кладётся в поле "scale", при per-dim — общие масштабы
+                   корпуса хранятся отдельно (Int8Quantizer.to_json).
+    Для упакованных форматов поле "encoding" сообщает клиенту, как читать "data".
+    """
+    if encoding == "list":
+        data = emb.tolist() if isinstance(emb, np.ndarray) else list(emb)
+        return {"typeName": MODEL_NAME, "size": len(data), "data": data}
+    if encoding not in EMBEDDING_ENCODINGS:
+        raise ValueError(
+            f"Неизвестная кодировка эмбеддингов: {encoding!r}, ожидается одна из {EMBEDDING_ENCODINGS}"
+        )
+    if encoding == "i8-base64":
+        quantizer = quantizer or Int8Quantizer()
+        q, scale = quantizer.quantize(emb)
+        result = {
+            "typeName": MODEL_NAME,
+            "size": len(emb),
+            "encoding": encoding,
+            "data": base64.b64encode(q.tobytes()).decode("ascii"),
+        }
+        if quantizer.mode == "per-vector":
+            result["scale"] = float(scale)
+        return result
+    dtype = "<f4" if encoding == "f32-base64" else "<f2"
+    packed = np.asarray(emb, dtype=dtype).tobytes()
+    return {
+        "typeName": MODEL_NAME,
+        "size": len(emb),
+        "encoding": encoding,
+        "data": base64.b64encode(packed).decode("ascii"),
+    }
 
-## Green Infrastructure
 
-Cities are incorporating green roofs, urban forests, and permeable pavements to manage stormwater, reduce heat islands, and improve air quality. These natural solutions provide environmental and economic benefits.
+def decode_embedding(embeddings: dict, quantizer: Int8Quantizer = None) -> np.ndarray:
+    """
+    Обратное преобразование для encode_embedding: объект embeddings -> float32-вектор.
+    Для per-dim int8 нужен quantizer с масштабами корпуса.
+    """
+    encoding = embeddings.get("encoding", "list")
+    if encoding == "list":
+        return np.asarray(embeddings["data"], dtype=np.float32)
+    if encoding not in EMBEDDING_ENCODINGS:
+        raise ValueError(f"Неизвестная кодировка эмбеддингов: {encoding!r}")
+    if encoding == "i8-base64":
+        q = np.frombuffer(base64.b64decode(embeddings["data"]), dtype=np.int8)
+        if "scale" in embeddings:
+            return Int8Quantizer().dequantize(q, np.float32(embeddings["scale"]))
+        if quantizer is None:
+            raise ValueError("Для per-dim int8 эмбеддингов нужны масштабы корпуса (quantizer)")
+        return quantizer.dequantize(q, quantizer.scales)
+    dtype = "<f4" if encoding == "f32-base64" else "<f2"
+    raw = base64.b64decode(embeddings["data"])
+    return np.frombuffer(raw, dtype=dtype).astype(np.float32)
+
+
+def build_article_item(art: dict, emb, encoding: str = "list",
+                       quantizer: Int8Quantizer = None) -> dict:
+    return {
+        "id": art.get("id", str(uuid.uuid4())),
+        "type": "article",
+        "action": "upsert",
+        "updatedAt": (
+            art["updated_at"].isoformat() + "Z"
+            if isinstance(art["updated_at"], datetime)
+            else art["updated_at"]
+        ),
+        "mainImageUrl": art["main_image_url"],
+        "tags": art["tags"],
+        "attributes": {
+            "title": art["title"],
+            "shortDescription": art["short_description"],
+            "content": art["content"],
+            "embeddings": encode_embedding(emb, encoding, quantizer)
+        }
+    }
 
-## Sustainable Transportation
 
-Electric public transit, bike-sharing programs, and pedestrian-friendly infrastructure reduce emissions and traffic congestion. Cities are prioritizing clean transportation options over private vehicle use.
+def build_delete_item(item_id: str, updated_at: str, content_type: str = "article",
+                      main_image_url: str = "", tags: list = None) -> dict:
+    """Элемент фида с action=delete: attributes = null, см. docs/content_delta_sync_spec.md."""
+    return {
+        "id": item_id,
+        "type": content_type,
+        "action": "delete",
+        "updatedAt": updated_at,
+        "mainImageUrl": main_image_url,
+        "tags": tags or [],
+        "attributes": None
+    }
 
-## Waste Reduction
 
-Circular economy principles guide waste management strategies, emphasizing recycling, composting, and waste-to-energy programs. Zero-waste initiatives aim to eliminate landfill dependency.
+def iter_article_items(articles, cache: EmbeddingCache = None,
+                       max_len: int = 256, stride: int = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       window: int = DEFAULT_WINDOW,
+                       chunking: str = "chars",
+                       stats: dict = None,
+                       encoding: str = "list",
+                       quantizer: Int8Quantizer = None,
+                       pool=None,
+                       pipeline=None):
+    """
+    Генератор готовых элементов фида. Статьи кодируются окнами по window штук
+    (window=None — весь корпус разом), чтобы модель получала полные батчи
+    чанков сразу из многих статей; в памяти одновременно живёт только одно окно.
+    encoding — формат attributes.embeddings.data, см. encode_embedding;
+    quantizer — параметры int8-квантования для encoding="i8-base64";
+    pool — encode_pool.EncodePool для кодирования окон в нескольких процессах;
+    pipeline — pipeline.Pipeline: чтение, чанкинг, кодирование и сборка элементов
+    разных окон идут одновременно в отдельных потоках.
+    """
+    windows = _windows(articles, window)
+    if pipeline is not None:
+        yield from _pipelined_items(pipeline, windows, cache, max_len, stride, batch_size,
+                                    chunking, stats, encoding, quantizer)
+        return
+    if pool is not None:
+        embedded = pool.map_windows(windows, max_len, stride, batch_size, chunking, stats)
+    else:
+        embedded = (
+            (arts, embed_corpus([art["content"] for art in arts], max_len, stride, cache,
+                                batch_size, chunking, stats))
+            for arts in windows
+        )
+    for arts, embeddings in embedded:
+        for art, emb in zip(arts, embeddings):
+            with _stage("build_item", 1) as timer:
+                item = build_article_item(art, emb, encoding, quantizer)
+            if timer is not None:
+                PROFILER.start_article(item["id"], art["title"], timer.wall)
+            yield item
+
+
+def _pipelined_items(pipeline, windows, cache, max_len, stride, batch_size,
+                     chunking, stats, encoding, quantizer):
+    # Быстрые токенизаторы HuggingFace нельзя вызывать из двух потоков сразу,
+    # а model.encode токенизирует сам — поток чанкинга получает свою копию
+    tokenizer = copy.deepcopy(get_model().tokenizer) if chunking == "tokens" else None
+
+    def chunk(arts):
+        return arts, chunk_corpus([art["content"] for art in arts], max_len, stride,
+                                  chunking, stats, tokenizer)
+
+    def encode(job):
+        arts, (all_chunks, counts, text_seconds) = job
+        return arts, embed_chunked(all_chunks, counts, text_seconds, max_len, stride,
+                                   cache, batch_size, chunking)
+
+    def build(job):
+        arts, embeddings = job
+        return [build_article_item(art, emb, encoding, quantizer)
+                for art, emb in zip(arts, embeddings)]
+
+    for items in pipeline.run(windows, [("chunk", chunk), ("encode", encode), ("build", build)]):
+        yield from items
+
+
+def write_items(items, f, fmt: str = "json", indent: int = 2) -> int:
+    """
+    Потоково пишет элементы в файл f по мере их готовности и возвращает их число.
+    fmt="json"   — конверт {"data": [...]}, при indent=2 байт-в-байт совпадает
+                   с json.dumps(output, indent=2);
+    fmt="ndjson" — по одному компактному JSON-объекту на строку.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Неизвестный формат вывода: {fmt!r}, ожидается один из {OUTPUT_FORMATS}")
+    count = 0
+    if fmt == "ndjson":
+        for item in items:
+            with _stage("serialize", 1) as timer:
+                f.write(json.dumps(item, ensure_ascii=False))
+                f.write("\n")
+            if timer is not None:
+                PROFILER.add_article_time(item["id"], timer.wall)
+            count += 1
+        return count
+
+    if indent is None:
+        item_sep, open_data, close_data = ", ", '{"data": [', "]}"
+    else:
+        pad = " " * indent
+        item_sep = ",\n"
+        open_data = "{\n" + pad + '"data": [\n'
+        close_data = "\n" + pad + "]\n}"
+    for item in items:
+        with _stage("serialize", 1) as timer:
+            f.write(open_data if count == 0 else item_sep)
+            text = json.dumps(item, ensure_ascii=False, indent=indent)
+            if indent is not None:
+                text = "\n".join(pad * 2 + line for line in text.split("\n"))
+            f.write(text)
+        if timer is not None:
+            PROFILER.add_article_time(item["id"], timer.wall)
+        count += 1
+    if count == 0:
+        f.write(json.dumps({"data": []}, indent=indent))
+    else:
+        f.write(close_data)
+    return count
+
+
+def generate_article_json(articles, cache: EmbeddingCache = None,
+                          batch_size: int = DEFAULT_BATCH_SIZE,
+                          window: int = DEFAULT_WINDOW,
+                          chunking: str = "chars",
+                          stats: dict = None,
+                          encoding: str = "list"):
+    output = io.StringIO()
+    items = iter_article_items(articles, cache, batch_size=batch_size, window=window,
+                               chunking=chunking, stats=stats, encoding=encoding)
+    write_items(items, output)
+    return output.getvalue()
+
+def _write_output(items, args) -> int:
+    """
+    Пишет элементы в --output и, если задан --pages, раскладывает их по страницам /updates;
+    с --room-db — ещё и в готовую SQLite-базу Room (room_export.RoomDbWriter),
+    с --columnar — в Parquet и матрицу эмбеддингов .npy (columnar.ColumnarWriter).
+    С --artifacts выход по ходу записи сжимается в gzip/zstd-варианты с ETag (artifacts.ArtifactWriter).
+    С --dedup почти-дубликаты сначала помечаются или убираются (dedup.with_dedup),
+    с --reduce эмбеддинги проецируются в меньшую размерность (reduction.with_reduction),
+    с --related элементы дополняются таблицей похожих статей (related.with_related),
+    с --ivf — номерами кластеров IVF-разбиения (ivf.with_clusters).
+    С --int8-scales per-dim эмбеддинги для --pages и --output квантуются с
+    масштабами корпуса (quantization.with_per_dim_quantization).
+    """
+    dedup_report = None
+    if args.dedup:
+        from dedup import with_dedup
+
+        dedup_report = {}
+        items = with_dedup(items, args.dedup, dedup_report, args.dedup_exhaustive,
+                           cosine=args.dedup_cosine, jaccard=args.dedup_jaccard)
+    reduction_report = None
+    if args.reduce:
+        from reduction import Reducer, load_reducer, with_reduction
+
+        if args.reduce == "truncate":
+            print(f"Внимание: --reduce truncate сохраняет соседей только у моделей с "
+                  f"Matryoshka-обучением; для {MODEL_NAME} проверьте recall ниже или возьмите pca")
+        reducer = load_reducer(args.reduce_input) if args.reduce_input else Reducer(args.reduce, args.reduce_dim)
+        # До --related и --ivf: соседи и центроиды должны быть в пространстве устройства
+        reduction_report = {}
+        items = with_reduction(items, reducer, args.reduce_output, reduction_report, seed=args.seed)
+    if args.related:
+        from related import with_related
+
+        items = with_related(items, args.related, args.cold)
+    ivf_report = None
+    if args.ivf:
+        from ivf import with_clusters
+
+        ivf_report = {}
+        items = with_clusters(items, args.ivf, args.ivf_clusters, args.seed, ivf_report)
+    room_db = None
+    if args.room_db:
+        from room_export import RoomDbWriter, tee_room_db
+
+        room_db = RoomDbWriter(args.room_db)
+        items = tee_room_db(items, room_db)
+    columnar = None
+    if args.columnar:
+        from columnar import ColumnarWriter, tee_columnar
+
+        columnar = ColumnarWriter(args.columnar)
+        items = tee_columnar(items, columnar)
+    if args.int8_scales == "per-dim":
+        from quantization import with_per_dim_quantization
+
+        # После тройников Room и Parquet: они получают точные float32-векторы,
+        # а в --pages и --output уходит int8 с общими масштабами корпуса
+        items = with_per_dim_quantization(items, args.int8_scales_output)
+    pager = None
+    if args.pages:
+        from pagination import PageWriter, tee_pages
+
+        pager = PageWriter(args.pages, args.page_size)
+        items = tee_pages(items, pager)
+    if args.artifacts:
+        from artifacts import ArtifactWriter, parse_codecs
+
+        output = ArtifactWriter(args.output, args.artifacts, parse_codecs(args.compress), keep=args.artifacts_keep)
+    else:
+        output = open(args.output, "w", encoding="utf-8")
+    with output as f:
+        count = write_items(items, f, args.format, None if args.indent < 0 else args.indent)
+    if args.artifacts:
+        from artifacts import format_entry
+
+        print(f"Артефакты -> {args.artifacts}: " + format_entry(os.path.basename(args.output), output.entry))
+    if dedup_report:
+        from dedup import format_report
+
+        print(format_report(dedup_report))
+    if reduction_report:
+        from reduction import format_report
+
+        print(format_report([reduction_report]))
+    if ivf_report:
+        from ivf import format_report
+
+        print(format_report(**ivf_report))
+    if pager is not None:
+        index = pager.finish()
+        print(f"Страниц /updates: {len(index['pages'])} (limit {args.page_size}) -> {args.pages}")
+    if room_db is not None:
+        db = room_db.finish()
+        print(f"База Room: {db['content']} элементов, {db['articles']} статей, "
+              f"{db['bytes'] / 1024 / 1024:.1f} МиБ, lastSyncAt {db['lastSyncAt']} -> {args.room_db}")
+    if columnar is not None:
+        store = columnar.finish()
+        print(f"Колоночное хранилище: {store['items']} элементов, матрица "
+              f"{store['vectors']}×{store['dim']} float32 -> {args.columnar}")
+    return count
+
+
+def main(argv=None):
+    global MODEL_NAME, ENCODER_BACKEND, PROFILER
+
+    parser = argparse.ArgumentParser(description="Генерация articles.json с эмбеддингами статей")
+    parser.add_argument("--input", "-i",
+                        help="входной корпус: .jsonl, .csv или каталог Markdown-файлов "
+                             "(по умолчанию — встроенные sample_articles)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS,
+                        help="формат входа, если его нельзя определить по расширению")
+    parser.add_argument("--output", "-o", default="articles.json", help="путь выходного файла")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="json",
+                        help="json — конверт {\"data\": [...]}, ndjson — по элементу на строку")
+    parser.add_argument("--indent", type=int, default=2,
+                        help="отступ JSON для --format json (-1 — компактный вывод)")
+    parser.add_argument("--encoding", choices=EMBEDDING_ENCODINGS, default="list",
+                        help="формат attributes.embeddings.data")
+    parser.add_argument("--int8-scales", choices=QUANTIZATION_MODES, default="per-vector",
+                        help="масштабы для --encoding i8-base64: на вектор (поле scale) или на "
+                             "измерение, откалиброванные по корпусу (нужен --int8-scales-output)")
+    parser.add_argument("--int8-scales-output", metavar="FILE",
+                        help="куда записать per-dim масштабы int8 (Int8Quantizer.to_json) для клиента")
+    parser.add_argument("--model", default=MODEL_NAME, help="модель sentence-transformers")
+    parser.add_argument("--backend", choices=ENCODER_BACKENDS, default="torch",
+                        help="бэкенд кодирования: PyTorch, ONNX Runtime или ONNX с int8-весами")
+    parser.add_argument("--chunking", choices=CHUNKING_MODES, default="chars",
+                        help="нарезка на чанки по символам (по умолчанию, как у ассета articles.json) "
+                             "или по токенам модели")
+    parser.add_argument("--max-len", type=int, default=256,
+                        help="размер чанка в символах или токенах (см. --chunking)")
+    parser.add_argument("--stride", type=int, default=None,
+                        help="перекрытие соседних чанков (по умолчанию зависит от --chunking)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="размер батча model.encode")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help="статей в одном окне кодирования (единица работы воркера)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="число процессов-кодировщиков (1 — кодировать в текущем процессе)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="чтение, чанкинг, кодирование и запись разных окон — одновременно "
+                             "в отдельных потоках с ограниченными очередями")
+    parser.add_argument("--pipeline-queue", type=int, default=2,
+                        help="длина очереди между стадиями --pipeline, в окнах")
+    parser.add_argument("--threads-per-worker", type=int, default=None,
+                        help="потоков torch на воркер (по умолчанию ядра / воркеры)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="путь к кэшу эмбеддингов")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // 1024 // 1024,
+                        help="предельный размер кэша эмбеддингов, MiB")
+    parser.add_argument("--no-cache", action="store_true", help="не использовать кэш эмбеддингов")
+    parser.add_argument("--pages", metavar="DIR",
+                        help="дополнительно разложить элементы по страницам /updates, "
+                             "отсортированным по updatedAt, с индексом курсоров")
+    parser.add_argument("--page-size", type=int, default=100, help="limit одной страницы для --pages")
+    parser.add_argument("--room-db", metavar="DB",
+                        help="дополнительно записать готовую SQLite-базу Room для createFromAsset")
+    parser.add_argument("--artifacts", metavar="DIR",
+                        help="дополнительно записать в DIR предсжатые варианты выхода с хешем "
+                             "содержимого в имени и manifest.json с ETag для раздачи статикой")
+    parser.add_argument("--compress", default="gzip,zstd",
+                        help="кодеки для --artifacts через запятую, с необязательным уровнем: "
+                             "gzip:9,zstd:19 (zstd требует zstandard)")
+    parser.add_argument("--artifacts-keep", type=int, default=1, metavar="N",
+                        help="сколько предыдущих версий артефакта оставить в --artifacts "
+                             "для клиентов и CDN со старым ETag (0 — удалять сразу)")
+    parser.add_argument("--columnar", metavar="DIR",
+                        help="дополнительно записать метаданные и текст в DIR/items.parquet, "
+                             "а эмбеддинги — одной float32-матрицей DIR/embeddings.npy (нужен pyarrow)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES,
+                        help="найти почти-дубликаты (MinHash по тексту + LSH по эмбеддингам): "
+                             "tag — добавить attributes.canonicalId, drop — убрать их из выхода")
+    parser.add_argument("--dedup-cosine", type=float, default=DEFAULT_COSINE,
+                        help="порог косинуса эмбеддингов для --dedup")
+    parser.add_argument("--dedup-jaccard", type=float, default=DEFAULT_JACCARD,
+                        help="порог сходства Жаккара по шинглам текста для --dedup")
+    parser.add_argument("--dedup-exhaustive", action="store_true",
+                        help="сравнить время и найденные пары --dedup с полным попарным перебором")
+    parser.add_argument("--reduce", choices=REDUCTION_METHODS,
+                        help="понизить размерность эмбеддингов: pca — главные компоненты корпуса, "
+                             "truncate — первые координаты (только для Matryoshka-моделей)")
+    parser.add_argument("--reduce-dim", type=int, default=None,
+                        help=f"целевая размерность для --reduce (64, {DEFAULT_DIM}, 192, ...; "
+                             f"по умолчанию {DEFAULT_DIM})")
+    parser.add_argument("--reduce-output", metavar="FILE",
+                        help="записать проекцию --reduce (components) в JSON для кодирования запросов")
+    parser.add_argument("--reduce-input", metavar="FILE",
+                        help="взять готовую проекцию (--reduce-output прошлого запуска) вместо "
+                             "обучения PCA; обязательно для --reduce pca с --manifest")
+    parser.add_argument("--related", type=int, default=0, metavar="K",
+                        help="добавить в attributes.related K ближайших статей "
+                             "(точный top-K блочным умножением матриц; 0 — не считать)")
+    parser.add_argument("--cold", type=int, default=4, metavar="K",
+                        help="число «холодных» кандидатов в attributes.cold для --related")
+    parser.add_argument("--ivf", metavar="INDEX",
+                        help="обучить IVF-разбиение (k-means), записать центроиды и списки "
+                             "кластеров в INDEX и добавить attributes.clusterId")
+    parser.add_argument("--ivf-clusters", type=int, default=None,
+                        help="число кластеров для --ivf (по умолчанию ~√N)")
+    incremental = parser.add_argument_group("инкрементальный режим")
+    incremental.add_argument("--manifest",
+                             help="манифест прошлых запусков: в выход попадут только новые и "
+                                  "изменённые статьи и удаления пропавших")
+    incremental.add_argument("--bootstrap-from", metavar="FEED",
+                             help="если манифеста ещё нет — построить его из ранее "
+                                  "сгенерированного articles.json")
+    synthetic = parser.add_argument_group("синтетический корпус (без модели)")
+    synthetic.add_argument("--synthetic", type=int, metavar="N",
+                           help="сгенерировать N синтетических элементов фида вместо кодирования --input")
+    synthetic.add_argument("--seed", type=int, default=0, help="seed синтетического корпуса")
+    synthetic.add_argument("--update-ratio", type=float, default=0.1,
+                           help="доля upsert'ов уже выданных статей")
+    synthetic.add_argument("--delete-ratio", type=float, default=0.02, help="доля удалений")
+    profiling = parser.add_argument_group("профилирование")
+    profiling.add_argument("--profile", metavar="REPORT",
+                           help="замерить стадии конвейера и записать JSON-отчёт: итоги по стадиям, "
+                                "счётчики, перцентили латентности и самые медленные статьи")
+    profiling.add_argument("--profile-no-tracemalloc", action="store_true",
+                           help="не замерять пиковую память стадий (tracemalloc замедляет аллокации)")
+    profiling.add_argument("--profile-collapsed", metavar="FILE",
+                           help="время стадий в collapsed-формате для flamegraph.pl / speedscope")
+    profiling.add_argument("--cprofile", metavar="FILE",
+                           help="записать статистику cProfile (pstats, snakeviz)")
+    args = parser.parse_args(argv)
+    if args.int8_scales == "per-dim" and (args.encoding != "i8-base64" or not args.int8_scales_output):
+        parser.error("--int8-scales per-dim требует --encoding i8-base64 и --int8-scales-output")
+    if args.reduce_input:
+        from reduction import load_reducer
+
+        reducer = load_reducer(args.reduce_input)
+        if args.reduce and args.reduce != reducer.method or args.reduce_dim not in (None, reducer.dim):
+            parser.error(f"--reduce-input содержит проекцию {reducer.method}{reducer.dim}, "
+                         f"а запрошена {args.reduce or reducer.method}{args.reduce_dim or reducer.dim}")
+        args.reduce, args.reduce_dim = reducer.method, reducer.dim
+    if args.reduce_dim is None:
+        args.reduce_dim = DEFAULT_DIM
+    if args.manifest and args.reduce == "pca" and not args.reduce_input:
+        parser.error("--reduce pca с --manifest обучил бы базис на одной дельте, и новые векторы "
+                     "оказались бы в другом пространстве, чем уже выданные: передайте "
+                     "--reduce-input с проекцией первого запуска (--reduce-output)")
+    if args.manifest and args.int8_scales == "per-dim":
+        parser.error("--int8-scales per-dim с --manifest перекалибровал бы масштабы по одной дельте, "
+                     "и уже выданные векторы декодировались бы неверно: пересоберите фид целиком")
+    if args.manifest and args.dedup:
+        parser.error("--dedup с --manifest видит только дельту и пропускает дубликаты между запусками, "
+                     "а с drop манифест записал бы убранные статьи как выданные: пересоберите фид целиком")
+    if args.manifest and args.related:
+        parser.error("--related с --manifest искал бы соседей только среди статей дельты, а у "
+                     "неизменившихся статей остались бы устаревшие списки: пересоберите фид целиком")
+    if args.manifest and args.ivf:
+        parser.error("--ivf с --manifest обучил бы центроиды на одной дельте, и clusterId новых "
+                     "статей не совпали бы с уже выданными: пересоберите фид целиком")
+    if args.window < 1:
+        parser.error("--window должен быть не меньше 1")
+    if args.artifacts_keep < 0:
+        parser.error("--artifacts-keep не может быть отрицательным")
+    if args.page_size < 1:
+        parser.error("--page-size должен быть не меньше 1")
+    if args.pipeline_queue < 1:
+        parser.error("--pipeline-queue должен быть не меньше 1: очередь 0 в queue.Queue не ограничена")
+    if args.pipeline and args.workers > 1:
+        parser.error("--pipeline и --workers не совмещаются: воркеры уже кодируют окна параллельно")
+    if args.pipeline and (args.profile or args.profile_collapsed):
+        parser.error("--profile замеряет стадии в одном потоке и не совмещается с --pipeline")
+
+    MODEL_NAME = args.model
+    ENCODER_BACKEND = args.backend
+    with contextlib.ExitStack() as stack:
+        if args.profile or args.profile_collapsed:
+            from profiling import Profiler
+
+            PROFILER = Profiler(trace_memory=not args.profile_no_tracemalloc)
+            stack.callback(_finish_profile, args)
+        if args.cprofile:
+            import cProfile
+
+            profile = cProfile.Profile()
+            stack.callback(profile.dump_stats, args.cprofile)
+            stack.callback(profile.disable)
+            profile.enable()
+        _run(args)
+
+
+def _finish_profile(args) -> None:
+    global PROFILER
+
+    if args.profile:
+        PROFILER.write_report(args.profile)
+        print(PROFILER.summary())
+        print(f"Профиль -> {args.profile}")
+    if args.profile_collapsed:
+        PROFILER.write_collapsed(args.profile_collapsed)
+    PROFILER = None
+
+
+def _item_encoding(args) -> str:
+    """
+    Кодировка эмбеддингов на входе цепочки _write_output. Для per-dim int8
+    векторы идут без потерь до with_per_dim_quantization, которая калибрует масштабы.
+    """
+    return "f32-base64" if args.int8_scales == "per-dim" else args.encoding
+
+
+def _embedding_settings(args) -> dict:
+    """Параметры запуска, от которых зависят эмбеддинги в выходе (манифест --manifest)."""
+    return {
+        "model": MODEL_NAME,
+        "encoding": args.encoding,
+        "int8Scales": args.int8_scales if args.encoding == "i8-base64" else None,
+        "chunking": args.chunking,
+        "maxLen": args.max_len,
+        "stride": _resolve_stride(args.max_len, args.stride, args.chunking),
+        "reduce": f"{args.reduce}{args.reduce_dim}" if args.reduce else None,
+    }
 
-## Energy Efficiency
 
-Smart building technologies, LED lighting, and renewable energy systems reduce urban energy consumption. District energy systems improve efficiency by sharing heating and cooling resources.
+def _run(args) -> None:
+    if args.synthetic:
+        from synthetic_corpus import iter_synthetic_items
+
+        started = time.perf_counter()
+        items = iter_synthetic_items(args.synthetic, args.seed, update_ratio=args.update_ratio,
+                                     delete_ratio=args.delete_ratio, encoding=_item_encoding(args))
+        count = _write_output(items, args)
+        elapsed = time.perf_counter() - started
+        print(f"Синтетических элементов: {count} за {elapsed:.2f} с "
+              f"({count / elapsed:.1f} элементов/с) -> {args.output}")
+        return
+
+    if args.input:
+        articles = iter_articles(args.input, args.input_format)
+    else:
+        from sample_articles import SAMPLE_ARTICLES
+
+        articles = SAMPLE_ARTICLES
+    tracker = None
+    if args.manifest:
+        from delta import DeltaTracker
+
+        tracker = DeltaTracker.load(args.manifest, MODEL_NAME, args.bootstrap_from, _embedding_settings(args))
+        articles = tracker.filter(articles)
+
+    stats = {}
+    with contextlib.ExitStack() as stack:
+        cache = None
+        if not args.no_cache:
+            cache = stack.enter_context(EmbeddingCache(args.cache, args.cache_max_mb * 1024 * 1024))
+        pool = None
+        if args.workers > 1:
+            from encode_pool import EncodePool
+
+            if ENCODER_BACKEND != "torch":
+                # ONNX-модель экспортируется один раз здесь, а не наперегонки в каждом воркере
+                get_model()
+            pool = stack.enter_context(
+                EncodePool(args.workers, args.threads_per_worker, cache, model_name=MODEL_NAME,
+                           backend=ENCODER_BACKEND)
+            )
+        elif PROFILER is not None:
+            # Загрузка модели — отдельная стадия, а не часть чанкинга первой статьи
+            get_model()
+        pipeline = None
+        if args.pipeline:
+            from pipeline import Pipeline
+
+            pipeline = Pipeline(args.pipeline_queue)
+            stack.callback(pipeline.close)
+        started = time.perf_counter()
+        items = iter_article_items(articles, cache, args.max_len, args.stride,
+                                   args.batch_size, args.window, args.chunking, stats,
+                                   _item_encoding(args), pool=pool, pipeline=pipeline)
+        if tracker is not None:
+            items = itertools.chain(items, tracker.iter_deletes())
+        count = _write_output(items, args)
+        elapsed = time.perf_counter() - started
+        if tracker is not None:
+            tracker.save()
+            print(tracker.report())
+
+        if pool is not None:
+            print(pool.report())
+        if pipeline is not None:
+            print(pipeline.report())
+        if cache is not None:
+            print(cache.report())
+    if "char_chunks" in stats:
+        print(f"Чанков: {stats['chunks']} (посимвольная нарезка дала бы {stats['char_chunks']})")
+    else:
+        print(f"Чанков: {stats.get('chunks', 0)}")
+    print(f"Статей: {count} за {elapsed:.2f} с ({count / elapsed:.1f} статей/с) -> {args.output}")
 
-## Community Engagement
 
-Successful sustainability initiatives require citizen participation through education, incentive programs, and collaborative planning processes that ensure community buy-in and long-term success.""",
-        "main_image_url": "https://picsum.photos/200",
-        "tags": ["environment", "technology"],
-        "updated_at": datetime(2024, 5, 13, 13, 10)
-    }
-	]
-    # print(generate_article_json(sample_articles))
-    with open('articles.json', 'w', encoding='utf-8') as f:
-        result = generate_article_json(sample_articles)
-        f.write(result)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Грубое IVF-разбиение корпуса (сферический k-means) для отбора кандидатов на устройстве.
+
+EmbeddingIndex в приложении — плоский список, который RecommenderImpl
+просматривает целиком. IVF делит единичные эмбеддинги на n_clusters кластеров:
+запрос сравнивается с центроидами, и точный поиск идёт только по статьям
+n_probe ближайших кластеров. Экспортируются центроиды, списки статей каждого
+кластера, а в каждый элемент фида — attributes.clusterId.
+
+Качество оценивается на самом корпусе: recall@K относительно полного перебора
+и доля просмотренных векторов (центроиды + кандидаты) для разных n_probe.
+
+Запуск: python ivf.py articles.json [--clusters 64] [--k 10] [--n-probe 1,2,4,8]
+                      [--output ivf.json]
+"""
+import argparse
+import json
+
+import numpy as np
+
+from related import _unit
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_N_PROBE = (1, 2, 4, 8)
+# Центроиды обучаются на подвыборке: на качество разбиения это почти не влияет
+DEFAULT_MAX_TRAIN = 100_000
+
+
+def default_clusters(n: int) -> int:
+    """Эвристика числа кластеров: ~√N, но не больше N."""
+    return max(1, min(n, int(round(np.sqrt(n)))))
+
+
+class IvfIndex:
+    """
+    Центроиды кластеров (единичные векторы). Статья относится к кластеру
+    с наибольшим косинусом между её эмбеддингом и центроидом.
+
+        index = IvfIndex.train(matrix, n_clusters=64)
+        labels = index.assign(matrix)
+        candidates = index.probe(query, n_probe=4)   # номера ближайших кластеров
+    """
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = _unit(centroids)
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def train(cls, matrix: np.ndarray, n_clusters: int = None,
+              iterations: int = DEFAULT_ITERATIONS, seed: int = 0,
+              max_train: int = DEFAULT_MAX_TRAIN) -> "IvfIndex":
+        """Сферический k-means (Ллойд по косинусу) на подвыборке из max_train векторов."""
+        unit = _unit(matrix)
+        if not len(unit):
+            raise ValueError("Нечего кластеризовать: матрица эмбеддингов пуста")
+        rng = np.random.default_rng(seed)
+        if len(unit) > max_train:
+            unit = unit[np.sort(rng.choice(len(unit), max_train, replace=False))]
+        n_clusters = min(n_clusters or default_clusters(len(unit)), len(unit))
+        index = cls(unit[rng.choice(len(unit), n_clusters, replace=False)])
+        labels = None
+        for _ in range(iterations):
+            new_labels, sims = index._assign(unit)
+            if labels is not None and np.array_equal(labels, new_labels):
+                break
+            labels = new_labels
+            counts = np.bincount(labels, minlength=n_clusters)
+            order = np.argsort(labels, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            nonempty = counts > 0
+            sums = np.zeros_like(index.centroids)
+            sums[nonempty] = np.add.reduceat(unit[order], starts[nonempty], axis=0)
+            # Пустые кластеры получают хуже всего описанные текущими центроидами векторы
+            empty = np.flatnonzero(~nonempty)
+            if len(empty):
+                sums[empty] = unit[np.argsort(sims)[:len(empty)]]
+            index.centroids = _unit(sums)
+        return index
+
+    def _assign(self, unit: np.ndarray, block_size: int = 4096) -> tuple:
+        labels = np.empty(len(unit), dtype=np.int64)
+        sims = np.empty(len(unit), dtype=np.float32)
+        for start in range(0, len(unit), block_size):
+            scores = unit[start:start + block_size] @ self.centroids.T
+            labels[start:start + block_size] = scores.argmax(axis=1)
+            sims[start:start + block_size] = scores.max(axis=1)
+        return labels, sims
+
+    def assign(self, matrix: np.ndarray) -> np.ndarray:
+        """Номер кластера для каждой строки matrix."""
+        return self._assign(_unit(matrix))[0]
+
+    def probe(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        """n_probe кластеров, ближайших к query, по убыванию косинуса."""
+        scores = self.centroids @ _unit(np.atleast_2d(query))[0]
+        n_probe = min(n_probe, self.n_clusters)
+        top = np.argpartition(-scores, n_probe - 1)[:n_probe]
+        return top[np.argsort(-scores[top])]
+
+    def to_json(self, ids: list = None, labels: np.ndarray = None) -> dict:
+        """Центроиды и (если переданы ids и labels) списки id статей каждого кластера."""
+        result = {
+            "metric": "cosine",
+            "dim": int(self.centroids.shape[1]),
+            "nClusters": self.n_clusters,
+            "centroids": np.round(self.centroids, 6).tolist(),
+        }
+        if ids is not None:
+            clusters = [[] for _ in range(self.n_clusters)]
+            for item_id, label in zip(ids, labels):
+                clusters[label].append(item_id)
+            result["clusters"] = clusters
+        return result
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "IvfIndex":
+        return cls(np.asarray(obj["centroids"], dtype=np.float32))
+
+
+def evaluate_ivf(matrix: np.ndarray, index: IvfIndex, k: int = 10,
+                 n_probes=DEFAULT_N_PROBE, queries: int = 1000, seed: int = 0) -> list:
+    """
+    recall@K поиска по n_probe кластерам относительно полного перебора
+    (запросы — случайные статьи корпуса, сама статья исключается) и доля
+    просмотренных векторов: центроиды + статьи выбранных кластеров.
+    """
+    unit = _unit(matrix)
+    n = len(unit)
+    k = min(k, n - 1)
+    if k < 1:
+        return []
+    labels = index.assign(unit)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=index.n_clusters))))
+    members = [order[bounds[c]:bounds[c + 1]] for c in range(index.n_clusters)]
+
+    rng = np.random.default_rng(seed)
+    query_idx = rng.choice(n, min(queries, n), replace=False)
+    exact = []
+    for start in range(0, len(query_idx), 256):
+        block = query_idx[start:start + 256]
+        sims = unit[block] @ unit.T
+        sims[np.arange(len(block)), block] = -np.inf
+        exact.extend(np.argpartition(-sims, k - 1, axis=1)[:, :k])
+
+    reports = []
+    for n_probe in n_probes:
+        hits = 0
+        scanned = 0
+        for q, true_idx in zip(query_idx, exact):
+            candidates = np.concatenate([members[c] for c in index.probe(unit[q], n_probe)])
+            candidates = candidates[candidates != q]
+            scanned += len(candidates) + index.n_clusters
+            if len(candidates) > k:
+                sims = unit[candidates] @ unit[q]
+                candidates = candidates[np.argpartition(-sims, k - 1)[:k]]
+            hits += np.isin(true_idx, candidates).sum()
+        scan_fraction = scanned / (len(query_idx) * (n - 1))
+        reports.append({
+            "n_probe": int(min(n_probe, index.n_clusters)),
+            "k": k,
+            "recall": hits / (len(query_idx) * k),
+            "scan_fraction": scan_fraction,
+            "scan_reduction": 1 / scan_fraction if scan_fraction else float("inf"),
+            "queries": len(query_idx),
+        })
+    return reports
+
+
+def format_report(index: IvfIndex, labels: np.ndarray, reports: list) -> str:
+    sizes = np.bincount(labels, minlength=index.n_clusters)
+    lines = [
+        f"{index.n_clusters} кластеров на {len(labels)} статей: размер min {sizes.min()}, "
+        f"медиана {int(np.median(sizes))}, max {sizes.max()}"
+    ]
+    for r in reports:
+        lines.append(
+            f"  n_probe={r['n_probe']:<3} recall@{r['k']} = {r['recall']:.4f}, "
+            f"просмотрено {r['scan_fraction']:.1%} корпуса ({r['scan_reduction']:.1f}× меньше перебора)"
+        )
+    return "\n".join(lines)
+
+
+def with_clusters(items, path: str, n_clusters: int = None, seed: int = 0, report: dict = None):
+    """
+    Пропускает элементы фида, дописывая в attributes upsert'ов clusterId,
+    и записывает в path центроиды и списки статей кластеров.
+    Обучение идёт на последних неудалённых версиях статей. В report (если передан)
+    попадают аргументы format_report: индекс, метки и evaluate_ivf по тем же статьям.
+    """
+    from related import spool_items
+
+    spool, ids, live, matrix = spool_items(items)
+    labels = np.empty(0, dtype=np.int64)
+    if ids:
+        live_rows = np.flatnonzero(live)
+        # Если к концу потока удалено всё, обучаемся на всех версиях
+        if not len(live_rows):
+            live_rows = np.arange(len(ids))
+        index = IvfIndex.train(matrix[live_rows], n_clusters, seed=seed)
+        labels = index.assign(matrix)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(index.to_json([ids[i] for i in live_rows], labels[live_rows]), f)
+        if report is not None:
+            report.update({
+                "index": index,
+                "labels": labels[live_rows],
+                "reports": evaluate_ivf(matrix[live_rows], index, seed=seed),
+            })
+    del matrix
+
+    row = 0
+    for line in spool:
+        item = json.loads(line)
+        if item["action"] == "upsert":
+            item["attributes"]["clusterId"] = int(labels[row])
+            row += 1
+        yield item
+    spool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IVF-разбиение эмбеддингов корпуса и оценка recall")
+    parser.add_argument("input", help="articles.json, сгенерированный generate_test_data.py")
+    parser.add_argument("--clusters", type=int, default=None, help="число кластеров (по умолчанию ~√N)")
+    parser.add_argument("--k", type=int, default=10, help="число соседей для recall@K")
+    parser.add_argument("--n-probe", default=",".join(map(str, DEFAULT_N_PROBE)),
+                        help="через запятую: сколько ближайших кластеров просматривать")
+    parser.add_argument("--queries", type=int, default=1000, help="число запросов для оценки")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="записать центроиды и списки кластеров в JSON")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    args = parser.parse_args()
+
+    from generate_test_data import decode_embedding
+
+    with open(args.input, encoding="utf-8") as f:
+        upserts = [item for item in json.load(f)["data"]
+                   if item.get("action") == "upsert" and item.get("attributes")]
+    matrix = np.stack([decode_embedding(item["attributes"]["embeddings"]) for item in upserts])
+    index = IvfIndex.train(matrix, args.clusters, seed=args.seed)
+    labels = index.assign(matrix)
+    reports = evaluate_ivf(matrix, index, args.k, [int(p) for p in args.n_probe.split(",")],
+                           args.queries, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(index.to_json([item["id"] for item in upserts], labels), f)
+    print(json.dumps(reports, indent=2) if args.json else format_report(index, labels, reports))
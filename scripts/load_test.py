@@ -0,0 +1,390 @@
+"""
+Нагрузочный тест протокола дельта-синхронизации на asyncio.
+
+Каждый виртуальный клиент делает то же, что приложение при синхронизации:
+идёт по цепочке курсоров /updates?since=&limit= (meta.nextSince, пока
+meta.hasMore) и для upsert-элементов страницы запрашивает /content/{type}/{id}.
+Клиенты работают одновременно и делят пул keep-alive соединений HTTP/1.1
+(не больше --connections), поэтому замеряется сервер, а не установка TCP.
+Клиент HTTP написан на asyncio.open_connection и не требует сторонних пакетов.
+
+Отчёт по каждому эндпоинту: число запросов и ошибок, пропускная способность
+(запросов/с и МиБ/с), латентность p50/p95/p99/max и размеры ответов. Для /updates
+латентность отдельно считается по первой и последней странице цепочки: если
+сервер фильтрует весь список на каждый запрос (pagedSince в mock-server),
+это видно по росту латентности вместе с размером фикстуры.
+
+Подходит любой локальный сервер с этим протоколом: mock-server (Ktor)
+или feed_server.py со страницами generate_test_data.py --pages.
+
+Запуск: python load_test.py http://localhost:8080 [--clients 50] [--syncs 2] [--limit 100]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+DEFAULT_SINCE = "1970-01-01T00:00:00Z"
+DEFAULT_CLIENTS = 20
+DEFAULT_CONNECTIONS = 20
+DEFAULT_TIMEOUT = 30.0
+
+
+class HttpError(Exception):
+    """Ответ, который нельзя разобрать, или обрыв соединения посреди ответа."""
+
+
+class Response:
+    def __init__(self, status: int, headers: dict, body: bytes):
+        self.status = status
+        self.headers = headers
+        # Байты тела как они пришли по сети (сжатые, если сервер сжал)
+        self.wire_bytes = len(body)
+        if headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+
+    def close(self) -> None:
+        self.writer.close()
+
+    async def request(self, host: str, path: str, accept_encoding: str) -> tuple:
+        """Один GET; возвращает (Response, можно ли переиспользовать соединение)."""
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+            f"Accept-Encoding: {accept_encoding}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("сервер закрыл соединение")
+        try:
+            version, status = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HttpError(f"некорректная строка статуса: {status_line!r}") from None
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Трейлеры (обычно их нет) до пустой строки
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b"".join(parts)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+        self.requests += 1
+        return Response(status, headers, body), keep_alive
+
+
+class ConnectionPool:
+    """
+    Пул keep-alive соединений к одному серверу: не больше size одновременно,
+    свободные соединения переиспользуются. Если переиспользованное соединение
+    сервер уже закрыл, запрос один раз повторяется на новом.
+    """
+
+    def __init__(self, base_url: str, size: int = DEFAULT_CONNECTIONS,
+                 accept_encoding: str = "identity", timeout: float = DEFAULT_TIMEOUT):
+        url = urlsplit(base_url)
+        if url.scheme != "http":
+            raise ValueError(f"Поддерживается только http://, получено {base_url!r}")
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.host_header = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.accept_encoding = accept_encoding
+        self.timeout = timeout
+        self.connects = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _open(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.connects += 1
+        return _Connection(reader, writer)
+
+    async def get(self, path: str) -> Response:
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            reused = connection is not None
+            while True:
+                if connection is None:
+                    connection = await self._open()
+                try:
+                    response, keep_alive = await asyncio.wait_for(
+                        connection.request(self.host_header, self.prefix + path, self.accept_encoding),
+                        self.timeout,
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError) as error:
+                    connection.close()
+                    connection = None
+                    # Сервер мог закрыть простаивавшее соединение — пробуем новое
+                    if reused:
+                        reused = False
+                        continue
+                    raise HttpError(str(error) or type(error).__name__) from error
+                except BaseException:
+                    connection.close()
+                    raise
+                if keep_alive:
+                    self._idle.append(connection)
+                else:
+                    connection.close()
+                return response
+
+    def close(self) -> None:
+        for connection in self._idle:
+            connection.close()
+        self._idle = []
+
+
+class LoadStats:
+    """Латентности, размеры и ошибки по эндпоинтам и итоги синхронизаций."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.wire_bytes = defaultdict(list)
+        self.body_bytes = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = defaultdict(Counter)
+        self.first_page = []
+        self.last_page = []
+        self.syncs = []
+
+    def record(self, endpoint: str, seconds: float, response: Response = None, error: str = None) -> None:
+        if error is not None:
+            self.errors[endpoint][error] += 1
+            return
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][response.status] += 1
+        self.wire_bytes[endpoint].append(response.wire_bytes)
+        self.body_bytes[endpoint].append(len(response.body))
+
+
+async def _timed_get(pool: ConnectionPool, stats: LoadStats, endpoint: str, path: str):
+    """(ответ или None при ошибке, секунды)."""
+    started = time.perf_counter()
+    try:
+        response = await pool.get(path)
+    except (HttpError, OSError, asyncio.TimeoutError) as error:
+        seconds = time.perf_counter() - started
+        stats.record(endpoint, seconds, error=type(error).__name__ if not str(error) else str(error))
+        return None, seconds
+    seconds = time.perf_counter() - started
+    stats.record(endpoint, seconds, response)
+    return response, seconds
+
+
+async def sync_once(pool: ConnectionPool, stats: LoadStats, since: str = DEFAULT_SINCE,
+                    limit: int = 100, content_ratio: float = 1.0, rng: random.Random = None) -> dict:
+    """
+    Одна полная синхронизация: цепочка /updates от since до hasMore == false
+    и /content для доли content_ratio upsert-элементов. Возвращает её итог.
+    """
+    rng = rng or random.Random()
+    started = time.perf_counter()
+    pages = items = contents = 0
+    page_seconds = []
+    error = None
+    while True:
+        response, seconds = await _timed_get(
+            pool, stats, "updates", f"/updates?since={quote(since, safe='')}&limit={limit}"
+        )
+        if response is None or response.status != 200:
+            error = "updates" if response is None else f"updates HTTP {response.status}"
+            break
+        page_seconds.append(seconds)
+        page = response.json()
+        pages += 1
+        items += len(page["data"])
+        for item in page["data"]:
+            if item["action"] != "upsert" or rng.random() >= content_ratio:
+                continue
+            path = f"/content/{quote(item['type'], safe='')}/{quote(item['id'], safe='')}"
+            await _timed_get(pool, stats, "content", path)
+            contents += 1
+        meta = page["meta"]
+        if not meta["hasMore"]:
+            break
+        if meta["nextSince"] <= since:
+            # Курсор не продвинулся: клиент зациклился бы на одной странице
+            error = "курсор nextSince не продвигается"
+            break
+        since = meta["nextSince"]
+    if page_seconds:
+        stats.first_page.append(page_seconds[0])
+        stats.last_page.append(page_seconds[-1])
+    result = {"seconds": time.perf_counter() - started, "pages": pages, "items": items,
+              "contents": contents, "error": error}
+    stats.syncs.append(result)
+    return result
+
+
+async def run_load(base_url: str, clients: int = DEFAULT_CLIENTS, syncs: int = 1,
+                   connections: int = DEFAULT_CONNECTIONS, limit: int = 100, since: str = DEFAULT_SINCE,
+                   content_ratio: float = 1.0, accept_encoding: str = "identity",
+                   timeout: float = DEFAULT_TIMEOUT, seed: int = 0) -> dict:
+    """clients клиентов одновременно, каждый делает syncs синхронизаций подряд; возвращает отчёт."""
+    pool = ConnectionPool(base_url, connections, accept_encoding, timeout)
+    stats = LoadStats()
+
+    async def client(number: int) -> None:
+        rng = random.Random(seed * 1_000_003 + number)
+        for _ in range(syncs):
+            await sync_once(pool, stats, since, limit, content_ratio, rng)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(client(i) for i in range(clients)))
+    finally:
+        pool.close()
+    return build_report(stats, time.perf_counter() - started, pool.connects,
+                        {"url": base_url, "clients": clients, "syncs": syncs,
+                         "connections": connections, "limit": limit})
+
+
+def _percentiles(values, scale: float = 1.0) -> dict:
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50) * scale, "p95": float(p95) * scale,
+            "p99": float(p99) * scale, "max": float(max(values)) * scale}
+
+
+def build_report(stats: LoadStats, wall_seconds: float, connects: int, config: dict) -> dict:
+    endpoints = {}
+    for endpoint in sorted(set(stats.latencies) | set(stats.errors)):
+        requests = len(stats.latencies[endpoint])
+        wire = sum(stats.wire_bytes[endpoint])
+        endpoints[endpoint] = {
+            "requests": requests,
+            "errors": dict(stats.errors[endpoint]),
+            "statuses": {str(status): n for status, n in sorted(stats.statuses[endpoint].items())},
+            "rps": requests / wall_seconds if wall_seconds else 0.0,
+            "mibPerSecond": wire / 1024 / 1024 / wall_seconds if wall_seconds else 0.0,
+            "latencyMs": _percentiles(stats.latencies[endpoint], 1000.0),
+            "wireBytes": _percentiles(stats.wire_bytes[endpoint]),
+            "bodyBytes": _percentiles(stats.body_bytes[endpoint]),
+            "totalWireBytes": wire,
+        }
+    total_requests = sum(e["requests"] for e in endpoints.values())
+    items = [s["items"] for s in stats.syncs if s["error"] is None]
+    return {
+        "config": config,
+        "wallSeconds": wall_seconds,
+        "requests": total_requests,
+        "rps": total_requests / wall_seconds if wall_seconds else 0.0,
+        "connections": connects,
+        "endpoints": endpoints,
+        "updatesFirstPageMs": _percentiles(stats.first_page, 1000.0),
+        "updatesLastPageMs": _percentiles(stats.last_page, 1000.0),
+        "syncs": {
+            "count": len(stats.syncs),
+            "failed": sum(s["error"] is not None for s in stats.syncs),
+            "errors": dict(Counter(s["error"] for s in stats.syncs if s["error"] is not None)),
+            "seconds": _percentiles([s["seconds"] for s in stats.syncs]),
+            "pages": _percentiles([s["pages"] for s in stats.syncs]),
+            # Разное число элементов у успешных синхронизаций — признак несогласованной пагинации
+            "itemsMin": min(items) if items else 0,
+            "itemsMax": max(items) if items else 0,
+        },
+    }
+
+
+def _format_latency(latency: dict) -> str:
+    if not latency:
+        return "—"
+    return (f"p50 {latency['p50']:.1f} мс, p95 {latency['p95']:.1f} мс, "
+            f"p99 {latency['p99']:.1f} мс, max {latency['max']:.1f} мс")
+
+
+def format_report(report: dict) -> str:
+    config = report["config"]
+    lines = [
+        f"{config['url']}: {config['clients']} клиентов × {config['syncs']} синхронизаций, "
+        f"limit {config['limit']}, открыто соединений {report['connections']} (пул {config['connections']})",
+        f"Всего {report['requests']} запросов за {report['wallSeconds']:.2f} с ({report['rps']:.0f} запросов/с)",
+    ]
+    for endpoint, e in report["endpoints"].items():
+        errors = sum(e["errors"].values())
+        statuses = ", ".join(f"{status}: {n}" for status, n in e["statuses"].items())
+        lines.append(f"  /{endpoint}: {e['requests']} запросов ({statuses}), ошибок {errors}, "
+                     f"{e['rps']:.0f} запросов/с, {e['mibPerSecond']:.2f} МиБ/с")
+        lines.append(f"    латентность: {_format_latency(e['latencyMs'])}")
+        if e["wireBytes"]:
+            lines.append(f"    ответ: p50 {e['wireBytes']['p50'] / 1024:.1f} КиБ, "
+                         f"p95 {e['wireBytes']['p95'] / 1024:.1f} КиБ, max {e['wireBytes']['max'] / 1024:.1f} КиБ"
+                         f" (распакованный p50 {e['bodyBytes']['p50'] / 1024:.1f} КиБ)")
+        for message, n in e["errors"].items():
+            lines.append(f"    {message}: {n}")
+    lines.append(f"  /updates первая страница: {_format_latency(report['updatesFirstPageMs'])}")
+    lines.append(f"  /updates последняя страница: {_format_latency(report['updatesLastPageMs'])}")
+    syncs = report["syncs"]
+    if syncs["seconds"]:
+        lines.append(
+            f"Синхронизации: {syncs['count']}, неудачных {syncs['failed']}; время p50 {syncs['seconds']['p50']:.2f} с, "
+            f"p95 {syncs['seconds']['p95']:.2f} с; страниц p50 {syncs['pages']['p50']:.0f}; "
+            f"элементов {syncs['itemsMin']}–{syncs['itemsMax']}"
+        )
+    for message, n in syncs["errors"].items():
+        lines.append(f"  {message}: {n}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест /updates и /content по протоколу дельта-синхронизации")
+    parser.add_argument("url", help="адрес сервера, например http://localhost:8080")
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS, help="одновременных клиентов")
+    parser.add_argument("--syncs", type=int, default=1, help="полных синхронизаций на клиента")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS,
+                        help="размер пула keep-alive соединений")
+    parser.add_argument("--limit", type=int, default=100, help="limit страницы /updates")
+    parser.add_argument("--since", default=DEFAULT_SINCE, help="начальный курсор since")
+    parser.add_argument("--content-ratio", type=float, default=1.0,
+                        help="доля upsert-элементов, для которых запрашивается /content")
+    parser.add_argument("--gzip", action="store_true",
+                        help="отправлять Accept-Encoding: gzip (размеры ответов — сжатые байты)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="таймаут запроса, с")
+    parser.add_argument("--seed", type=int, default=0, help="seed выборки /content")
+    parser.add_argument("--json", metavar="REPORT", help="записать отчёт в JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.url, args.clients, args.syncs, args.connections, args.limit,
+                                  args.since, args.content_ratio, "gzip" if args.gzip else "identity",
+                                  args.timeout, args.seed))
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,123 @@
+"""
+Предразбитые страницы фида для протокола /updates?since=&limit=.
+
+Страницы отсортированы по updatedAt и повторяют ответ сервера: в каждой
+лежат data и заранее посчитанные meta.nextSince / meta.hasMore. Индекс
+index.json хранит границы курсоров страниц, поэтому сервер или ридер ассетов
+отвечает на запрос одним бинарным поиском и чтением одного маленького файла,
+а не фильтрацией всего списка.
+
+Семантика совпадает с mock-server (pagedSince) и DevNetworkDataSource:
+в ответ попадают элементы с updatedAt > since, nextSince — updatedAt последнего
+элемента страницы. Поскольку сравнение строгое, элементы с одинаковым
+updatedAt никогда не разносятся по разным страницам (страница может оказаться
+чуть длиннее limit), иначе клиент пропустил бы их хвост.
+"""
+import bisect
+import json
+import os
+import tempfile
+
+INDEX_FILE = "index.json"
+DEFAULT_PAGE_SIZE = 100
+
+
+class PageWriter:
+    """
+    Принимает элементы в любом порядке и раскладывает их по страницам.
+    Элементы сначала сбрасываются во временный NDJSON-файл; в памяти остаются
+    только ключи сортировки и смещения, так что корпус любого размера
+    сортируется без загрузки целиком.
+    """
+
+    def __init__(self, out_dir: str, page_size: int = DEFAULT_PAGE_SIZE):
+        if page_size < 1:
+            raise ValueError(f"Размер страницы должен быть не меньше 1, получено {page_size}")
+        self.out_dir = out_dir
+        self.page_size = page_size
+        self._spool = tempfile.TemporaryFile()
+        self._keys = []
+
+    def add(self, item: dict) -> None:
+        line = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._keys.append((item["updatedAt"], len(self._keys), self._spool.tell(), len(line)))
+        self._spool.write(line)
+        self._spool.write(b"\n")
+
+    def _read(self, offset: int, length: int) -> bytes:
+        self._spool.seek(offset)
+        return self._spool.read(length)
+
+    def finish(self) -> dict:
+        """Пишет страницы и index.json; возвращает индекс."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._keys.sort()
+        pages = []
+        since = ""
+        start = 0
+        n = len(self._keys)
+        while start < n:
+            stop = min(start + self.page_size, n)
+            # Дотягиваем страницу до конца группы с тем же updatedAt
+            while stop < n and self._keys[stop][0] == self._keys[stop - 1][0]:
+                stop += 1
+            next_since = self._keys[stop - 1][0]
+            has_more = stop < n
+            file_name = f"page-{len(pages):06d}.json"
+            with open(os.path.join(self.out_dir, file_name), "wb") as f:
+                f.write(b'{"data":[')
+                for i, (_, _, offset, length) in enumerate(self._keys[start:stop]):
+                    if i:
+                        f.write(b",")
+                    f.write(self._read(offset, length))
+                meta = json.dumps({"nextSince": next_since, "hasMore": has_more})
+                f.write(b'],"meta":' + meta.encode("utf-8") + b"}")
+            pages.append({
+                "file": file_name,
+                "since": since,
+                "firstUpdatedAt": self._keys[start][0],
+                "nextSince": next_since,
+                "count": stop - start,
+                "hasMore": has_more,
+            })
+            since = next_since
+            start = stop
+        self._spool.close()
+
+        index = {"pageSize": self.page_size, "total": n, "pages": pages}
+        with open(os.path.join(self.out_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        return index
+
+
+def tee_pages(items, writer: PageWriter):
+    """Пропускает элементы дальше, попутно отдавая их в PageWriter."""
+    for item in items:
+        writer.add(item)
+        yield item
+
+
+def find_page(index: dict, since: str):
+    """
+    Страница, отвечающая на /updates?since=...: первая, у которой nextSince > since.
+    None — обновлений после since нет. Если since попадает внутрь страницы
+    (since > page["since"]), элементы с updatedAt <= since нужно отфильтровать.
+    """
+    cursors = [page["nextSince"] for page in index["pages"]]
+    i = bisect.bisect_right(cursors, since)
+    return index["pages"][i] if i < len(cursors) else None
+
+
+def read_updates(pages_dir: str, since: str, index: dict = None) -> dict:
+    """Ответ /updates для since, собранный из предразбитых страниц (эталон для серверов и тестов)."""
+    if index is None:
+        with open(os.path.join(pages_dir, INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+    page = find_page(index, since)
+    if page is None:
+        return {"data": [], "meta": {"nextSince": since, "hasMore": False}}
+    with open(os.path.join(pages_dir, page["file"]), encoding="utf-8") as f:
+        response = json.load(f)
+    if since > page["since"]:
+        response["data"] = [item for item in response["data"] if item["updatedAt"] > since]
+    return response
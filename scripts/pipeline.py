@@ -0,0 +1,175 @@
+"""
+Конвейер из потоков, связанных очередями ограниченной длины.
+
+В iter_article_items стадии по каждому окну статей выполняются строго по
+очереди: пока работает модель, простаивают диск и сериализация, и наоборот.
+С pipeline=Pipeline(...) они разносятся по потокам:
+
+    чтение окон -> чанкинг -> кодирование -> сборка элементов -> сериализация и запись
+
+Источник (чтение входа) и каждая промежуточная стадия работают в своём потоке,
+последняя стадия — потребитель генератора Pipeline.run (write_items и тройники
+--pages/--room-db в основном потоке). Модель (torch, ONNX Runtime) и SQLite-кэш
+отпускают GIL, поэтому, пока кодируется окно k, следующее окно уже режется,
+а предыдущее сериализуется, и общее время стремится ко времени самой медленной
+стадии — обычно кодирования. Стадия с полной очередью на выходе ждёт, поэтому
+в памяти одновременно не больше queue_size + 1 окон на стадию.
+"""
+import queue
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 2
+
+_DONE = object()
+
+
+class _Failure:
+    """Исключение стадии, переданное по конвейеру до потребителя."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Pipeline:
+    """
+    Использование:
+
+        pipeline = Pipeline(queue_size=2)
+        for result in pipeline.run(windows, [("chunk", chunk), ("encode", encode)]):
+            ...
+        print(pipeline.report())
+
+    Для каждой стадии копится время работы, ожидания входа (пустая очередь
+    перед стадией) и ожидания выхода (полная очередь после неё).
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        if queue_size < 1:
+            raise ValueError(f"Длина очереди должна быть не меньше 1, получено {queue_size}")
+        self.queue_size = queue_size
+        self.stages = {}
+        self.wall_seconds = 0.0
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _totals(self, name: str) -> dict:
+        return self.stages.setdefault(name, {"windows": 0, "busy": 0.0, "wait_in": 0.0, "wait_out": 0.0})
+
+    def _put(self, q: queue.Queue, value, name: str) -> bool:
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    q.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.stages[name]["wait_out"] += time.perf_counter() - started
+
+    def _get(self, q: queue.Queue, name: str):
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+        finally:
+            self.stages[name]["wait_in"] += time.perf_counter() - started
+
+    def _source(self, name: str, source, outbound: queue.Queue) -> None:
+        totals = self.stages[name]
+        try:
+            iterator = iter(source)
+            while True:
+                started = time.perf_counter()
+                value = next(iterator, _DONE)
+                totals["busy"] += time.perf_counter() - started
+                if value is _DONE or not self._put(outbound, value, name):
+                    break
+                totals["windows"] += 1
+        except BaseException as error:
+            self._put(outbound, _Failure(error), name)
+            return
+        self._put(outbound, _DONE, name)
+
+    def _stage(self, name: str, func, inbound: queue.Queue, outbound: queue.Queue) -> None:
+        totals = self.stages[name]
+        while True:
+            value = self._get(inbound, name)
+            if value is _DONE or isinstance(value, _Failure):
+                self._put(outbound, value, name)
+                return
+            started = time.perf_counter()
+            try:
+                result = func(value)
+            except BaseException as error:
+                self._put(outbound, _Failure(error), name)
+                return
+            finally:
+                totals["busy"] += time.perf_counter() - started
+            totals["windows"] += 1
+            if not self._put(outbound, result, name):
+                return
+
+    def _start(self, target, *args) -> None:
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def run(self, source, stages: list, source_name: str = "read", sink_name: str = "write"):
+        """
+        Генератор результатов последней из stages в порядке source.
+        stages — список (имя, функция); каждая функция получает результат предыдущей.
+        Потоки запускаются сразу; исключение любой стадии пробрасывается потребителю.
+        """
+        started = time.perf_counter()
+        self._totals(source_name)
+        queues = [queue.Queue(self.queue_size) for _ in range(len(stages) + 1)]
+        self._start(self._source, source_name, source, queues[0])
+        for (name, func), inbound, outbound in zip(stages, queues, queues[1:]):
+            self._totals(name)
+            self._start(self._stage, name, func, inbound, outbound)
+        self._totals(sink_name)
+        return self._consume(queues[-1], sink_name, started)
+
+    def _consume(self, inbound: queue.Queue, name: str, started: float):
+        totals = self.stages[name]
+        try:
+            while True:
+                value = self._get(inbound, name)
+                if value is _DONE:
+                    return
+                if isinstance(value, _Failure):
+                    raise value.error
+                resumed = time.perf_counter()
+                yield value
+                totals["busy"] += time.perf_counter() - resumed
+                totals["windows"] += 1
+        finally:
+            self.close()
+            self.wall_seconds += time.perf_counter() - started
+
+    def close(self) -> None:
+        """Останавливает потоки стадий (в том числе при досрочном выходе потребителя)."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def report(self) -> str:
+        lines = [f"Конвейер (очереди по {self.queue_size}): {self.wall_seconds:.2f} с"]
+        for name, s in self.stages.items():
+            lines.append(
+                f"  {name:<7} работа {s['busy']:7.2f} с, ожидание входа {s['wait_in']:7.2f} с, "
+                f"выхода {s['wait_out']:7.2f} с ({s['windows']} окон)"
+            )
+        if self.stages:
+            slowest = max(self.stages, key=lambda name: self.stages[name]["busy"])
+            share = self.stages[slowest]["busy"] / self.wall_seconds if self.wall_seconds else 0.0
+            lines.append(f"  узкое место: {slowest} ({share:.0%} общего времени)")
+        return "\n".join(lines)
@@ -0,0 +1,197 @@
+"""
+Инструментирование стадий генерации (--profile).
+
+Profiler оборачивает стадии конвейера (загрузка модели, чанкинг, токенизация,
+model.encode, пулинг, сборка элемента, json.dumps) таймерами wall и CPU,
+считает вызовы и элементы и, если включён tracemalloc, пиковую память Python
+внутри стадии. Стадии могут быть вложенными: итоги ведутся по имени стадии,
+а время по полному пути стадий — для collapsed-формата flamegraph
+(flamegraph.pl, speedscope).
+
+Латентность статьи складывается из её собственного чанкинга, доли общего
+кодирования и пулинга окна (пропорционально длине её чанков), сборки и
+сериализации элемента. При --workers > 1 чанкинг и кодирование выполняются
+в воркерах и в отчёт не попадают.
+
+Отчёт — JSON с итогами по стадиям, счётчиками, перцентилями латентности
+статей и самыми медленными статьями.
+"""
+import contextlib
+import heapq
+import json
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+import numpy as np
+
+from benchmark import _peak_rss_mb
+
+
+class StageTimer:
+    """Замер одного входа в стадию; wall/cpu заполняются при выходе."""
+
+    __slots__ = ("name", "wall", "cpu", "peak")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = 0
+
+
+class Profiler:
+    """
+    Сборщик метрик стадий.
+
+        profiler = Profiler()
+        with profiler.stage("encode", items=len(chunks)) as timer:
+            ...
+        profiler.count("tokens", n)
+        report = profiler.report()
+
+    trace_memory=True включает tracemalloc (замедляет аллокации Python в
+    несколько раз, поэтому времена стадий с ним завышены).
+    """
+
+    def __init__(self, trace_memory: bool = True, slowest: int = 20):
+        self.trace_memory = trace_memory
+        self.slowest = slowest
+        self.stages = defaultdict(lambda: {"calls": 0, "items": 0, "wall": 0.0, "cpu": 0.0, "peak": 0})
+        self.paths = defaultdict(float)
+        self.counters = defaultdict(int)
+        self._stack = []
+        self._pending = deque()
+        self._articles = {}
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, items: int = 0):
+        timer = StageTimer(name)
+        if self.trace_memory:
+            # Пик с начала родительской стадии сохраняется в родителе, счётчик — сбрасывается
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                tracemalloc.reset_peak()
+        self._stack.append(timer)
+        path = ";".join(t.name for t in self._stack)
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        try:
+            yield timer
+        finally:
+            timer.wall = time.perf_counter() - started_wall
+            timer.cpu = time.process_time() - started_cpu
+            self._stack.pop()
+            if self.trace_memory:
+                timer.peak = max(timer.peak, tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1].peak = max(self._stack[-1].peak, timer.peak)
+            totals = self.stages[name]
+            totals["calls"] += 1
+            totals["items"] += items
+            totals["wall"] += timer.wall
+            totals["cpu"] += timer.cpu
+            totals["peak"] = max(totals["peak"], timer.peak)
+            self.paths[path] += timer.wall
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def window_costs(self, text_seconds: list, chunk_chars: list, chunk_counts: list,
+                     shared_seconds: float) -> None:
+        """
+        Латентности текстов окна: собственный чанкинг плюс доля shared_seconds
+        (общее кодирование и пулинг) пропорционально длине чанков текста.
+        """
+        chars = np.asarray(chunk_chars, dtype=np.float64)
+        share = chars / chars.sum() if chars.sum() else np.full(len(chars), 1.0 / max(len(chars), 1))
+        self._pending.extend(zip(np.asarray(text_seconds) + share * shared_seconds, chunk_counts))
+
+    def start_article(self, item_id: str, title: str, seconds: float) -> None:
+        """Заводит запись статьи: стоимость её окна (если есть) плюс seconds."""
+        cost, chunks = self._pending.popleft() if self._pending else (0.0, 0)
+        self._articles[item_id] = [float(cost) + seconds, title, int(chunks)]
+
+    def add_article_time(self, item_id: str, seconds: float) -> None:
+        record = self._articles.get(item_id)
+        if record is not None:
+            record[0] += seconds
+
+    def report(self) -> dict:
+        wall = time.perf_counter() - self._started_wall
+        cpu = time.process_time() - self._started_cpu
+        top_level = sum(seconds for path, seconds in self.paths.items() if ";" not in path)
+        stages = {
+            name: {
+                "calls": s["calls"],
+                "items": s["items"],
+                "wall_seconds": s["wall"],
+                "cpu_seconds": s["cpu"],
+                "wall_share": s["wall"] / wall if wall else 0.0,
+                "mean_ms": s["wall"] / s["calls"] * 1000 if s["calls"] else 0.0,
+                **({"peak_traced_mb": s["peak"] / 1024 / 1024} if self.trace_memory else {}),
+            }
+            for name, s in sorted(self.stages.items(), key=lambda kv: -kv[1]["wall"])
+        }
+        latencies = np.asarray([record[0] for record in self._articles.values()]) * 1000
+        articles = {"count": int(len(latencies))}
+        if len(latencies):
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            articles["latency_ms"] = {
+                "mean": float(latencies.mean()), "p50": float(p50), "p90": float(p90),
+                "p99": float(p99), "max": float(latencies.max()),
+            }
+        slowest = heapq.nlargest(self.slowest, self._articles.items(), key=lambda kv: kv[1][0])
+        return {
+            "total": {
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "unaccounted_seconds": max(wall - top_level, 0.0),
+                "peak_rss_mb": _peak_rss_mb(),
+                **({"peak_traced_mb": max((s["peak"] for s in self.stages.values()), default=0)
+                    / 1024 / 1024} if self.trace_memory else {}),
+            },
+            "stages": stages,
+            "counters": dict(self.counters),
+            "articles": articles,
+            "slowest_articles": [
+                {"id": item_id, "title": title, "latency_ms": seconds * 1000, "chunks": chunks}
+                for item_id, (seconds, title, chunks) in slowest
+            ],
+        }
+
+    def write_report(self, path: str) -> dict:
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def write_collapsed(self, path: str) -> None:
+        """Collapsed stacks ("a;b;c <микросекунды>") собственного времени стадий для flamegraph."""
+        child_time = defaultdict(float)
+        for stage_path, seconds in self.paths.items():
+            if ";" in stage_path:
+                child_time[stage_path.rsplit(";", 1)[0]] += seconds
+        with open(path, "w", encoding="utf-8") as f:
+            for stage_path, seconds in sorted(self.paths.items()):
+                own = max(seconds - child_time[stage_path], 0.0)
+                f.write(f"{stage_path} {int(own * 1e6)}\n")
+
+    def summary(self) -> str:
+        report = self.report()
+        lines = [f"Профиль: {report['total']['wall_seconds']:.2f} с wall, "
+                 f"{report['total']['cpu_seconds']:.2f} с CPU"]
+        for name, s in report["stages"].items():
+            lines.append(f"  {name:<14} {s['wall_seconds']:8.2f} с ({s['wall_share']:5.1%}), "
+                         f"{s['calls']} вызовов")
+        latency = report["articles"].get("latency_ms")
+        if latency:
+            lines.append(f"  латентность статьи: p50 {latency['p50']:.1f} мс, "
+                         f"p90 {latency['p90']:.1f} мс, p99 {latency['p99']:.1f} мс")
+        return "\n".join(lines)
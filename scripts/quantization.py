@@ -0,0 +1,221 @@
+"""
+Int8-квантование эмбеддингов статей и оценка потери точности.
+
+Вектор хранится как int8 плюс масштаб: либо один scale на вектор,
+либо scale на каждое измерение, откалиброванный по всему корпусу.
+Точность оценивается сравнением top-K косинусных соседей, посчитанных
+по float32 и по квантованным векторам: recall@K и ранговая корреляция
+Спирмена внутри top-K.
+
+Запуск: python quantization.py articles.json [--k 10]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+QUANTIZATION_MODES = ("per-vector", "per-dim")
+
+
+class Int8Quantizer:
+    """
+    Симметричное int8-квантование: q = round(x / scale), x ≈ q * scale.
+    mode="per-vector" — scale = max|x| / 127 для каждого вектора;
+    mode="per-dim"    — scale на измерение, считается в fit() по корпусу.
+    """
+
+    def __init__(self, mode: str = "per-vector", scales: np.ndarray = None):
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Неизвестный режим квантования: {mode!r}, ожидается один из {QUANTIZATION_MODES}")
+        self.mode = mode
+        self.scales = None if scales is None else np.asarray(scales, dtype=np.float32)
+
+    def fit(self, matrix: np.ndarray) -> "Int8Quantizer":
+        """Калибрует масштабы по корпусу (нужно только для per-dim)."""
+        if self.mode == "per-dim":
+            max_abs = np.abs(np.asarray(matrix, dtype=np.float32)).max(axis=0)
+            self.scales = np.maximum(max_abs, 1e-12) / 127.0
+        return self
+
+    def quantize(self, matrix: np.ndarray):
+        """Возвращает (int8-матрица, масштабы) для матрицы (N, dim) или одного вектора."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if self.mode == "per-dim":
+            if self.scales is None:
+                raise ValueError("per-dim квантование требует калибровки: вызовите fit()")
+            scales = self.scales
+        else:
+            max_abs = np.abs(matrix).max(axis=-1, keepdims=True)
+            scales = np.maximum(max_abs, 1e-12) / 127.0
+        q = np.clip(np.rint(matrix / scales), -127, 127).astype(np.int8)
+        if self.mode == "per-vector":
+            scales = scales[..., 0]
+        return q, scales.astype(np.float32)
+
+    def dequantize(self, q: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        q = np.asarray(q, dtype=np.float32)
+        if self.mode == "per-vector":
+            return q * np.asarray(scales, dtype=np.float32)[..., None]
+        return q * np.asarray(scales, dtype=np.float32)
+
+    def to_json(self) -> dict:
+        return {
+            "mode": self.mode,
+            "scales": None if self.scales is None else self.scales.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "Int8Quantizer":
+        return cls(obj["mode"], obj.get("scales"))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _top_k(queries: np.ndarray, corpus: np.ndarray, k: int, offset: int) -> tuple:
+    """Top-K соседей для блока запросов (без самого запроса), отсортированные по убыванию."""
+    sims = queries @ corpus.T
+    rows = np.arange(len(queries))
+    sims[rows, offset + rows] = -np.inf
+    idx = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(sims, idx, axis=1), axis=1)
+    return np.take_along_axis(idx, order, axis=1), sims
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    return np.argsort(np.argsort(-values, axis=1), axis=1).astype(np.float64)
+
+
+def neighbour_agreement(exact: np.ndarray, approx: np.ndarray, k: int = 10,
+                        block_size: int = 1024) -> dict:
+    """
+    Сравнивает top-K косинусных соседей по exact и approx матрицам (N, dim).
+    recall@K — доля точных соседей, найденных по approx;
+    spearman — средняя корреляция Спирмена между рангами точных top-K соседей
+    по точным и по приближённым косинусам.
+    Память ограничена матрицей сходств block_size × N.
+    """
+    exact = _normalize(exact)
+    approx = _normalize(approx)
+    n = len(exact)
+    k = min(k, n - 1)
+    if k < 1:
+        return {"k": k, "recall": 1.0, "spearman": 1.0, "queries": n}
+
+    recall_sum = 0.0
+    spearman_sum = 0.0
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        true_idx, true_sims = _top_k(exact[start:stop], exact, k, start)
+        approx_idx, approx_sims = _top_k(approx[start:stop], approx, k, start)
+
+        hits = (true_idx[:, :, None] == approx_idx[:, None, :]).any(axis=2)
+        recall_sum += hits.sum() / k
+
+        if k > 1:
+            exact_ranks = _ranks(np.take_along_axis(true_sims, true_idx, axis=1))
+            approx_ranks = _ranks(np.take_along_axis(approx_sims, true_idx, axis=1))
+            d2 = ((exact_ranks - approx_ranks) ** 2).sum(axis=1)
+            spearman_sum += (1 - 6 * d2 / (k * (k * k - 1))).sum()
+        else:
+            spearman_sum += stop - start
+
+    return {"k": k, "recall": recall_sum / n, "spearman": spearman_sum / n, "queries": n}
+
+
+def evaluate_quantization(matrix: np.ndarray, k: int = 10) -> list:
+    """Отчёт по каждому режиму квантования: точность соседей и объём хранения."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    reports = []
+    for mode in QUANTIZATION_MODES:
+        quantizer = Int8Quantizer(mode).fit(matrix)
+        started = time.perf_counter()
+        q, scales = quantizer.quantize(matrix)
+        elapsed = time.perf_counter() - started
+        restored = quantizer.dequantize(q, scales)
+        report = neighbour_agreement(matrix, restored, k)
+        report.update({
+            "mode": mode,
+            "bytes": int(q.nbytes + scales.nbytes),
+            "float32_bytes": int(matrix.nbytes),
+            "max_abs_error": float(np.abs(restored - matrix).max()),
+            "quantize_seconds": elapsed,
+        })
+        reports.append(report)
+    return reports
+
+
+def format_report(reports: list) -> str:
+    lines = []
+    for r in reports:
+        lines.append(
+            f"{r['mode']:>10}: recall@{r['k']} = {r['recall']:.4f}, "
+            f"Spearman = {r['spearman']:.4f}, "
+            f"{r['bytes'] / 1024:.1f} KiB вместо {r['float32_bytes'] / 1024:.1f} KiB "
+            f"({r['float32_bytes'] / r['bytes']:.1f}×), max|Δ| = {r['max_abs_error']:.2e}"
+        )
+    return "\n".join(lines)
+
+
+def with_per_dim_quantization(items, path: str):
+    """
+    Пропускает элементы фида, перекодируя эмбеддинги upsert'ов в i8-base64 с
+    per-dim масштабами, откалиброванными по всем версиям статей в потоке (так
+    ни одно значение не обрезается). На вход нужны эмбеддинги без потерь
+    (list или f32-base64). Масштабы (Int8Quantizer.to_json) пишутся в path —
+    без них клиент не декодирует векторы.
+    """
+    from generate_test_data import encode_embedding
+    from related import spool_items
+
+    spool, ids, live, matrix = spool_items(items)
+    quantizer = Int8Quantizer("per-dim")
+    if ids:
+        quantizer.fit(matrix)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(quantizer.to_json(), f)
+
+    row = 0
+    for line in spool:
+        item = json.loads(line)
+        if item["action"] == "upsert":
+            original = item["attributes"]["embeddings"]
+            embeddings = encode_embedding(matrix[row], "i8-base64", quantizer)
+            embeddings["typeName"] = original["typeName"]
+            item["attributes"]["embeddings"] = embeddings
+            row += 1
+        yield item
+    spool.close()
+
+
+def load_embeddings(path: str, quantizer: Int8Quantizer = None) -> np.ndarray:
+    """Матрица эмбеддингов из сгенерированного articles.json (quantizer — для per-dim int8)."""
+    from generate_test_data import decode_embedding
+
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)["data"]
+    return np.stack([
+        decode_embedding(item["attributes"]["embeddings"], quantizer)
+        for item in items
+        if item.get("action") == "upsert" and item.get("attributes")
+    ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Оценка int8-квантования эмбеддингов корпуса")
+    parser.add_argument("input", help="articles.json, сгенерированный generate_test_data.py")
+    parser.add_argument("--k", type=int, default=10, help="число соседей для recall@K")
+    parser.add_argument("--scales", help="масштабы per-dim int8 (--int8-scales-output), если фид в i8-base64")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    args = parser.parse_args()
+
+    quantizer = None
+    if args.scales:
+        with open(args.scales, encoding="utf-8") as f:
+            quantizer = Int8Quantizer.from_json(json.load(f))
+    reports = evaluate_quantization(load_embeddings(args.input, quantizer), args.k)
+    print(json.dumps(reports, indent=2) if args.json else format_report(reports))
@@ -0,0 +1,341 @@
+"""
+Векторизованная эталонная реализация конвейера рекомендаций (docs/recommendation_engine.md).
+
+Повторяет RecommenderImpl и UserProfileRepositoryImpl на NumPy:
+- профиль — взвешенное скользящее среднее визитов
+  new = (old × visitCount + article × engagementWeight) / (visitCount + 1),
+  то есть после n визитов — среднее weight_i × article_i (считается через cumsum);
+- top-K по dot(article, profile) и cold-K по dot(article, −profile); как в Kotlin,
+  прочитанные статьи (и сама статья для content-to-content) отбрасываются
+  уже после выбора top-K, поэтому кандидатов может остаться меньше K;
+- MMR: score = λ·sim(c, query) − (1 − λ)·max_{s ∈ selected} sim(c, s) отдельно
+  для top-K и cold-K, затем слияние по убыванию score и первые mmrK.
+MMR для всех статей сразу считается батчем: попарные сходства кандидатов
+(B, m, m) и вектор «макс. сходства с выбранными» обновляются за шаг для всех строк.
+
+Подкоманды:
+python recommender.py bench [--sizes 1000,10000,100000] [--dim 384]
+    — латентность и память этапов при разных N;
+python recommender.py fixtures [--input articles.json] [-o recommendation_golden.json]
+    — golden-фикстуры входов и ожидаемых выходов для Kotlin-тестов.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from related import _unit
+
+DEFAULT_TOP_K = 10
+DEFAULT_COLD_K = 4
+DEFAULT_MMR_K = 5
+DEFAULT_LAMBDA = 0.7
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def engagement_weight(avg_read_percentage, avg_reading_time_ms) -> np.ndarray:
+    """
+    Вес визита как в UserProfileRepositoryImpl: 0.5 × доля прочитанного
+    (не меньше 0.001) + 0.5 × время чтения в секундах, обрезанное до [1, 600] / 600.
+    """
+    percent = np.maximum(np.asarray(avg_read_percentage, dtype=np.float64), 0.001)
+    seconds = np.asarray(avg_reading_time_ms, dtype=np.int64) // 1000
+    time_score = np.clip(seconds, 1, 600).astype(np.float32) / 600
+    return (0.5 * percent + 0.5 * time_score).astype(np.float32)
+
+
+def profile_history(article_vectors: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Профиль пользователя после каждого из визитов (строка i — после i+1 визитов).
+    Взвешенное скользящее среднее сводится к накопленному среднему weight × vector.
+    """
+    weighted = np.asarray(article_vectors, dtype=np.float32) * np.asarray(weights, np.float32)[:, None]
+    counts = np.arange(1, len(weighted) + 1, dtype=np.float32)[:, None]
+    return np.cumsum(weighted, axis=0, dtype=np.float64).astype(np.float32) / counts
+
+
+def update_profile(profile: np.ndarray, visits: int, article: np.ndarray, weight: float) -> np.ndarray:
+    """Один шаг обновления профиля (profile=None — первый визит)."""
+    article = np.asarray(article, dtype=np.float32)
+    if profile is None:
+        return article * np.float32(weight)
+    return (profile * np.float32(visits) + article * np.float32(weight)) / np.float32(visits + 1)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Индексы k наибольших значений по последней оси, по убыванию."""
+    k = min(k, scores.shape[-1])
+    if k == 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(idx, order, axis=-1)
+
+
+def mmr_batch(relevance: np.ndarray, pairwise: np.ndarray, valid: np.ndarray,
+              k: int, lam: float = DEFAULT_LAMBDA) -> tuple:
+    """
+    MMR сразу для B запросов по m кандидатов.
+    relevance (B, m) — sim(кандидат, запрос); pairwise (B, m, m) — sim между кандидатами;
+    valid (B, m) — маска существующих кандидатов.
+    Возвращает (selected (B, k), scores (B, k)); незаполненные позиции — −1 / nan.
+    При равенстве выбирается первый кандидат, как maxByOrNull в Kotlin.
+    """
+    b, m = relevance.shape
+    rows = np.arange(b)
+    available = valid.copy()
+    max_selected = np.zeros((b, m), dtype=np.float32)
+    selected = np.full((b, k), -1, dtype=np.int64)
+    scores = np.full((b, k), np.nan, dtype=np.float32)
+    for step in range(min(k, m)):
+        score = np.float32(lam) * relevance - np.float32(1 - lam) * max_selected
+        score = np.where(available, score, -np.inf)
+        best = score.argmax(axis=1)
+        ok = available[rows, best]
+        selected[ok, step] = best[ok]
+        scores[ok, step] = score[rows, best][ok]
+        available[rows[ok], best[ok]] = False
+        sims = pairwise[rows, best]
+        # До первого выбора max по пустому множеству равен 0, дальше — обычный максимум
+        max_selected = np.where(ok[:, None], sims if step == 0 else np.maximum(max_selected, sims),
+                                max_selected)
+    return selected, scores
+
+
+def mmr_diversify(query: np.ndarray, candidates: np.ndarray, k: int,
+                  lam: float = DEFAULT_LAMBDA) -> tuple:
+    """MMR для одного запроса: (индексы выбранных кандидатов, их MMR-оценки)."""
+    candidates = np.asarray(candidates, dtype=np.float32).reshape(-1, len(query))
+    relevance = (candidates @ query)[None]
+    pairwise = (candidates @ candidates.T)[None]
+    selected, scores = mmr_batch(relevance, pairwise, np.ones_like(relevance, dtype=bool), k, lam)
+    keep = selected[0] >= 0
+    return selected[0][keep], scores[0][keep]
+
+
+def _merge(query_vectors: np.ndarray, unit: np.ndarray, similar: np.ndarray, similar_ok: np.ndarray,
+           cold: np.ndarray, cold_ok: np.ndarray, mmr_k: int, lam: float) -> tuple:
+    """MMR по similar и по cold для каждой строки, слияние и первые mmr_k по убыванию."""
+    picked = []
+    for cand, ok in ((similar, similar_ok), (cold, cold_ok)):
+        vectors = unit[np.where(ok, cand, 0)]
+        relevance = np.einsum("bmd,bd->bm", vectors, query_vectors)
+        pairwise = np.einsum("bmd,bnd->bmn", vectors, vectors)
+        selected, scores = mmr_batch(relevance, pairwise, ok, mmr_k, lam)
+        ids = np.where(selected >= 0, np.take_along_axis(cand, np.maximum(selected, 0), axis=1), -1)
+        picked.append((ids, scores))
+    ids = np.concatenate([picked[0][0], picked[1][0]], axis=1)
+    scores = np.concatenate([picked[0][1], picked[1][1]], axis=1)
+    order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), axis=1, kind="stable")[:, :mmr_k]
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def recommend_for_user(unit: np.ndarray, profile: np.ndarray, read: np.ndarray = None,
+                       top_k_n: int = DEFAULT_TOP_K, cold_k: int = DEFAULT_COLD_K,
+                       mmr_k: int = DEFAULT_MMR_K, lam: float = DEFAULT_LAMBDA) -> tuple:
+    """
+    Рекомендации для профиля (RecommenderImpl.updateRecommendationsForUser).
+    unit — единичные эмбеддинги статей (N, dim), read — маска прочитанных.
+    Возвращает (индексы статей, MMR-оценки), не больше mmr_k.
+    """
+    profile = np.asarray(profile, dtype=np.float32)
+    sims = unit @ profile
+    similar = top_k(sims, top_k_n)[None]
+    cold = top_k(-sims, cold_k)[None]
+    similar_ok = np.ones_like(similar, dtype=bool) if read is None else ~read[similar]
+    ids, scores = _merge(profile[None], unit, similar, similar_ok, cold,
+                         np.ones_like(cold, dtype=bool), mmr_k, lam)
+    keep = ids[0] >= 0
+    return ids[0][keep], scores[0][keep]
+
+
+def recommend_for_articles(unit: np.ndarray, read: np.ndarray = None, rows: np.ndarray = None,
+                           top_k_n: int = DEFAULT_TOP_K, cold_k: int = DEFAULT_COLD_K,
+                           mmr_k: int = DEFAULT_MMR_K, lam: float = DEFAULT_LAMBDA,
+                           block_size: int = 256) -> tuple:
+    """
+    Content-to-content рекомендации (RecommenderImpl.updateRecommendationsForArticles)
+    для статей rows (по умолчанию — всех). Сходства считаются блоками block_size × N.
+    Возвращает (ids (R, mmr_k), scores (R, mmr_k)); пустые позиции — −1 / nan.
+    """
+    n = len(unit)
+    rows = np.arange(n) if rows is None else np.asarray(rows)
+    all_ids = np.full((len(rows), mmr_k), -1, dtype=np.int64)
+    all_scores = np.full((len(rows), mmr_k), np.nan, dtype=np.float32)
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        sims = unit[block] @ unit.T
+        similar = top_k(sims, top_k_n)
+        cold = top_k(-sims, cold_k)
+        similar_ok = similar != block[:, None]
+        if read is not None:
+            similar_ok &= ~read[similar]
+        cold_ok = cold != block[:, None]
+        ids, scores = _merge(unit[block], unit, similar, similar_ok, cold, cold_ok, mmr_k, lam)
+        all_ids[start:start + len(block), :ids.shape[1]] = ids
+        all_scores[start:start + len(block), :scores.shape[1]] = scores
+    return all_ids, all_scores
+
+
+def synthetic_unit_embeddings(n: int, dim: int = 384, seed: int = 0, clusters: int = 32) -> np.ndarray:
+    """Единичные векторы вокруг clusters центроидов — как эмбеддинги synthetic_corpus."""
+    rng = np.random.default_rng(seed)
+    centroids = _unit(rng.standard_normal((clusters, dim)).astype(np.float32))
+    result = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 65536):
+        m = min(65536, n - start)
+        noise = rng.standard_normal((m, dim), dtype=np.float32) * np.float32(0.6 / np.sqrt(dim))
+        result[start:start + m] = centroids[rng.integers(0, clusters, m)] + noise
+    return _unit(result)
+
+
+def _measure(fn) -> tuple:
+    """(результат, секунды, пик памяти tracemalloc в МиБ) одного вызова fn."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def benchmark(sizes=DEFAULT_SIZES, dim: int = 384, articles_sample: int = 1000,
+              visits: int = 50, seed: int = 0) -> list:
+    """
+    Для каждого N: обновление профиля по visits визитам, рекомендации пользователю
+    и content-to-content для articles_sample статей (время на статью и оценка на весь корпус).
+    """
+    reports = []
+    for n in sizes:
+        unit = synthetic_unit_embeddings(n, dim, seed)
+        rng = np.random.default_rng(seed)
+        visited = rng.choice(n, min(visits, n), replace=False)
+        weights = engagement_weight(rng.random(len(visited)), rng.integers(1000, 900_000, len(visited)))
+        read = np.zeros(n, dtype=bool)
+        read[visited] = True
+
+        profiles, profile_s, profile_mb = _measure(lambda: profile_history(unit[visited], weights))
+        _, user_s, user_mb = _measure(lambda: recommend_for_user(unit, profiles[-1], read))
+        sample = rng.choice(n, min(articles_sample, n), replace=False)
+        _, articles_s, articles_mb = _measure(lambda: recommend_for_articles(unit, read, sample))
+        per_article = articles_s / len(sample)
+        reports.append({
+            "n": n,
+            "dim": dim,
+            "matrix_mb": unit.nbytes / 1024 / 1024,
+            "profile_update_ms": profile_s / len(visited) * 1000,
+            "profile_peak_mb": profile_mb,
+            "user_ms": user_s * 1000,
+            "user_peak_mb": user_mb,
+            "article_ms": per_article * 1000,
+            "articles_peak_mb": articles_mb,
+            "all_articles_s": per_article * n,
+        })
+        del unit
+    return reports
+
+
+def format_benchmark(reports: list) -> str:
+    lines = [f"{'N':>9} {'матрица':>9} {'профиль':>10} {'пользователь':>13} "
+             f"{'статья':>10} {'все статьи':>11} {'пик памяти':>11}"]
+    for r in reports:
+        peak = max(r["profile_peak_mb"], r["user_peak_mb"], r["articles_peak_mb"])
+        lines.append(
+            f"{r['n']:>9} {r['matrix_mb']:>6.0f} МиБ {r['profile_update_ms']:>7.3f} мс "
+            f"{r['user_ms']:>10.1f} мс {r['article_ms']:>7.2f} мс {r['all_articles_s']:>9.1f} с "
+            f"{peak:>7.0f} МиБ"
+        )
+    return "\n".join(lines)
+
+
+def _golden_input(args) -> tuple:
+    if args.input:
+        from generate_test_data import decode_embedding
+
+        with open(args.input, encoding="utf-8") as f:
+            upserts = [item for item in json.load(f)["data"]
+                       if item.get("action") == "upsert" and item.get("attributes")]
+        upserts = upserts[:args.articles]
+        ids = [item["id"] for item in upserts]
+        matrix = np.stack([decode_embedding(item["attributes"]["embeddings"]) for item in upserts])
+        return ids, _unit(matrix)
+    ids = [f"article-{i:03d}" for i in range(args.articles)]
+    return ids, synthetic_unit_embeddings(args.articles, args.dim, args.seed, clusters=4)
+
+
+def golden_fixtures(ids: list, unit: np.ndarray, visits: int = 5, seed: int = 0,
+                    top_k_n: int = DEFAULT_TOP_K, cold_k: int = DEFAULT_COLD_K,
+                    mmr_k: int = DEFAULT_MMR_K, lam: float = DEFAULT_LAMBDA) -> dict:
+    """
+    Входы (единичные эмбеддинги, визиты со статистикой чтения) и ожидаемые выходы
+    (профиль после каждого визита, рекомендации пользователю и по статьям).
+    Сравнивать оценки в Kotlin нужно с допуском ~1e-5: порядок суммирования float отличается.
+    """
+    rng = np.random.default_rng(seed)
+    visited = rng.choice(len(ids), min(visits, len(ids)), replace=False)
+    read_percentage = np.round(rng.random(len(visited)), 3)
+    reading_time_ms = rng.integers(1000, 900_000, len(visited))
+    weights = engagement_weight(read_percentage, reading_time_ms)
+    profiles = profile_history(unit[visited], weights)
+    read = np.zeros(len(ids), dtype=bool)
+    read[visited] = True
+
+    def as_list(idx, scores):
+        return [{"id": ids[i], "score": float(s)} for i, s in zip(idx, scores) if i >= 0]
+
+    user_idx, user_scores = recommend_for_user(unit, profiles[-1], read, top_k_n, cold_k, mmr_k, lam)
+    article_idx, article_scores = recommend_for_articles(unit, read, None, top_k_n, cold_k, mmr_k, lam)
+    return {
+        "params": {"topK": top_k_n, "coldK": cold_k, "mmrK": mmr_k, "lambda": lam},
+        "articles": [{"id": i, "unitEmbedding": v.tolist()} for i, v in zip(ids, unit)],
+        "visits": [
+            {"id": ids[i], "avgReadPercentage": float(p), "avgReadingTime": int(t),
+             "engagementWeight": float(w)}
+            for i, p, t, w in zip(visited, read_percentage, reading_time_ms, weights)
+        ],
+        "expected": {
+            "profiles": profiles.tolist(),
+            "readIds": [ids[i] for i in visited],
+            "userRecommendations": as_list(user_idx, user_scores),
+            "contentRecommendations": {
+                ids[row]: as_list(article_idx[row], article_scores[row]) for row in range(len(ids))
+            },
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Эталонный конвейер рекомендаций на NumPy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser("bench", help="латентность и память при разных N")
+    bench.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                       help="размеры корпуса через запятую (1000000 — около 1.5 ГиБ при dim 384)")
+    bench.add_argument("--dim", type=int, default=384)
+    bench.add_argument("--sample", type=int, default=1000,
+                       help="статей для замера content-to-content")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+
+    fixtures = commands.add_parser("fixtures", help="golden-фикстуры для Kotlin-тестов")
+    fixtures.add_argument("--input", "-i", help="articles.json (по умолчанию — синтетические векторы)")
+    fixtures.add_argument("--output", "-o", default="recommendation_golden.json")
+    fixtures.add_argument("--articles", type=int, default=40, help="число статей в фикстуре")
+    fixtures.add_argument("--visits", type=int, default=5, help="число визитов пользователя")
+    fixtures.add_argument("--dim", type=int, default=16, help="размерность синтетических векторов")
+    fixtures.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        reports = benchmark([int(s) for s in args.sizes.split(",")], args.dim, args.sample,
+                            seed=args.seed)
+        print(json.dumps(reports, indent=2) if args.json else format_benchmark(reports))
+    else:
+        fixture = golden_fixtures(*_golden_input(args), visits=args.visits, seed=args.seed)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=1)
+        print(f"Фикстура: {len(fixture['articles'])} статей, {len(fixture['visits'])} визитов "
+              f"-> {args.output}")
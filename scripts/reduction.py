@@ -0,0 +1,207 @@
+"""
+Понижение размерности эмбеддингов статей: PCA по корпусу или усечение (Matryoshka).
+
+RecommenderImpl и EmbeddingIndex.dot тратят O(dim) на каждое сравнение;
+при 384 → 128 скоринг на устройстве дешевеет втрое. Режимы:
+"pca"      — главные направления корпуса: x -> x · componentsᵀ. Базис берётся
+             из нецентрированной матрицы вторых моментов: скалярные произведения
+             (а скоринг — это именно они) сохраняются лучше всего, а центрирование
+             сдвигает начало координат и искажает косинусы;
+"truncate" — первые dim координат; имеет смысл только для моделей, обученных
+             с Matryoshka-потерей (для all-MiniLM-L6-v2 точность заметно хуже PCA).
+После проекции вектор снова L2-нормализуется. В attributes.embeddings
+typeName получает суффикс "+pca128" / "+truncate128", а size — новую размерность,
+так что клиент не смешает векторы разных пространств.
+
+Потеря точности — recall@K и корреляция Спирмена соседей по сравнению с полными
+векторами (quantization.neighbour_agreement).
+
+Запуск: python reduction.py articles.json [--dims 64,128,192] [--k 10]
+"""
+import argparse
+import json
+
+import numpy as np
+
+from related import _unit
+
+REDUCTION_METHODS = ("pca", "truncate")
+DEFAULT_DIM = 128
+DEFAULT_DIMS = (64, 128, 192)
+# Компоненты считаются по подвыборке: ковариация 384×384 на ней уже устойчива
+DEFAULT_MAX_FIT = 100_000
+DEFAULT_EVAL_SIZE = 5000
+
+
+class Reducer:
+    """
+    Проекция в dim измерений с последующей нормализацией.
+
+        reducer = Reducer("pca", 128).fit(matrix)
+        reduced = reducer.transform(matrix)     # (N, 128), единичные строки
+    """
+
+    def __init__(self, method: str = "pca", dim: int = DEFAULT_DIM, components: np.ndarray = None):
+        if method not in REDUCTION_METHODS:
+            raise ValueError(f"Неизвестный метод понижения размерности: {method!r}, "
+                             f"ожидается один из {REDUCTION_METHODS}")
+        self.method = method
+        self.dim = dim
+        self.components = None if components is None else np.asarray(components, dtype=np.float32)
+        self.explained_variance = None
+
+    def fit(self, matrix: np.ndarray, max_fit: int = DEFAULT_MAX_FIT, seed: int = 0) -> "Reducer":
+        """Считает главные направления единичных векторов корпуса (нужно только для pca)."""
+        unit = _unit(matrix)
+        if self.dim > unit.shape[1]:
+            raise ValueError(f"Размерность {self.dim} больше исходной {unit.shape[1]}")
+        if self.method != "pca":
+            return self
+        if len(unit) > max_fit:
+            rng = np.random.default_rng(seed)
+            unit = unit[np.sort(rng.choice(len(unit), max_fit, replace=False))]
+        unit = unit.astype(np.float64)
+        # Собственные векторы матрицы моментов dim×dim вместо SVD всей матрицы N×dim
+        eigenvalues, eigenvectors = np.linalg.eigh(unit.T @ unit)
+        order = np.argsort(eigenvalues)[::-1]
+        eigenvalues = np.maximum(eigenvalues[order], 0)
+        self.components = eigenvectors[:, order[:self.dim]].T.astype(np.float32)
+        total = eigenvalues.sum()
+        self.explained_variance = float(eigenvalues[:self.dim].sum() / total) if total else 1.0
+        return self
+
+    def transform(self, matrix: np.ndarray) -> np.ndarray:
+        """Проекция матрицы (N, dim) или одного вектора; результат L2-нормализован."""
+        unit = _unit(matrix)
+        if self.method == "truncate":
+            return _unit(unit[..., :self.dim])
+        if self.components is None:
+            raise ValueError("pca требует обучения: вызовите fit()")
+        return _unit(unit @ self.components.T)
+
+    def type_name(self, type_name: str) -> str:
+        """typeName эмбеддингов в новом пространстве: "<модель>+pca128"."""
+        return f"{type_name}+{self.method}{self.dim}"
+
+    def to_json(self) -> dict:
+        return {
+            "method": self.method,
+            "dim": self.dim,
+            "components": None if self.components is None else self.components.tolist(),
+            "explainedVariance": self.explained_variance,
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "Reducer":
+        reducer = cls(obj["method"], obj["dim"], obj.get("components"))
+        reducer.explained_variance = obj.get("explainedVariance")
+        return reducer
+
+
+def load_reducer(path: str) -> Reducer:
+    """Проекция, сохранённая with_reduction (--reduce-output)."""
+    with open(path, encoding="utf-8") as f:
+        return Reducer.from_json(json.load(f))
+
+
+def evaluate_reduction(matrix: np.ndarray, reducer: Reducer, k: int = 10,
+                       eval_size: int = DEFAULT_EVAL_SIZE, seed: int = 0) -> dict:
+    """
+    Точность соседей после проекции относительно полных векторов. На корпусе
+    больше eval_size векторов соседи ищутся внутри случайной подвыборки.
+    """
+    from quantization import neighbour_agreement
+
+    unit = _unit(matrix)
+    if len(unit) > eval_size:
+        rng = np.random.default_rng(seed)
+        unit = unit[np.sort(rng.choice(len(unit), eval_size, replace=False))]
+    report = neighbour_agreement(unit, reducer.transform(unit), k)
+    report.update({
+        "method": reducer.method,
+        "dim": reducer.dim,
+        "source_dim": int(matrix.shape[1]),
+        "speedup": matrix.shape[1] / reducer.dim,
+        "explained_variance": reducer.explained_variance,
+    })
+    return report
+
+
+def format_report(reports: list) -> str:
+    lines = []
+    for r in reports:
+        variance = (f", сохранённая энергия {r['explained_variance']:.1%}"
+                    if r.get("explained_variance") is not None else "")
+        lines.append(
+            f"{r['method']:>8} {r['source_dim']} -> {r['dim']:<4} recall@{r['k']} = {r['recall']:.4f}, "
+            f"Spearman = {r['spearman']:.4f}, скалярное произведение в {r['speedup']:.1f}× дешевле"
+            f"{variance}"
+        )
+    return "\n".join(lines)
+
+
+def with_reduction(items, reducer: Reducer, path: str = None, report: dict = None,
+                   k: int = 10, seed: int = 0):
+    """
+    Пропускает элементы фида, заменяя эмбеддинги upsert'ов их проекцией в той же
+    кодировке (attributes.embeddings.encoding; i8-base64 — с масштабом на вектор).
+    PCA обучается на последних неудалённых версиях статей, если reducer не загружен
+    готовым (load_reducer) — тогда базис берётся как есть. Проекция (components)
+    пишется в path, отчёт evaluate_reduction — в report (если переданы).
+    """
+    from generate_test_data import encode_embedding
+    from related import spool_items
+
+    spool, ids, live, matrix = spool_items(items)
+    reduced = np.empty((0, reducer.dim), dtype=np.float32)
+    if ids:
+        # Если к концу потока удалено всё, обучаемся на всех версиях
+        fit_matrix = matrix[live] if np.any(live) else matrix
+        if reducer.components is None:
+            reducer.fit(fit_matrix, seed=seed)
+        elif reducer.components.shape[1] != matrix.shape[1]:
+            raise ValueError(f"Проекция рассчитана на размерность {reducer.components.shape[1]}, "
+                             f"а у эмбеддингов {matrix.shape[1]}")
+        reduced = reducer.transform(matrix)
+        if report is not None:
+            report.update(evaluate_reduction(fit_matrix, reducer, k, seed=seed))
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(reducer.to_json(), f)
+    del matrix
+
+    row = 0
+    for line in spool:
+        item = json.loads(line)
+        if item["action"] == "upsert":
+            original = item["attributes"]["embeddings"]
+            embeddings = encode_embedding(reduced[row], original.get("encoding", "list"))
+            embeddings["typeName"] = reducer.type_name(original["typeName"])
+            item["attributes"]["embeddings"] = embeddings
+            row += 1
+        yield item
+    spool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Оценка понижения размерности эмбеддингов корпуса")
+    parser.add_argument("input", help="articles.json, сгенерированный generate_test_data.py")
+    parser.add_argument("--dims", default=",".join(map(str, DEFAULT_DIMS)),
+                        help="целевые размерности через запятую")
+    parser.add_argument("--methods", default=",".join(REDUCTION_METHODS),
+                        help="методы через запятую: pca, truncate")
+    parser.add_argument("--k", type=int, default=10, help="число соседей для recall@K")
+    parser.add_argument("--eval-size", type=int, default=DEFAULT_EVAL_SIZE,
+                        help="размер подвыборки для оценки соседей")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    args = parser.parse_args()
+
+    from quantization import load_embeddings
+
+    matrix = load_embeddings(args.input)
+    reports = [
+        evaluate_reduction(matrix, Reducer(method, int(dim)).fit(matrix), args.k, args.eval_size)
+        for method in args.methods.split(",")
+        for dim in args.dims.split(",")
+    ]
+    print(json.dumps(reports, indent=2) if args.json else format_report(reports))
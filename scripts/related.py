@@ -0,0 +1,180 @@
+"""
+Офлайн-таблица похожих статей: точный top-K по косинусу.
+
+На устройстве RecommenderImpl для каждой статьи перебирает все ArticleEmbedding
+(O(N) на статью, O(N²) на весь пересчёт). Здесь та же выборка делается заранее:
+матрица единичных эмбеддингов умножается сама на себя блоками
+block_rows × block_cols, и из каждого блока в бегущий top-K строки попадают
+только лучшие кандидаты, так что память ограничена размером блока, а не N².
+
+Для каждой статьи считаются два списка, как в RecommenderImpl:
+related — k ближайших статей (кроме самой статьи);
+cold    — cold_k «холодных» кандидатов, ближайших к противоположному вектору,
+          то есть с наименьшим косинусом (score — косинус с самой статьёй).
+Списки кладутся в attributes.related / attributes.cold элемента фида.
+"""
+import json
+import tempfile
+
+import numpy as np
+
+DEFAULT_K = 10
+DEFAULT_COLD_K = 4
+DEFAULT_BLOCK_ROWS = 512
+DEFAULT_BLOCK_COLS = 16384
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-нормализация float32 по последней оси (матрица или один вектор); нулевой
+    вектор остаётся нулевым, как в EmbeddingIndex.normalize. Общая для всех модулей,
+    работающих с эмбеддингами корпуса.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=-1, keepdims=True), 1e-12)
+
+
+def _merge(best_scores: np.ndarray, best_idx: np.ndarray, scores: np.ndarray,
+           offset: int, k: int) -> tuple:
+    """Сливает бегущий top-k строк с top-k блока scores (столбцы со смещением offset)."""
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+    idx = np.concatenate([best_idx, part + offset], axis=1)
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        idx = np.take_along_axis(idx, keep, axis=1)
+    return scores, idx
+
+
+def _sorted(scores: np.ndarray, idx: np.ndarray) -> tuple:
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(idx, order, axis=1)
+
+
+def top_k_neighbours(matrix: np.ndarray, k: int = DEFAULT_K, cold_k: int = DEFAULT_COLD_K,
+                     live: np.ndarray = None, block_rows: int = DEFAULT_BLOCK_ROWS,
+                     block_cols: int = DEFAULT_BLOCK_COLS) -> tuple:
+    """
+    Точные соседи каждой строки matrix по косинусу.
+    live — булева маска строк, которые могут быть кандидатами (None — все).
+    Возвращает (related_scores, related_idx, cold_scores, cold_idx): массивы
+    (N, k) и (N, cold_k); related — по убыванию косинуса, cold — по возрастанию.
+    Если кандидатов меньше k, лишние позиции имеют score ∓inf.
+    Память — O(block_rows × block_cols) на блок произведения.
+    """
+    unit = _unit(matrix)
+    n = len(unit)
+    dead = np.flatnonzero(~live) if live is not None else np.empty(0, dtype=np.int64)
+    related_scores = np.empty((n, k), dtype=np.float32)
+    related_idx = np.empty((n, k), dtype=np.int64)
+    cold_scores = np.empty((n, cold_k), dtype=np.float32)
+    cold_idx = np.empty((n, cold_k), dtype=np.int64)
+
+    for r0 in range(0, n, block_rows):
+        r1 = min(r0 + block_rows, n)
+        rows = r1 - r0
+        best = (np.full((rows, 0), -np.inf, np.float32), np.empty((rows, 0), np.int64))
+        # Холодные ищем как top по -cos, т. е. ближайшие к противоположному вектору
+        coldest = (np.full((rows, 0), -np.inf, np.float32), np.empty((rows, 0), np.int64))
+        for c0 in range(0, n, block_cols):
+            c1 = min(c0 + block_cols, n)
+            sims = unit[r0:r1] @ unit[c0:c1].T
+            own = np.arange(max(r0, c0), min(r1, c1))
+            sims[own - r0, own - c0] = -np.inf
+            block_dead = dead[(dead >= c0) & (dead < c1)] - c0
+            sims[:, block_dead] = -np.inf
+            if k:
+                best = _merge(*best, sims, c0, k)
+            if cold_k:
+                np.negative(sims, out=sims)
+                sims[own - r0, own - c0] = -np.inf
+                sims[:, block_dead] = -np.inf
+                coldest = _merge(*coldest, sims, c0, cold_k)
+        if k:
+            scores, idx = _sorted(*best)
+            related_scores[r0:r1, :scores.shape[1]] = scores
+            related_idx[r0:r1, :idx.shape[1]] = idx
+            related_scores[r0:r1, scores.shape[1]:] = -np.inf
+            related_idx[r0:r1, idx.shape[1]:] = -1
+        if cold_k:
+            scores, idx = _sorted(*coldest)
+            cold_scores[r0:r1, :scores.shape[1]] = -scores
+            cold_idx[r0:r1, :idx.shape[1]] = idx
+            cold_scores[r0:r1, scores.shape[1]:] = np.inf
+            cold_idx[r0:r1, idx.shape[1]:] = -1
+    return related_scores, related_idx, cold_scores, cold_idx
+
+
+def _neighbour_list(scores: np.ndarray, idx: np.ndarray, ids: list) -> list:
+    return [
+        {"id": ids[j], "score": round(float(s), 4)}
+        for s, j in zip(scores, idx)
+        if j >= 0 and np.isfinite(s)
+    ]
+
+
+def spool_items(items) -> tuple:
+    """
+    Сбрасывает поток элементов во временный NDJSON-файл, а эмбеддинги upsert'ов —
+    в матрицу float32. Возвращает (spool, ids, live, matrix): spool перемотан
+    на начало; ids и matrix — по строке на upsert в порядке потока; live — маска
+    последних версий статей, не удалённых к концу потока. В памяти держатся
+    только id и сама матрица.
+    """
+    from generate_test_data import decode_embedding
+
+    spool = tempfile.TemporaryFile()
+    ids = []
+    live = []
+    latest = {}
+    dim = 0
+    with tempfile.TemporaryFile() as vectors:
+        for item in items:
+            line = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            spool.write(line)
+            spool.write(b"\n")
+            previous = latest.pop(item["id"], None)
+            if previous is not None:
+                live[previous] = False
+            if item["action"] != "upsert":
+                continue
+            emb = decode_embedding(item["attributes"]["embeddings"])
+            dim = len(emb)
+            vectors.write(np.asarray(emb, dtype=np.float32).tobytes())
+            latest[item["id"]] = len(ids)
+            ids.append(item["id"])
+            live.append(True)
+        vectors.seek(0)
+        matrix = np.fromfile(vectors, dtype=np.float32).reshape(len(ids), dim)
+    spool.seek(0)
+    return spool, ids, np.asarray(live, dtype=bool), matrix
+
+
+def with_related(items, k: int = DEFAULT_K, cold_k: int = DEFAULT_COLD_K,
+                 block_rows: int = DEFAULT_BLOCK_ROWS, block_cols: int = DEFAULT_BLOCK_COLS):
+    """
+    Пропускает элементы фида, дописывая в attributes upsert'ов списки related и cold.
+    Элементы сначала сбрасываются на диск (spool_items), затем считается таблица
+    соседей, и элементы выдаются в исходном порядке. Кандидаты — последние
+    версии статей, не удалённые к концу потока.
+    """
+    spool, ids, live, matrix = spool_items(items)
+    if ids:
+        related_scores, related_idx, cold_scores, cold_idx = top_k_neighbours(
+            matrix, min(k, len(ids)), min(cold_k, len(ids)), live, block_rows, block_cols
+        )
+    del matrix
+
+    row = 0
+    for line in spool:
+        item = json.loads(line)
+        if item["action"] == "upsert":
+            item["attributes"]["related"] = _neighbour_list(related_scores[row], related_idx[row], ids)
+            item["attributes"]["cold"] = _neighbour_list(cold_scores[row], cold_idx[row], ids)
+            row += 1
+        yield item
+    spool.close()
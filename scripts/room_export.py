@@ -0,0 +1,168 @@
+"""
+Готовая SQLite-база Room для первого запуска (Room.createFromAsset).
+
+Сейчас при первом запуске приложение скачивает articles.json, разбирает его
+Gson'ом и вставляет элементы по одному через insertContentUpdateWithDetails,
+нормализуя каждый эмбеддинг. RoomDbWriter пишет то же состояние заранее:
+схема создаётся из экспортированной Room-схемы AppDatabase
+(core/core-database/schemas/.../<версия>.json) вместе с room_master_table и
+PRAGMA user_version, так что Room принимает файл без миграций.
+
+Повторяется семантика ContentItemRepositoryImpl.syncContent:
+- content — INSERT OR REPLACE (delete-элементы тоже сохраняются строкой с action=delete);
+- article_attributes.unitEmbedding — L2-нормализованный вектор, little-endian float32
+  (байтовый формат Converter.fromFloatArray);
+- content_tags — то, что заполнил бы триггер trg_update_tags_after_insert;
+- updates_meta.lastSyncAt — наибольший updatedAt, чтобы первый синк запросил
+  только более новые элементы.
+updatedAt переводится в миллисекунды эпохи по UTC.
+
+Вставки идут пачками executemany внутри одной транзакции.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+
+SCHEMA_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..",
+    "core", "core-database", "schemas", "com.core.database.AppDatabase",
+)
+DEFAULT_BATCH_SIZE = 1000
+
+
+def latest_schema_path(schema_dir: str = SCHEMA_DIR) -> str:
+    """Путь к экспортированной схеме последней версии базы."""
+    versions = [int(name[:-5]) for name in os.listdir(schema_dir)
+                if name.endswith(".json") and name[:-5].isdigit()]
+    if not versions:
+        raise FileNotFoundError(f"Нет экспортированных схем Room в {schema_dir}")
+    return os.path.join(schema_dir, f"{max(versions)}.json")
+
+
+def create_schema(conn: sqlite3.Connection, schema: dict) -> None:
+    """Создаёт таблицы, индексы и room_master_table по экспортированной Room-схеме."""
+    database = schema["database"]
+    for entity in database["entities"]:
+        table = entity["tableName"]
+        conn.execute(entity["createSql"].replace("${TABLE_NAME}", table))
+        for index in entity.get("indices", []):
+            conn.execute(index["createSql"].replace("${TABLE_NAME}", table))
+    for view in database.get("views", []):
+        conn.execute(view["createSql"].replace("${VIEW_NAME}", view["viewName"]))
+    for query in database.get("setupQueries", []):
+        conn.execute(query)
+    conn.execute(f"PRAGMA user_version = {int(database['version'])}")
+
+
+def iso_to_epoch_ms(value: str) -> int:
+    """ISO 8601 (Z, смещение или без зоны — UTC) -> миллисекунды эпохи."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def unit_embedding_blob(embeddings: dict) -> bytes:
+    """unitEmbedding в байтах Converter.fromFloatArray: нормализованный float32 little-endian."""
+    from generate_test_data import decode_embedding
+
+    vector = decode_embedding(embeddings)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector = vector / norm
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+class RoomDbWriter:
+    """
+    Принимает элементы фида в порядке выдачи и пишет их в SQLite-файл path.
+    База собирается во временном файле и переименовывается в finish(),
+    так что недописанный файл никогда не окажется на месте ассета.
+    """
+
+    def __init__(self, path: str, schema_path: str = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.tmp_path = path + ".tmp"
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        with open(schema_path or latest_schema_path(), encoding="utf-8") as f:
+            schema = json.load(f)
+        self.conn = sqlite3.connect(self.tmp_path, isolation_level=None)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("BEGIN")
+        create_schema(self.conn, schema)
+        self._batch = {}
+        self.count = 0
+        self.last_sync_at = None
+
+    def add(self, item: dict) -> None:
+        # В пачке важна только последняя версия id: REPLACE в базе даёт то же состояние
+        self._batch.pop(item["id"], None)
+        self._batch[item["id"]] = item
+        if self.last_sync_at is None or item["updatedAt"] > self.last_sync_at:
+            self.last_sync_at = item["updatedAt"]
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        items = list(self._batch.values())
+        self._batch = {}
+        # REPLACE каскадно удаляет старые article_attributes и content_tags этого id
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO content (id, type, action, updatedAt, mainImageUrl, tags) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (item["id"], item["type"], item["action"], iso_to_epoch_ms(item["updatedAt"]),
+                 item["mainImageUrl"], json.dumps(item["tags"], ensure_ascii=False))
+                for item in items
+            ],
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO article_attributes "
+            "(contentId, title, content, shortDescription, unitEmbedding) VALUES (?, ?, ?, ?, ?)",
+            [
+                (item["id"], attrs["title"], attrs["content"], attrs["shortDescription"],
+                 unit_embedding_blob(attrs["embeddings"]))
+                for item in items
+                if (attrs := item.get("attributes")) and item["type"] == "article"
+            ],
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO content_tags (contentId, tagName) VALUES (?, ?)",
+            [(item["id"], tag) for item in items for tag in dict.fromkeys(item["tags"])],
+        )
+
+    def finish(self) -> dict:
+        """Дописывает последнюю пачку и updates_meta, фиксирует транзакцию и публикует файл."""
+        self._flush()
+        if self.last_sync_at is not None:
+            self.conn.execute("INSERT OR REPLACE INTO updates_meta (id, lastSyncAt) VALUES (1, ?)",
+                              (self.last_sync_at,))
+        self.conn.execute("COMMIT")
+        stats = {
+            "items": self.count,
+            "content": self.conn.execute("SELECT COUNT(*) FROM content").fetchone()[0],
+            "articles": self.conn.execute("SELECT COUNT(*) FROM article_attributes").fetchone()[0],
+            "lastSyncAt": self.last_sync_at,
+        }
+        self.conn.execute("VACUUM")
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+        stats["bytes"] = os.path.getsize(self.path)
+        return stats
+
+
+def tee_room_db(items, writer: RoomDbWriter):
+    """Пропускает элементы дальше, попутно отдавая их в RoomDbWriter."""
+    for item in items:
+        writer.add(item)
+        yield item
@@ -0,0 +1,808 @@
+"""
+Встроенный набор тестовых статей: используется generate_test_data.py,
+если входной корпус не указан (--input).
+"""
+from datetime import datetime
+
+SAMPLE_ARTICLES = [
+    {
+        "title": "AI Revolution in Healthcare",
+        "short_description": "How artificial intelligence is transforming medical diagnostics.",
+        "content": """# AI Revolution in Healthcare
+
+Artificial intelligence is rapidly changing how doctors diagnose and treat diseases. Machine learning algorithms can now detect cancer in medical images with accuracy matching experienced radiologists.
+
+## Key Applications
+- **Early Detection**: AI identifies patterns in X-rays and MRIs that humans might miss
+- **Drug Discovery**: Algorithms accelerate the development of new medications
+- **Personalized Treatment**: AI analyzes patient data to customize therapy plans
+
+## Challenges Ahead
+Despite promising results, AI in healthcare faces regulatory hurdles and data privacy concerns. Medical professionals emphasize that AI should augment, not replace, human expertise.
+
+The future looks bright as hospitals worldwide adopt these technologies, potentially saving millions of lives through earlier and more accurate diagnoses.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology", "health"],
+        "updated_at": datetime(2024, 6, 1, 9, 15)
+    },
+    {
+        "title": "Blockchain Beyond Bitcoin",
+        "short_description": "Exploring blockchain applications in various industries.",
+        "content": """# Blockchain Beyond Bitcoin
+
+While cryptocurrency grabbed headlines, blockchain technology's real potential extends far beyond digital money. This distributed ledger system is revolutionizing multiple sectors.
+
+## Real-World Applications
+- **Supply Chain**: Tracking products from manufacture to delivery
+- **Healthcare**: Securing patient records and ensuring data integrity
+- **Real Estate**: Streamlining property transactions and reducing fraud
+
+## How It Works
+Blockchain creates an immutable record of transactions, verified by multiple parties. This transparency builds trust without centralized authorities.
+
+Companies like IBM and Microsoft are investing billions in blockchain solutions. As the technology matures, expect to see it powering everything from voting systems to digital identities.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology", "finance"],
+        "updated_at": datetime(2024, 5, 28, 14, 30)
+    },
+    {
+        "title": "The Power of Compound Interest",
+        "short_description": "Understanding the eighth wonder of the world.",
+        "content": """# The Power of Compound Interest
+
+Albert Einstein allegedly called compound interest "the eighth wonder of the world." Whether he said it or not, the principle remains one of the most powerful forces in finance.
+
+## The Magic Formula
+Compound interest means earning returns on your returns. A $1,000 investment at 7% annual return becomes:
+- Year 1: $1,070
+- Year 10: $1,967
+- Year 30: $7,612
+
+## Starting Early Matters
+The key is time. Someone who invests $200 monthly starting at 25 will have more at retirement than someone investing $400 monthly starting at 35.
+
+## Practical Tips
+- Maximize employer 401(k) matches
+- Reinvest dividends automatically
+- Consider low-cost index funds
+
+Small, consistent investments today can create significant wealth tomorrow.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance"],
+        "updated_at": datetime(2024, 5, 25, 11, 0)
+    },
+    {
+        "title": "Mental Health in the Digital Age",
+        "short_description": "Navigating wellness in a connected world.",
+        "content": """# Mental Health in the Digital Age
+
+Social media and constant connectivity have created new mental health challenges. Understanding these impacts is crucial for maintaining psychological wellbeing.
+
+## Digital Stressors
+- **Information Overload**: Constant news updates trigger anxiety
+- **Social Comparison**: Curated online lives fuel inadequacy feelings
+- **Sleep Disruption**: Blue light affects natural sleep cycles
+
+## Healthy Strategies
+1. Set device boundaries - no phones during meals
+2. Practice digital detoxes - weekend breaks from social media
+3. Use wellness apps mindfully - meditation and breathing exercises
+
+## Finding Balance
+Technology isn't inherently harmful. Video calls connect distant families, apps provide therapy access, and online communities offer support. The key is intentional, balanced use.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health", "technology"],
+        "updated_at": datetime(2024, 5, 22, 16, 45)
+    },
+    {
+        "title": "The Future of Online Learning",
+        "short_description": "How digital platforms are reshaping education.",
+        "content": """# The Future of Online Learning
+
+Education is undergoing a digital transformation. Online learning platforms are making quality education accessible to millions worldwide, breaking down traditional barriers.
+
+## Key Advantages
+- **Flexibility**: Learn at your own pace, anywhere
+- **Affordability**: Often cheaper than traditional programs
+- **Variety**: Access courses from global institutions
+
+## Emerging Trends
+Virtual reality classrooms, AI tutors, and gamified learning are enhancing engagement. Micro-credentials and digital badges are gaining employer recognition.
+
+## Challenges to Address
+- Maintaining student motivation
+- Ensuring academic integrity
+- Building virtual communities
+
+As technology advances, hybrid models combining online and in-person elements may become the norm, offering the best of both worlds.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["education", "technology"],
+        "updated_at": datetime(2024, 5, 20, 13, 30)
+    },
+    {
+        "title": "Sustainable Investing 101",
+        "short_description": "Aligning your portfolio with your values.",
+        "content": """# Sustainable Investing 101
+
+Environmental, Social, and Governance (ESG) investing is no longer a niche strategy. Investors increasingly seek returns while supporting positive change.
+
+## What is ESG?
+- **Environmental**: Climate action, renewable energy
+- **Social**: Fair labor practices, community development
+- **Governance**: Ethical leadership, transparency
+
+## Performance Myths Debunked
+Studies show ESG funds often match or outperform traditional investments. Companies with strong sustainability practices tend to be better managed overall.
+
+## Getting Started
+1. Research ESG ratings of funds
+2. Consider impact investing options
+3. Look for green bonds
+4. Avoid "greenwashing" - verify claims
+
+Your investments can generate returns while funding the transition to a sustainable economy.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance", "environment"],
+        "updated_at": datetime(2024, 5, 18, 10, 15)
+    },
+    {
+        "title": "Urban Farming Revolution",
+        "short_description": "Growing food in the heart of the city.",
+        "content": """# Urban Farming Revolution
+
+Cities worldwide are transforming rooftops, vacant lots, and even underground spaces into productive farms. This movement addresses food security while reducing environmental impact.
+
+## Innovative Techniques
+- **Vertical Farming**: Stack crops in towers to maximize space
+- **Hydroponics**: Grow plants without soil using nutrient solutions
+- **Aquaponics**: Combine fish farming with vegetable production
+
+## Benefits
+Urban farms reduce transportation emissions, provide fresh produce to food deserts, and create green jobs. They also help cities manage stormwater and reduce heat island effects.
+
+## Join the Movement
+Start small with balcony gardens or community plots. Many cities offer grants and training for aspiring urban farmers. Every green space counts in building sustainable cities.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["environment"],
+        "updated_at": datetime(2024, 5, 15, 8, 0)
+    },
+    {
+        "title": "Personalized Medicine Breakthrough",
+        "short_description": "How genetics is revolutionizing treatment.",
+        "content": """# Personalized Medicine Breakthrough
+
+Gone are the days of one-size-fits-all healthcare. Personalized medicine uses genetic information to tailor treatments to individual patients, improving outcomes and reducing side effects.
+
+## How It Works
+Doctors analyze your DNA to:
+- Predict disease risk
+- Choose optimal medications
+- Determine correct dosages
+- Identify potential drug interactions
+
+## Real Success Stories
+Cancer patients now receive targeted therapies based on tumor genetics. Pharmacogenomics helps doctors prescribe antidepressants that work best for each patient's genetic makeup.
+
+## The Road Ahead
+Costs are dropping rapidly. What once cost millions now costs hundreds. Soon, genetic testing may be as routine as blood pressure checks, ushering in an era of truly personalized healthcare.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health"],
+        "updated_at": datetime(2024, 5, 12, 15, 20)
+    },
+    {
+        "title": "Cybersecurity for Small Business",
+        "short_description": "Essential protection strategies for limited budgets.",
+        "content": """# Cybersecurity for Small Business
+
+Small businesses are prime targets for cybercriminals, yet many lack adequate protection. Here's how to secure your business without breaking the bank.
+
+## Critical Steps
+1. **Regular Updates**: Keep all software patched
+2. **Strong Passwords**: Use password managers and two-factor authentication
+3. **Employee Training**: Most breaches involve human error
+4. **Data Backups**: Follow the 3-2-1 rule (3 copies, 2 different media, 1 offsite)
+
+## Affordable Tools
+- Free antivirus for small teams
+- Cloud-based security services
+- Open-source firewalls
+
+## Incident Response
+Have a plan before disaster strikes. Know who to call, how to isolate affected systems, and what to tell customers. Preparation can mean the difference between a minor incident and business closure.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology", "finance"],
+        "updated_at": datetime(2024, 5, 10, 11, 45)
+    },
+    {
+        "title": "Climate Change and Your Health",
+        "short_description": "Understanding the health impacts of a warming planet.",
+        "content": """# Climate Change and Your Health
+
+Climate change isn't just an environmental issue—it's a public health emergency. Rising temperatures and extreme weather directly affect human health in multiple ways.
+
+## Direct Impacts
+- **Heat Stress**: More frequent heatwaves increase cardiovascular strain
+- **Air Quality**: Wildfire smoke and pollution worsen respiratory conditions
+- **Disease Spread**: Warmer climates expand mosquito-borne illness ranges
+
+## Vulnerable Populations
+Children, elderly, and those with chronic conditions face highest risks. Low-income communities often lack resources to adapt.
+
+## Protective Actions
+- Stay hydrated during heat events
+- Monitor air quality alerts
+- Support clean energy initiatives
+- Prepare emergency kits for extreme weather
+
+Individual and collective action can help mitigate these growing health threats.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health", "environment"],
+        "updated_at": datetime(2024, 5, 8, 9, 30)
+    },
+    {
+        "title": "Gamification in Education",
+        "short_description": "Making learning fun and engaging through game mechanics.",
+        "content": """# Gamification in Education
+
+Educational games aren't just for kids anymore. Gamification—applying game design elements to learning—is transforming how people of all ages acquire new skills.
+
+## Core Elements
+- **Points and Badges**: Reward progress and achievements
+- **Leaderboards**: Foster healthy competition
+- **Quests**: Break learning into manageable missions
+- **Immediate Feedback**: Know instantly if you're on track
+
+## Success Stories
+Language apps like Duolingo keep millions engaged through streaks and levels. Coding platforms use puzzle-solving to teach programming concepts. Even medical schools use simulations for surgical training.
+
+## Implementation Tips
+Start small—add progress bars or achievement certificates. Focus on intrinsic motivation, not just external rewards. The goal is sustained engagement, not just temporary excitement.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["education"],
+        "updated_at": datetime(2024, 5, 5, 14, 15)
+    },
+    {
+        "title": "Renewable Energy Investing",
+        "short_description": "Opportunities in the clean energy transition.",
+        "content": """# Renewable Energy Investing
+
+The renewable energy sector is experiencing explosive growth. Smart investors are positioning themselves to benefit from the inevitable transition away from fossil fuels.
+
+## Investment Options
+- **Solar and Wind Stocks**: Companies manufacturing and installing systems
+- **Energy Storage**: Battery technology is crucial for renewable adoption
+- **Green ETFs**: Diversified exposure to the clean energy sector
+- **Yieldcos**: Companies that own operating renewable assets
+
+## Market Drivers
+Government incentives, falling technology costs, and corporate sustainability commitments are accelerating adoption. The sector is moving from alternative to mainstream.
+
+## Risk Considerations
+Policy changes, technology disruption, and competition affect returns. Diversification across technologies and geographies helps manage risk while capturing growth potential.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance", "environment"],
+        "updated_at": datetime(2024, 5, 2, 10, 45)
+    },
+    {
+        "title": "Sleep Science Breakthroughs",
+        "short_description": "Latest discoveries in understanding and improving sleep.",
+        "content": """# Sleep Science Breakthroughs
+
+Recent research is revolutionizing our understanding of sleep. New findings reveal why quality rest is even more critical than previously thought.
+
+## Key Discoveries
+- **Brain Cleaning**: Sleep triggers a washing system that clears toxic proteins
+- **Memory Consolidation**: Different sleep stages serve specific learning functions
+- **Immune Function**: Poor sleep weakens vaccine effectiveness
+
+## Optimization Strategies
+1. **Temperature**: Cool rooms (65-68°F) promote deeper sleep
+2. **Consistency**: Regular sleep schedules sync circadian rhythms
+3. **Light Exposure**: Morning sunlight, evening dimness
+
+## Technology Helpers
+Smart mattresses adjust firmness, sleep apps track patterns, and white noise machines mask disruptions. Use technology wisely—avoid screens before bed.
+
+Prioritizing sleep isn't lazy—it's a performance enhancer.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health"],
+        "updated_at": datetime(2024, 4, 30, 7, 0)
+    },
+    {
+        "title": "Quantum Computing Explained",
+        "short_description": "Understanding the next computing revolution.",
+        "content": """# Quantum Computing Explained
+
+Quantum computers promise to solve problems that would take classical computers millions of years. But how do they work, and what can they actually do?
+
+## The Quantum Difference
+Traditional computers use bits (0 or 1). Quantum computers use qubits that can be both simultaneously through "superposition." This parallel processing enables exponential speedups for certain problems.
+
+## Practical Applications
+- **Drug Discovery**: Simulate molecular interactions
+- **Cryptography**: Break current encryption, create quantum-safe alternatives
+- **Finance**: Optimize portfolios and detect fraud
+- **Climate Modeling**: Process vast environmental datasets
+
+## Current Limitations
+Quantum computers need near-absolute zero temperatures and are prone to errors. They won't replace traditional computers but will complement them for specific tasks.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology"],
+        "updated_at": datetime(2024, 4, 28, 13, 20)
+    },
+    {
+        "title": "Financial Literacy for Teens",
+        "short_description": "Essential money skills for the next generation.",
+        "content": """# Financial Literacy for Teens
+
+Teaching teenagers about money management sets them up for lifelong financial success. Yet many schools still don't cover these crucial life skills.
+
+## Core Concepts
+- **Budgeting**: Track income and expenses using apps
+- **Saving**: Pay yourself first—even $20/month matters
+- **Credit**: Understand how credit scores work before getting that first card
+- **Investing**: Start with basic index funds
+
+## Real-World Practice
+Give teens hands-on experience:
+- Let them manage a clothing budget
+- Open a joint checking account
+- Match their savings contributions
+- Discuss family financial decisions
+
+## Resources
+Many banks offer teen accounts with parental controls. Investment apps allow fractional share purchases. Online courses gamify financial concepts.
+
+Starting early creates habits that compound over a lifetime.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance", "education"],
+        "updated_at": datetime(2024, 4, 25, 16, 0)
+    },
+    {
+        "title": "Ocean Plastic Solutions",
+        "short_description": "Innovative approaches to marine pollution.",
+        "content": """# Ocean Plastic Solutions
+
+Eight million tons of plastic enter our oceans yearly. While the problem seems overwhelming, innovative solutions are emerging from unexpected places.
+
+## Cleanup Technologies
+- **Ocean Cleanup Arrays**: Passive systems that use currents to collect debris
+- **Drone Swarms**: AI-powered drones identify and retrieve plastic
+- **Bioplastics**: Materials that safely biodegrade in marine environments
+
+## Prevention Strategies
+- Circular economy models
+- Improved waste management in coastal areas
+- Alternative packaging materials
+
+## Individual Actions
+Choose reusable products, support ocean-friendly brands, participate in beach cleanups, and reduce single-use plastics. Small actions multiply when millions participate.
+
+The tide is turning as governments, businesses, and individuals unite against ocean plastic.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["environment"],
+        "updated_at": datetime(2024, 4, 22, 11, 30)
+    },
+    {
+        "title": "AI in Education",
+        "short_description": "How artificial intelligence personalizes learning.",
+        "content": """# AI in Education
+
+Artificial intelligence is creating truly personalized learning experiences. AI tutors adapt to each student's pace, identifying knowledge gaps and adjusting instruction accordingly.
+
+## Current Applications
+- **Adaptive Learning**: Platforms adjust difficulty based on performance
+- **Automated Grading**: AI evaluates essays and provides feedback
+- **Predictive Analytics**: Identify at-risk students before they fall behind
+- **Language Learning**: AI conversation partners available 24/7
+
+## Benefits
+Students learn at their own pace, teachers focus on mentoring rather than repetitive tasks, and education becomes accessible to remote areas.
+
+## Ethical Considerations
+Privacy, bias in algorithms, and maintaining human connection remain challenges. The goal is AI-enhanced, not AI-replaced, education.
+
+The future classroom will blend human creativity with AI efficiency.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["education", "technology"],
+        "updated_at": datetime(2024, 4, 20, 14, 45)
+    },
+    {
+        "title": "Green Building Revolution",
+        "short_description": "Sustainable architecture for a better future.",
+        "content": """# Green Building Revolution
+
+Buildings consume 40% of global energy. Green architecture is transforming how we design, construct, and operate structures to minimize environmental impact.
+
+## Key Features
+- **Passive Design**: Orientation and materials that naturally regulate temperature
+- **Renewable Energy**: Solar panels, geothermal systems
+- **Water Conservation**: Rainwater harvesting, greywater recycling
+- **Living Walls**: Vertical gardens that purify air and insulate
+
+## Certification Systems
+LEED, BREEAM, and Living Building Challenge set standards for sustainability. These buildings often have lower operating costs and higher occupant satisfaction.
+
+## The Business Case
+Green buildings command premium rents, reduce utility costs, and attract environmentally conscious tenants. They're not just good for the planet—they're good business.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["environment"],
+        "updated_at": datetime(2024, 4, 18, 9, 15)
+    },
+    {
+        "title": "Nutrition Myths Debunked",
+        "short_description": "Science-based facts about common diet misconceptions.",
+        "content": """# Nutrition Myths Debunked
+
+Nutrition advice seems to change constantly, leaving people confused about what to eat. Let's separate fact from fiction using current scientific evidence.
+
+## Common Myths
+- **Myth**: Carbs make you fat
+- **Truth**: Excess calories from any source cause weight gain
+
+- **Myth**: Detox diets cleanse toxins
+- **Truth**: Your liver and kidneys already do this effectively
+
+- **Myth**: Organic always means healthier
+- **Truth**: Nutritional content is similar; pesticide exposure differs
+
+## Evidence-Based Guidelines
+Focus on whole foods, vary your diet, control portions, and stay hydrated. No single food is magic or poison—balance matters most.
+
+## Red Flags
+Beware extreme restrictions, expensive supplements, and miracle claims. Sustainable healthy eating is simple, not secretive.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health"],
+        "updated_at": datetime(2024, 4, 15, 12, 0)
+    },
+    {
+        "title": "Future of Work",
+        "short_description": "How technology is reshaping careers and workplaces.",
+        "content": """# Future of Work
+
+The workplace is evolving rapidly. Remote work, artificial intelligence, and changing employee expectations are creating new opportunities and challenges for workers and employers alike.
+
+## Major Trends
+- **Hybrid Models**: Combining office and remote work
+- **Skill Evolution**: Continuous learning becomes essential
+- **Gig Economy**: More professionals choosing freelance careers
+- **Automation**: AI handles routine tasks, humans focus on creativity
+
+## Preparing for Change
+Develop both technical and soft skills. Emotional intelligence, creativity, and adaptability become more valuable as machines handle routine work.
+
+## New Opportunities
+Emerging roles in AI ethics, remote collaboration, and digital wellness. Geographic barriers dissolve as talent can work from anywhere.
+
+The future belongs to lifelong learners who embrace change.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology", "education"],
+        "updated_at": datetime(2024, 4, 12, 15, 30)
+    },
+    {
+        "title": "AI Revolution in Healthcare: Transforming Patient Care",
+        "short_description": "How artificial intelligence is revolutionizing medical diagnosis and treatment.",
+        "content": """# AI Revolution in Healthcare: Transforming Patient Care
+
+Artificial intelligence is fundamentally changing how we approach healthcare, from diagnosis to treatment planning. Machine learning algorithms can now analyze medical images with accuracy that rivals experienced radiologists, detecting early-stage cancers and other conditions that might be missed by human eyes.
+
+## Key Applications
+
+AI-powered diagnostic tools are being deployed in hospitals worldwide, helping doctors make faster and more accurate decisions. These systems can process vast amounts of patient data, identifying patterns and correlations that inform treatment strategies.
+
+Predictive analytics help healthcare providers anticipate patient needs, reducing readmission rates and improving outcomes. Virtual health assistants provide 24/7 support, answering patient questions and monitoring vital signs remotely.
+
+The integration of AI in healthcare promises more personalized medicine, where treatments are tailored to individual genetic profiles and medical histories, leading to better patient outcomes and reduced healthcare costs.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology", "health"],
+        "updated_at": datetime(2024, 5, 1, 12, 30)
+    },
+    {
+        "title": "Cryptocurrency Investment Strategies for Beginners",
+        "short_description": "Essential guide to starting your cryptocurrency investment journey safely.",
+        "content": """# Cryptocurrency Investment Strategies for Beginners
+
+Entering the cryptocurrency market can be overwhelming for newcomers. Understanding basic investment principles and risk management is crucial for success in this volatile market.
+
+## Getting Started
+
+Begin with established cryptocurrencies like Bitcoin and Ethereum before exploring altcoins. Dollar-cost averaging helps reduce the impact of market volatility by spreading purchases over time.
+
+Never invest more than you can afford to lose. Cryptocurrency markets are highly volatile and can experience significant price swings within hours.
+
+## Security First
+
+Use reputable exchanges and enable two-factor authentication. Consider hardware wallets for long-term storage of significant amounts. Keep private keys secure and never share them with anyone.
+
+Research thoroughly before investing in any cryptocurrency project. Look at the team, technology, use case, and community support. Diversification across different cryptocurrencies can help manage risk while potentially maximizing returns.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance", "technology"],
+        "updated_at": datetime(2024, 5, 2, 14, 15)
+    },
+    {
+        "title": "Online Learning: The Future of Education",
+        "short_description": "How digital platforms are reshaping education and making learning accessible.",
+        "content": """# Online Learning: The Future of Education
+
+The digital transformation of education has accelerated dramatically, making quality learning accessible to millions worldwide. Online platforms offer flexibility and personalization that traditional classrooms often cannot match.
+
+## Advantages of Digital Learning
+
+Students can learn at their own pace, revisiting difficult concepts and advancing quickly through familiar material. Interactive multimedia content engages different learning styles, from visual learners to hands-on practitioners.
+
+Global accessibility breaks down geographical barriers, allowing students in remote areas to access world-class education. Cost-effectiveness makes quality education more affordable for many families.
+
+## Challenges and Solutions
+
+Maintaining student engagement requires innovative teaching methods and regular interaction. Technical requirements and digital literacy gaps need addressing to ensure equal access.
+
+The future of education likely combines online and offline elements, creating hybrid learning environments that maximize the benefits of both approaches while addressing their respective limitations.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["education", "technology"],
+        "updated_at": datetime(2024, 5, 3, 9, 45)
+    },
+    {
+        "title": "Sustainable Energy Solutions for Climate Change",
+        "short_description": "Exploring renewable energy technologies that can help combat climate change.",
+        "content": """# Sustainable Energy Solutions for Climate Change
+
+The transition to renewable energy is critical for addressing climate change and reducing our dependence on fossil fuels. Solar, wind, and hydroelectric power are becoming increasingly cost-effective and efficient.
+
+## Solar Power Revolution
+
+Photovoltaic technology has improved dramatically while costs have plummeted. Solar panels now generate electricity at prices competitive with traditional energy sources in many regions.
+
+Battery storage solutions are solving the intermittency problem, allowing solar energy to power homes and businesses even when the sun isn't shining.
+
+## Wind Energy Growth
+
+Offshore wind farms are generating massive amounts of clean energy, with turbines becoming larger and more efficient. Wind power is now one of the cheapest sources of electricity in many countries.
+
+## The Path Forward
+
+Government policies and private investment are accelerating the renewable energy transition. Smart grids and energy storage technologies are making renewable energy more reliable and practical for widespread adoption.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["environment", "technology"],
+        "updated_at": datetime(2024, 5, 4, 16, 20)
+    },
+    {
+        "title": "Mental Health in the Digital Age",
+        "short_description": "Understanding and managing mental health challenges in our connected world.",
+        "content": """# Mental Health in the Digital Age
+
+Our increasingly connected world brings both opportunities and challenges for mental health. While technology can provide support and resources, it can also contribute to anxiety, depression, and social isolation.
+
+## Digital Wellness Strategies
+
+Setting boundaries with technology use is essential for mental well-being. Regular digital detoxes help reset our relationship with devices and social media.
+
+Mindfulness apps and online therapy platforms make mental health resources more accessible than ever before. These tools can complement traditional therapy and provide support between sessions.
+
+## Social Media Impact
+
+Social media can negatively impact self-esteem and create unrealistic comparisons. Curating feeds to include positive, inspiring content while unfollowing accounts that trigger negative feelings is important.
+
+## Building Resilience
+
+Developing healthy coping mechanisms, maintaining real-world relationships, and practicing self-care are crucial for thriving in the digital age. Professional help should be sought when needed, as mental health is just as important as physical health.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health", "technology"],
+        "updated_at": datetime(2024, 5, 5, 11, 10)
+    },
+    {
+        "title": "Personal Finance Budgeting Basics",
+        "short_description": "Essential budgeting strategies to take control of your financial future.",
+        "content": """# Personal Finance Budgeting Basics
+
+Creating and maintaining a budget is the foundation of financial health. A well-planned budget helps you track spending, save for goals, and avoid debt while building long-term wealth.
+
+## The 50/30/20 Rule
+
+Allocate 50% of after-tax income to needs (housing, utilities, groceries), 30% to wants (entertainment, dining out), and 20% to savings and debt repayment. This simple framework provides structure while allowing flexibility.
+
+## Tracking Expenses
+
+Use budgeting apps or spreadsheets to monitor spending patterns. Categorize expenses to identify areas where you might be overspending and opportunities to cut costs.
+
+## Emergency Fund Priority
+
+Build an emergency fund covering 3-6 months of expenses before focusing on other financial goals. This safety net prevents debt accumulation during unexpected situations.
+
+## Automation Benefits
+
+Set up automatic transfers to savings accounts and automatic bill payments to ensure consistency. Pay yourself first by automatically saving before spending on discretionary items.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance"],
+        "updated_at": datetime(2024, 5, 6, 13, 25)
+    },
+    {
+        "title": "STEM Education: Preparing Students for Tomorrow",
+        "short_description": "Why STEM education is crucial for preparing students for future careers.",
+        "content": """# STEM Education: Preparing Students for Tomorrow
+
+Science, Technology, Engineering, and Mathematics (STEM) education is essential for preparing students for the jobs of the future. As technology continues to advance, STEM skills become increasingly valuable across all industries.
+
+## Critical Thinking Development
+
+STEM education emphasizes problem-solving, analytical thinking, and logical reasoning. These skills are transferable to many career paths and help students become better decision-makers in all aspects of life.
+
+## Hands-On Learning
+
+Project-based learning in STEM subjects engages students actively in the learning process. Building robots, conducting experiments, and coding programs make abstract concepts tangible and memorable.
+
+## Career Opportunities
+
+STEM careers typically offer higher salaries and job security. From healthcare and engineering to data science and renewable energy, STEM fields are driving innovation and economic growth.
+
+## Inclusive Approach
+
+Encouraging diversity in STEM education ensures that all students, regardless of background or gender, have opportunities to pursue these rewarding career paths. Early exposure and supportive environments are key to building interest and confidence.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["education", "technology"],
+        "updated_at": datetime(2024, 5, 7, 10, 40)
+    },
+    {
+        "title": "Ocean Conservation: Protecting Marine Ecosystems",
+        "short_description": "Critical steps needed to preserve our oceans and marine life for future generations.",
+        "content": """# Ocean Conservation: Protecting Marine Ecosystems
+
+Our oceans face unprecedented threats from pollution, overfishing, and climate change. Protecting marine ecosystems is crucial for maintaining biodiversity and supporting billions of people who depend on ocean resources.
+
+## Plastic Pollution Crisis
+
+Millions of tons of plastic waste enter our oceans annually, harming marine life and contaminating the food chain. Reducing single-use plastics and improving waste management systems are essential steps.
+
+Marine protected areas provide safe havens for fish populations to recover and ecosystems to thrive. These areas also support sustainable fishing practices and eco-tourism.
+
+## Climate Change Impact
+
+Ocean acidification and rising temperatures threaten coral reefs and marine species. Reducing carbon emissions and supporting renewable energy helps address these climate-related challenges.
+
+## Individual Actions
+
+Everyone can contribute to ocean conservation through conscious consumer choices, supporting sustainable seafood, participating in beach cleanups, and advocating for stronger environmental policies. Small actions collectively make a significant impact on ocean health.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["environment"],
+        "updated_at": datetime(2024, 5, 8, 15, 55)
+    },
+    {
+        "title": "Blockchain Technology Beyond Cryptocurrency",
+        "short_description": "Exploring blockchain applications in supply chain, healthcare, and governance.",
+        "content": """# Blockchain Technology Beyond Cryptocurrency
+
+While blockchain is best known for powering cryptocurrencies, its applications extend far beyond digital money. This distributed ledger technology offers transparency, security, and decentralization across various industries.
+
+## Supply Chain Transparency
+
+Blockchain enables complete traceability of products from origin to consumer. Companies can track food safety, verify authenticity of luxury goods, and ensure ethical sourcing of materials.
+
+## Healthcare Records
+
+Secure, interoperable health records on blockchain give patients control over their data while enabling healthcare providers to access complete medical histories when needed.
+
+## Digital Identity
+
+Blockchain-based identity systems reduce fraud and give individuals control over their personal information. This technology can streamline verification processes while protecting privacy.
+
+## Smart Contracts
+
+Automated contracts execute when predetermined conditions are met, reducing the need for intermediaries and increasing efficiency in various business processes.
+
+The technology's potential for creating more transparent, efficient, and secure systems continues to drive innovation across industries.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["technology", "finance"],
+        "updated_at": datetime(2024, 5, 9, 12, 15)
+    },
+    {
+        "title": "Nutrition Myths Debunked by Science",
+        "short_description": "Separating fact from fiction in popular nutrition beliefs and diet trends.",
+        "content": """# Nutrition Myths Debunked by Science
+
+Nutrition misinformation spreads rapidly, leading to confusion about healthy eating. Scientific research helps separate evidence-based nutrition advice from popular myths and marketing claims.
+
+## Myth: Carbs Are Always Bad
+
+Complex carbohydrates from whole grains, fruits, and vegetables provide essential nutrients and energy. The quality and quantity of carbohydrates matter more than avoiding them entirely.
+
+## Myth: Fat Makes You Fat
+
+Healthy fats from sources like avocados, nuts, and olive oil are essential for hormone production and nutrient absorption. Total calorie balance, not fat intake alone, determines weight changes.
+
+## Myth: Detox Diets Cleanse Toxins
+
+Your liver and kidneys naturally detoxify your body. Expensive detox products and extreme cleanses are unnecessary and potentially harmful.
+
+## Evidence-Based Approach
+
+Focus on whole foods, balanced meals, and sustainable eating patterns rather than following restrictive fad diets. Consult registered dietitians for personalized nutrition advice based on scientific evidence rather than social media trends.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["health"],
+        "updated_at": datetime(2024, 5, 10, 14, 30)
+    },
+    {
+        "title": "Investment Diversification Strategies",
+        "short_description": "Building a balanced investment portfolio to minimize risk and maximize returns.",
+        "content": """# Investment Diversification Strategies
+
+Diversification is a fundamental principle of investing that helps reduce risk while potentially improving returns. By spreading investments across different asset classes, sectors, and geographic regions, investors can protect their portfolios from market volatility.
+
+## Asset Class Diversification
+
+Combine stocks, bonds, real estate, and commodities in your portfolio. Each asset class responds differently to economic conditions, providing balance during market fluctuations.
+
+## Geographic Diversification
+
+International investments provide exposure to different economies and currencies. Emerging markets offer growth potential, while developed markets provide stability.
+
+## Sector Diversification
+
+Avoid concentrating investments in a single industry. Technology, healthcare, consumer goods, and financial services each have different risk profiles and growth patterns.
+
+## Rebalancing Strategy
+
+Regularly review and adjust your portfolio to maintain target allocations. Market movements can shift your asset allocation away from your intended strategy.
+
+Time horizon and risk tolerance should guide your diversification strategy. Younger investors can typically accept more risk for potentially higher returns.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["finance"],
+        "updated_at": datetime(2024, 5, 11, 16, 45)
+    },
+    {
+        "title": "Personalized Learning in Modern Classrooms",
+        "short_description": "How adaptive learning technologies are customizing education for individual students.",
+        "content": """# Personalized Learning in Modern Classrooms
+
+Personalized learning adapts instruction to meet individual student needs, preferences, and learning styles. Technology enables teachers to provide customized educational experiences that help every student reach their potential.
+
+## Adaptive Learning Platforms
+
+AI-powered systems adjust difficulty levels and content presentation based on student performance. These platforms identify knowledge gaps and provide targeted practice to address specific learning needs.
+
+## Multiple Learning Pathways
+
+Students can choose from various ways to engage with content, whether through visual presentations, hands-on activities, or collaborative projects. This flexibility accommodates different learning preferences.
+
+## Data-Driven Insights
+
+Learning analytics help teachers understand student progress and identify areas where additional support is needed. Real-time feedback enables quick interventions to prevent students from falling behind.
+
+## Student Agency
+
+Personalized learning empowers students to take ownership of their education by setting goals, tracking progress, and making choices about their learning journey. This autonomy increases engagement and motivation.
+
+The combination of technology and pedagogical innovation creates more effective and inclusive learning environments.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["education", "technology"],
+        "updated_at": datetime(2024, 5, 12, 11, 20)
+    },
+    {
+        "title": "Urban Sustainability: Green Cities of the Future",
+        "short_description": "How cities are implementing sustainable practices to reduce environmental impact.",
+        "content": """# Urban Sustainability: Green Cities of the Future
+
+As urbanization accelerates globally, cities are implementing innovative sustainability practices to reduce their environmental footprint while improving quality of life for residents.
+
+## Green Infrastructure
+
+Cities are incorporating green roofs, urban forests, and permeable pavements to manage stormwater, reduce heat islands, and improve air quality. These natural solutions provide environmental and economic benefits.
+
+## Sustainable Transportation
+
+Electric public transit, bike-sharing programs, and pedestrian-friendly infrastructure reduce emissions and traffic congestion. Cities are prioritizing clean transportation options over private vehicle use.
+
+## Waste Reduction
+
+Circular economy principles guide waste management strategies, emphasizing recycling, composting, and waste-to-energy programs. Zero-waste initiatives aim to eliminate landfill dependency.
+
+## Energy Efficiency
+
+Smart building technologies, LED lighting, and renewable energy systems reduce urban energy consumption. District energy systems improve efficiency by sharing heating and cooling resources.
+
+## Community Engagement
+
+Successful sustainability initiatives require citizen participation through education, incentive programs, and collaborative planning processes that ensure community buy-in and long-term success.""",
+        "main_image_url": "https://picsum.photos/200",
+        "tags": ["environment", "technology"],
+        "updated_at": datetime(2024, 5, 13, 13, 10)
+    }
+]
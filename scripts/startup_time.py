@@ -0,0 +1,76 @@
+"""
+Замер времени старта generate_test_data.py на путях без эмбеддингов.
+
+Каждый сценарий запускается в отдельном процессе несколько раз; печатается
+медиана времени и проверяется, что torch / sentence_transformers / transformers
+не были импортированы. Код возврата 1, если сценарий медленнее порога
+или подтянул тяжёлые модули.
+
+Запуск: python startup_time.py [--runs 5] [--threshold 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers")
+
+SCENARIOS = {
+    "import": "import generate_test_data",
+    "cli-help": (
+        "import contextlib, io, generate_test_data as g\n"
+        "with contextlib.suppress(SystemExit), contextlib.redirect_stdout(io.StringIO()):\n"
+        "    g.main(['--help'])\n"
+    ),
+    "synthetic": (
+        "import synthetic_corpus\n"
+        "for _ in synthetic_corpus.iter_synthetic_items(1000): pass\n"
+    ),
+    "format-conversion": (
+        "import generate_test_data as g\n"
+        "emb = g.encode_embedding([0.1] * 384, 'f16-base64')\n"
+        "g.decode_embedding(emb)\n"
+    ),
+}
+
+_PROBE = (
+    "import sys, json\n"
+    "{code}\n"
+    "print(json.dumps(sorted(m for m in {heavy} if m in sys.modules)))\n"
+)
+
+
+def measure(code: str, runs: int) -> tuple:
+    """Медиана времени запуска сценария (секунды) и список подтянутых тяжёлых модулей."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    probe = _PROBE.format(code=code, heavy=HEAVY_MODULES)
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=script_dir, capture_output=True, text=True, check=True,
+        )
+        timings.append(time.perf_counter() - started)
+        loaded = json.loads(out.stdout.strip().splitlines()[-1])
+    return statistics.median(timings), loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время старта путей generate_test_data.py без модели")
+    parser.add_argument("--runs", type=int, default=5, help="число запусков каждого сценария")
+    parser.add_argument("--threshold", type=float, default=1.0, help="допустимая медиана, секунды")
+    args = parser.parse_args()
+
+    failed = False
+    for name, code in SCENARIOS.items():
+        median, loaded = measure(code, args.runs)
+        ok = median < args.threshold and not loaded
+        failed |= not ok
+        heavy = f", загружены: {', '.join(loaded)}" if loaded else ""
+        print(f"{'OK  ' if ok else 'FAIL'} {name}: {median * 1000:.0f} мс{heavy}")
+    sys.exit(1 if failed else 0)
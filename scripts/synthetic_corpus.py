@@ -0,0 +1,150 @@
+"""
+Синтетический корпус для нагрузочного тестирования синхронизации и Room.
+
+Генерирует 10k–1M элементов фида в той же схеме, что и generate_article_json,
+без запуска модели: эмбеддинги — единичные векторы вокруг центроидов тегов,
+поэтому рекомендации на таком корпусе ведут себя правдоподобно. Распределения
+(длина текста, теги, updatedAt, доля правок и удалений) задаются параметрами,
+всё случайное выводится из seed — один и тот же seed даёт один и тот же файл.
+Тяжёлая часть (векторы, длины, теги, времена) считается блоками в NumPy.
+"""
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+
+from generate_test_data import build_article_item, build_delete_item
+from related import _unit
+
+SYNTHETIC_TAGS = (
+    "technology", "health", "finance", "education",
+    "environment", "science", "lifestyle", "business",
+)
+
+_TOPIC_WORDS = {
+    "technology": "software cloud algorithm device network data platform chip robot "
+                  "automation developer interface startup digital security".split(),
+    "health": "patient doctor therapy sleep nutrition clinic vaccine wellbeing "
+              "diagnosis exercise immune hospital stress recovery diet".split(),
+    "finance": "investment portfolio budget interest savings market stock bond "
+               "dividend inflation credit retirement fund risk tax".split(),
+    "education": "student teacher classroom course curriculum learning school exam "
+                 "university skill tutor lecture literacy homework degree".split(),
+    "environment": "climate ocean forest recycling emissions solar wind plastic "
+                   "biodiversity carbon wildlife energy water soil pollution".split(),
+    "science": "research experiment physics molecule genome telescope theory "
+               "laboratory particle evidence hypothesis cell quantum species data".split(),
+    "lifestyle": "travel home habit hobby cooking fashion garden family weekend "
+                 "routine design music culture friends comfort".split(),
+    "business": "company strategy customer revenue team leadership product growth "
+                "marketing sales management startup brand supply contract".split(),
+}
+_COMMON_WORDS = (
+    "the of and to in is that for with as on are this by from at it be "
+    "more new can how why what people year world future better way"
+).split()
+
+DEFAULT_START = "2024-01-01T00:00:00Z"
+
+
+def _topic_text(rng: np.random.Generator, tag: str, n_words: int) -> str:
+    """Длинный «пул» текста темы с абзацами и заголовками, из которого режутся статьи."""
+    vocab = np.array(_TOPIC_WORDS[tag] + _COMMON_WORDS)
+    weights = np.r_[np.full(len(_TOPIC_WORDS[tag]), 3.0), np.ones(len(_COMMON_WORDS))]
+    words = rng.choice(vocab, size=n_words, p=weights / weights.sum())
+    parts = []
+    for i in range(0, n_words, 60):
+        paragraph = " ".join(words[i:i + 60])
+        if (i // 60) % 5 == 0:
+            parts.append("## " + " ".join(words[i:i + 3]).title())
+        parts.append(paragraph[0].upper() + paragraph[1:] + ".")
+    return "\n\n".join(parts)
+
+
+def _iso(seconds: np.ndarray) -> list:
+    return [
+        datetime.fromtimestamp(int(t), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for t in seconds
+    ]
+
+
+def iter_synthetic_items(n: int, seed: int = 0, dim: int = 384,
+                         start: str = DEFAULT_START, span_days: float = 365.0,
+                         update_ratio: float = 0.1, delete_ratio: float = 0.02,
+                         mean_chars: int = 2500, noise: float = 0.6,
+                         block_size: int = 10_000, encoding: str = "list"):
+    """
+    Генератор n элементов фида в порядке возрастания updatedAt.
+    update_ratio — доля upsert'ов, повторно отправляющих уже выданный id (правка статьи);
+    delete_ratio — доля удалений ранее выданных статей;
+    mean_chars   — средняя длина content (логнормальное распределение);
+    noise        — разброс эмбеддингов вокруг центроида основного тега.
+    """
+    rng = np.random.default_rng(seed)
+    n_tags = len(SYNTHETIC_TAGS)
+    centroids = _unit(rng.standard_normal((n_tags, dim)))
+    # Популярность тегов — по закону Ципфа
+    tag_p = 1.0 / np.arange(1, n_tags + 1)
+    tag_p /= tag_p.sum()
+    pools = {tag: _topic_text(rng, tag, 60_000) for tag in SYNTHETIC_TAGS}
+
+    start_ts = datetime.strptime(start, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    times = np.sort(rng.uniform(start_ts, start_ts + span_days * 86400, n)).astype(np.int64)
+    live_ids = []
+    # id -> (основной тег, второй тег, есть ли второй): правка сохраняет тему статьи
+    topics = {}
+
+    for block_start in range(0, n, block_size):
+        m = min(block_size, n - block_start)
+        updated_at = _iso(times[block_start:block_start + m])
+        kind = rng.random(m)
+        primary = rng.choice(n_tags, size=m, p=tag_p)
+        secondary = rng.choice(n_tags, size=m, p=tag_p)
+        extra_tags = rng.integers(0, 3, size=m)
+        lengths = np.clip(rng.lognormal(np.log(mean_chars), 0.6, size=m), 200, 40_000).astype(np.int64)
+        offsets = rng.random(m)
+        picks = rng.random(m)
+        jitter = noise / np.sqrt(dim) * rng.standard_normal((m, dim))
+        vectors = _unit(centroids[primary] + 0.35 * centroids[secondary] + jitter).astype(np.float32)
+        raw_ids = rng.bytes(16 * m)
+
+        for i in range(m):
+            if kind[i] < delete_ratio and live_ids:
+                # Удаляем случайную живую статью (swap-pop, O(1))
+                j = int(picks[i] * len(live_ids))
+                item_id = live_ids[j]
+                live_ids[j] = live_ids[-1]
+                live_ids.pop()
+                del topics[item_id]
+                yield build_delete_item(item_id, updated_at[i])
+                continue
+            if kind[i] < delete_ratio + update_ratio and live_ids:
+                item_id = live_ids[int(picks[i] * len(live_ids))]
+                p, s, extra = topics[item_id]
+                vector = _unit((centroids[p] + 0.35 * centroids[s] + jitter[i])[None])[0].astype(np.float32)
+            else:
+                item_id = str(uuid.UUID(bytes=raw_ids[16 * i:16 * i + 16], version=4))
+                live_ids.append(item_id)
+                p, s, extra = int(primary[i]), int(secondary[i]), bool(extra_tags[i])
+                topics[item_id] = (p, s, extra)
+                vector = vectors[i]
+
+            tag = SYNTHETIC_TAGS[p]
+            tags = [tag]
+            if extra and s != p:
+                tags.append(SYNTHETIC_TAGS[s])
+            pool = pools[tag]
+            offset = int(offsets[i] * (len(pool) - lengths[i]))
+            offset = pool.find(" ", offset) + 1
+            body = pool[offset:offset + lengths[i]]
+            title = f"{tag.title()}: {' '.join(body.split(None, 4)[:4]).strip('.#').title()}"
+            art = {
+                "id": item_id,
+                "title": title,
+                "short_description": body[:160].rsplit(" ", 1)[0],
+                "content": f"# {title}\n\n{body}",
+                "main_image_url": f"https://picsum.photos/seed/{item_id[:8]}/200",
+                "tags": tags,
+                "updated_at": updated_at[i],
+            }
+            yield build_article_item(art, vector, encoding)
@@ -0,0 +1,43 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_test_data  # noqa: E402
+from dedup import _bucket_pairs, clusters_from_pairs, find_duplicates  # noqa: E402
+
+
+class ClustersTest(unittest.TestCase):
+    def test_chain_is_not_merged_transitively(self):
+        n = 4
+        # 0~1, 1~2, 2~3, 0~3: 2 похожа только на 1, а не на канонический 0
+        pairs = np.array([0 * n + 1, 1 * n + 2, 2 * n + 3, 0 * n + 3])
+        self.assertEqual(clusters_from_pairs(pairs, n).tolist(), [0, 0, 2, 0])
+
+    def test_oversized_bucket_pairs_only_first_rows(self):
+        pairs, capped = _bucket_pairs(np.array([1, 1, 1, 1, 2, 2]), max_bucket=2)
+        self.assertEqual(capped, 1)
+        self.assertEqual(sorted(pairs.tolist()), [0 * 6 + 1, 0 * 6 + 2, 0 * 6 + 3, 1 * 6 + 2, 1 * 6 + 3, 4 * 6 + 5])
+
+    def test_exact_copies_found_in_capped_bucket(self):
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((50, 32)).astype(np.float32)
+        matrix[10:30] = matrix[0]
+        canonical, report = find_duplicates(None, matrix, max_bucket=4, exhaustive=True)
+        self.assertEqual(canonical[10:30].tolist(), [0] * 20)
+        self.assertEqual(report["canonicalAgreement"], 1.0)
+
+
+class DedupCliTest(unittest.TestCase):
+    def test_dedup_rejected_with_manifest(self):
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            generate_test_data.main(["--manifest", "articles.manifest.json", "--dedup", "drop"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delta import DeltaTracker  # noqa: E402
+from pagination import PageWriter, read_updates  # noqa: E402
+
+
+def _article(n: int, revision: int = 0) -> dict:
+    return {
+        "id": f"a{n}",
+        "title": f"Статья {n}",
+        "short_description": "",
+        "content": f"Текст {n}, правка {revision}",
+        "main_image_url": "",
+        "tags": [],
+    }
+
+
+def _run(path: str, articles: list) -> list:
+    """Один запуск --manifest без кодирования: элементы фида дельты в порядке выдачи."""
+    tracker = DeltaTracker.load(path, "model")
+    items = [{"id": art["id"], "type": "article", "action": "upsert", "updatedAt": art["updated_at"]}
+             for art in tracker.filter(articles)]
+    items.extend(tracker.iter_deletes())
+    tracker.save()
+    return items
+
+
+def _paged_since(items: list, since: str, limit: int) -> dict:
+    """Ответ mock-server: первые limit элементов с updatedAt > since, nextSince — у последнего."""
+    page = sorted((item for item in items if item["updatedAt"] > since), key=lambda item: item["updatedAt"])
+    data = page[:limit]
+    return {"data": data, "meta": {"nextSince": data[-1]["updatedAt"] if data else since,
+                                   "hasMore": len(page) > limit}}
+
+
+def _sync(items: list, since: str, limit: int) -> tuple:
+    received = []
+    while True:
+        response = _paged_since(items, since, limit)
+        received.extend(response["data"])
+        since = response["meta"]["nextSince"]
+        if not response["meta"]["hasMore"]:
+            return received, since
+
+
+class DeltaPagingTest(unittest.TestCase):
+    """Дельта больше limit должна целиком дойти до клиента, идущего по nextSince."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.manifest = os.path.join(self.dir.name, "articles.manifest.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_delta_larger_than_limit_is_delivered(self):
+        feed = _run(self.manifest, [_article(n) for n in range(250)])
+        received, since = _sync(feed, "", limit=100)
+        self.assertEqual(len({item["id"] for item in received}), 250)
+
+        # Вторая дельта: 150 правок и 10 удалений, клиент продолжает с прошлого nextSince
+        second = _run(self.manifest, [_article(n, 1 if n < 150 else 0) for n in range(240)])
+        self.assertEqual(len(second), 160)
+        self.assertGreater(min(item["updatedAt"] for item in second), since)
+        feed.extend(second)
+        received, _ = _sync(feed, since, limit=100)
+        self.assertEqual(len(received), 160)
+        self.assertEqual(sum(item["action"] == "delete" for item in received), 10)
+
+    def test_updated_at_strictly_increases_across_runs(self):
+        first = _run(self.manifest, [_article(n) for n in range(5)])
+        # Только удаления: их метки не остаются в записях манифеста
+        deletes = _run(self.manifest, [])
+        third = _run(self.manifest, [_article(0, 1)])
+        stamps = [item["updatedAt"] for item in first + deletes + third]
+        self.assertEqual(stamps, sorted(set(stamps)))
+
+    def test_pages_respect_limit(self):
+        feed = _run(self.manifest, [_article(n) for n in range(250)])
+        pages_dir = os.path.join(self.dir.name, "pages")
+        writer = PageWriter(pages_dir, page_size=100)
+        for item in feed:
+            writer.add(item)
+        index = writer.finish()
+        self.assertEqual([page["count"] for page in index["pages"]], [100, 100, 50])
+        since, received = "", 0
+        while True:
+            response = read_updates(pages_dir, since, index)
+            received += len(response["data"])
+            since = response["meta"]["nextSince"]
+            if not response["meta"]["hasMore"]:
+                break
+        self.assertEqual(received, 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
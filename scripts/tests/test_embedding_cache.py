@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_cache import EmbeddingCache  # noqa: E402
+
+
+class EmbeddingCacheConcurrencyTest(unittest.TestCase):
+    """Два соединения к одному файлу, как у воркеров encode_pool."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_get_many_hit_does_not_block_other_writer(self):
+        with EmbeddingCache(self.path) as a, EmbeddingCache(self.path) as b:
+            a.put_many({"k1": [1.0, 2.0]})
+            self.assertIn("k1", a.get_many(["k1"]))
+            # Короткий таймаут: при незакрытой транзакции A здесь был бы "database is locked"
+            b._conn.execute("PRAGMA busy_timeout = 100")
+            b.put_many({"k2": [3.0, 4.0]})
+            self.assertEqual(set(a.get_many(["k1", "k2"])), {"k1", "k2"})
+
+
+class EmbeddingCacheSizeTest(unittest.TestCase):
+    def test_running_size_matches_table(self):
+        with tempfile.TemporaryDirectory() as tmp, EmbeddingCache(os.path.join(tmp, "c.sqlite"), 64) as cache:
+            cache.put_many({"a": [0.0] * 4, "b": [0.0] * 4})
+            cache.put_many({"a": [0.0] * 8})          # замена вектора другой длины
+            cache.put_many({f"k{i}": [0.0] * 4 for i in range(5)})   # вытеснение
+            actual = cache._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+            self.assertEqual(cache.size_bytes(), actual)
+            self.assertLessEqual(cache.size_bytes(), 64)
+            self.assertGreater(cache.evicted, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
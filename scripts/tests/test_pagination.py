@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagination import PageWriter, read_updates  # noqa: E402
+
+
+def _item(n: int, updated_at: str) -> dict:
+    return {"id": f"a{n}", "type": "article", "action": "upsert", "updatedAt": updated_at}
+
+
+class PageWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, items: list, page_size: int) -> dict:
+        writer = PageWriter(self.dir.name, page_size)
+        for item in items:
+            writer.add(item)
+        return writer.finish()
+
+    def test_same_updated_at_never_split(self):
+        items = [_item(n, f"2024-05-01T12:00:{n // 3:02d}Z") for n in range(10)]
+        index = self._write(list(reversed(items)), page_size=2)
+        # Группы по 3 одинаковых updatedAt: страница дотягивается до конца группы
+        self.assertEqual([page["count"] for page in index["pages"]], [3, 3, 3, 1])
+        since, received = "", []
+        while True:
+            response = read_updates(self.dir.name, since, index)
+            received.extend(item["id"] for item in response["data"])
+            since = response["meta"]["nextSince"]
+            if not response["meta"]["hasMore"]:
+                break
+        self.assertEqual(sorted(received), sorted(item["id"] for item in items))
+
+    def test_since_inside_page_filters_older_items(self):
+        items = [_item(n, f"2024-05-01T12:00:{n:02d}Z") for n in range(6)]
+        index = self._write(items, page_size=4)
+        response = read_updates(self.dir.name, "2024-05-01T12:00:01Z", index)
+        self.assertEqual([item["id"] for item in response["data"]], ["a2", "a3"])
+        self.assertTrue(response["meta"]["hasMore"])
+        response = read_updates(self.dir.name, "2024-05-01T12:00:05Z", index)
+        self.assertEqual(response, {"data": [], "meta": {"nextSince": "2024-05-01T12:00:05Z", "hasMore": False}})
+
+    def test_rejects_empty_pages(self):
+        with self.assertRaises(ValueError):
+            PageWriter(self.dir.name, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_test_data  # noqa: E402
+from generate_test_data import decode_embedding  # noqa: E402
+from quantization import Int8Quantizer, with_per_dim_quantization  # noqa: E402
+from synthetic_corpus import iter_synthetic_items  # noqa: E402
+
+
+class PerDimQuantizationTest(unittest.TestCase):
+    def test_round_trip_with_scales_file(self):
+        items = list(iter_synthetic_items(200, seed=1, encoding="f32-base64"))
+        exact = [decode_embedding(item["attributes"]["embeddings"]) for item in items if item["action"] == "upsert"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scales.json")
+            quantized = list(with_per_dim_quantization(items, path))
+            with open(path, encoding="utf-8") as f:
+                quantizer = Int8Quantizer.from_json(json.load(f))
+        upserts = [item for item in quantized if item["action"] == "upsert"]
+        self.assertEqual(len(upserts), len(exact))
+        self.assertTrue(all(item["attributes"]["embeddings"]["encoding"] == "i8-base64" for item in upserts))
+        decoded = np.stack([decode_embedding(item["attributes"]["embeddings"], quantizer) for item in upserts])
+        # Масштабы по всем версиям: ни одно значение не обрезано, ошибка — не больше полушага
+        self.assertLessEqual(np.abs(decoded - np.stack(exact)).max(), quantizer.scales.max() / 2 + 1e-6)
+
+    def test_per_dim_rejected_with_manifest(self):
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            generate_test_data.main(["--manifest", "articles.manifest.json", "--encoding", "i8-base64",
+                                     "--int8-scales", "per-dim", "--int8-scales-output", "scales.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()